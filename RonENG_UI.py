@@ -1,7 +1,279 @@
+import contextlib
+import itertools
+import queue
+import threading
 import tkinter as tk
-from tkinter import messagebox, simpledialog
-from RonENG import MilitarySimulator
-import random
+from tkinter import messagebox, simpledialog, ttk
+
+from СonsoleRonENG import MilitarySimulator, Mission, Soldier
+
+
+def append_text(text_box, text):
+    """Append text to a read-only tk.Text; False if the box has been destroyed"""
+    if not text_box.winfo_exists():
+        return False
+    text_box.config(state=tk.NORMAL)
+    text_box.insert(tk.END, text)
+    text_box.config(state=tk.DISABLED)
+    return True
+
+
+class Job:
+    """One piece of work queued on a JobRunner.
+
+    work(job) runs on the worker thread. It may call job.report(done, total)
+    and job.publish(item), which reach the Tk thread in order, and should
+    check job.cancelled between steps.
+    """
+
+    def __init__(self, runner, title, work, on_done=None, on_update=None, on_error=None):
+        self.runner = runner
+        self.title = title
+        self.work = work
+        self.on_done = on_done
+        self.on_update = on_update
+        self.on_error = on_error
+        self.state = "queued"  # Then "running", and "done", "failed" or "cancelled"
+        self.progress = None  # (done, total) last reported
+        self.stop = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.stop.is_set()
+
+    def cancel(self):
+        """Stop at the job's next check; a queued job is dropped without running"""
+        self.stop.set()
+
+    def report(self, done, total):
+        self.runner.events.put(("progress", self, (done, total)))
+
+    def publish(self, item):
+        """Hand a partial result to on_update on the Tk thread"""
+        self.runner.events.put(("update", self, item))
+
+
+class JobRunner:
+    """Runs long simulator operations off the Tk thread, one at a time in submission order.
+
+    Jobs share one worker thread, and more can be queued while one runs.
+    The worker holds lock for the whole of each job, and the Tk thread
+    holds it (through hold_simulator) whenever it reads or changes the
+    simulator, so neither sees the other's changes half made. Everything a
+    job sends back goes through one bounded queue that root.after polling
+    drains, so callbacks run on the Tk thread and a job producing output
+    faster than the window can show it waits instead of piling it up.
+    """
+    POLL_MS = 50
+    BACKLOG = 32
+
+    def __init__(self, root, on_change=None):
+        self.root = root
+        self.on_change = on_change  # Called on the Tk thread when jobs start, finish or make progress
+        self.jobs = queue.Queue()
+        self.events = queue.Queue(self.BACKLOG)
+        self.queued = []
+        self.current = None
+        self.polling = False
+        self.lock = threading.RLock()  # Held by whichever thread is using the simulator
+        threading.Thread(target=self._work, daemon=True).start()
+
+    def submit(self, title, work, on_done=None, on_update=None, on_error=None):
+        job = Job(self, title, work, on_done, on_update, on_error)
+        self.queued.append(job)
+        self.jobs.put(job)
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        self._changed()
+        return job
+
+    @contextlib.contextmanager
+    def hold_simulator(self):
+        """Use the simulator on the Tk thread: wait for the running job, if any, to finish with it.
+
+        Job events keep being handed out meanwhile, so a job waiting for
+        room in the queue can go on, and the window keeps its progress bar.
+        """
+        while not self.lock.acquire(timeout=self.POLL_MS / 1000):
+            self._drain()
+            self._changed()
+            self.root.update_idletasks()
+        try:
+            yield
+        finally:
+            self.lock.release()
+
+    def cancel_all(self):
+        for job in [self.current, *self.queued]:
+            if job is not None:
+                job.cancel()
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            self.events.put(("start", job, None))
+            if job.cancelled:
+                self.events.put(("cancelled", job, None))
+                continue
+            try:
+                with self.lock:
+                    result = job.work(job)
+            except Exception as error:
+                self.events.put(("failed", job, error))
+                continue
+            self.events.put(("cancelled" if job.cancelled else "done", job, result))
+
+    def _poll(self):
+        try:
+            self._drain()
+        finally:
+            if self.current or self.queued or not self.events.empty():
+                self.root.after(self.POLL_MS, self._poll)
+            else:
+                self.polling = False
+            self._changed()
+
+    def _drain(self):
+        while True:
+            try:
+                kind, job, value = self.events.get_nowait()
+            except queue.Empty:
+                return
+            self._handle(kind, job, value)
+
+    def _handle(self, kind, job, value):
+        if kind == "start":
+            self.queued.remove(job)
+            self.current = job
+            job.state = "running"
+        elif kind == "progress":
+            job.progress = value
+        elif kind == "update":
+            if job.on_update and not job.cancelled:
+                job.on_update(value)
+        else:
+            job.state = kind
+            if self.current is job:
+                self.current = None
+            if kind == "done" and job.on_done:
+                job.on_done(value)
+            elif kind == "failed":
+                if job.on_error:
+                    job.on_error(value)
+                else:
+                    messagebox.showerror(job.title, str(value))
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+
+class VirtualTree:
+    """ttk.Treeview over a simulator listing that only ever holds the visible rows.
+
+    The scrollbar and mouse wheel move a window over the listing, clicking a
+    heading sorts by that column (again to reverse it) and the filter box and
+    status chooser narrow it; each of those asks the simulator for a new
+    listing, and only the page in view is fetched and rendered. The
+    simulator is only used while holding it through jobs.
+    """
+    ROWS = 25
+    FILTER_DELAY_MS = 300
+
+    def __init__(self, parent, simulator, jobs, kind, statuses=None, descending=False):
+        self.simulator = simulator
+        self.jobs = jobs
+        self.kind = kind
+        self.columns = simulator.LISTING_COLUMNS[kind]
+        self.sort = None
+        self.descending = descending
+        self.status = None
+        self.first = 0
+        self.pending = None
+        self.frame = tk.Frame(parent)
+
+        controls = tk.Frame(self.frame)
+        controls.pack(side=tk.TOP, fill=tk.X)
+        tk.Label(controls, text="Filter:").pack(side=tk.LEFT)
+        self.text = tk.StringVar()
+        self.text.trace_add("write", self._filter_changed)
+        tk.Entry(controls, textvariable=self.text).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        if statuses:
+            self.status_choice = tk.StringVar(value="All")
+            chooser = ttk.Combobox(controls, textvariable=self.status_choice, values=["All", *statuses], state="readonly", width=12)
+            chooser.pack(side=tk.LEFT, padx=5)
+            chooser.bind("<<ComboboxSelected>>", self._status_chosen)
+
+        self.scrollbar = tk.Scrollbar(self.frame, command=self.scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(self.frame, columns=self.columns, show="headings", height=self.ROWS, selectmode="browse")
+        for column in self.columns:
+            self.tree.heading(column, text=column, command=lambda column=column: self.sort_by(column))
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for event in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(event, self._wheel)
+        self.tree.bind("<Prior>", lambda event: self.scroll("scroll", -1, "pages"))
+        self.tree.bind("<Next>", lambda event: self.scroll("scroll", 1, "pages"))
+        self.refresh()
+
+    def refresh(self):
+        """Ask the simulator for the listing again and go back to the top"""
+        self.pending = None
+        if not self.frame.winfo_exists():
+            return
+        with self.jobs.hold_simulator():
+            self.listing = self.simulator.listing(self.kind, self.sort, self.descending, self.text.get(), self.status)
+        self.first = 0
+        self.show()
+
+    def show(self):
+        """Render the page of rows starting at self.first"""
+        total = len(self.listing)
+        self.first = max(0, min(self.first, total - self.ROWS))
+        self.tree.delete(*self.tree.get_children())
+        with self.jobs.hold_simulator():
+            rows = self.listing.page(self.first, self.ROWS)
+        for row in rows:
+            self.tree.insert("", tk.END, values=row)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.ROWS) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, action, amount, unit=None):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", count, "units" or "pages")"""
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.listing))
+        else:
+            self.first += int(amount) * (self.ROWS if unit == "pages" else 1)
+        self.show()
+        return "break"
+
+    def sort_by(self, column):
+        key = column.lower()
+        self.descending = not self.descending if self.sort == key else False
+        self.sort = key
+        for name in self.columns:
+            arrow = (" ▼" if self.descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=name + arrow)
+        self.refresh()
+
+    def _wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        return self.scroll("scroll", -3 if up else 3, "units")
+
+    def _filter_changed(self, *args):
+        # Wait for a pause in typing before filtering a large listing
+        if self.pending is not None:
+            self.frame.after_cancel(self.pending)
+        self.pending = self.frame.after(self.FILTER_DELAY_MS, self.refresh)
+
+    def _status_chosen(self, event):
+        choice = self.status_choice.get()
+        self.status = None if choice == "All" else choice
+        self.refresh()
+
 
 class MilitarySimulatorApp:
     def __init__(self, root):
@@ -22,6 +294,17 @@ class MilitarySimulatorApp:
         self.header = tk.Label(root, text="Military Simulator", font=self.header_font, bg=self.bg_color, fg=self.text_color)
         self.header.pack(pady=10)
 
+        # Long operations run as background jobs; this bar shows the current one
+        self.jobs = JobRunner(root, on_change=self.show_jobs)
+        self.status_bar = tk.Frame(root, bg=self.bg_color)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.job_label = tk.Label(self.status_bar, text="Idle", bg=self.bg_color, fg=self.text_color, font=self.text_font)
+        self.job_label.pack(side=tk.LEFT, padx=10)
+        self.job_progress = ttk.Progressbar(self.status_bar, length=200, maximum=1.0)
+        self.job_progress.pack(side=tk.LEFT, padx=5)
+        tk.Button(self.status_bar, text="Cancel", command=self.cancel_job, bg=self.button_bg, fg=self.button_fg, font=self.button_font).pack(side=tk.LEFT, padx=5)
+        tk.Button(self.status_bar, text="Cancel All", command=self.jobs.cancel_all, bg=self.button_bg, fg=self.button_fg, font=self.button_font).pack(side=tk.LEFT)
+
         self.main_content = tk.Frame(root, bg=self.bg_color)
         self.main_content.pack(fill=tk.BOTH, expand=True)
 
@@ -39,6 +322,27 @@ class MilitarySimulatorApp:
 
         self.content_label = tk.Label(self.right_panel, text="Select an option from the left menu.", wraplength=400, bg=self.bg_color, fg=self.text_color, font=self.text_font)
         self.content_label.pack(pady=20)
+        self.result_frame = None
+
+    def show_jobs(self):
+        job = self.jobs.current
+        waiting = len(self.jobs.queued)
+        if job is None:
+            self.job_label.config(text=f"{waiting} queued" if waiting else "Idle")
+            self.job_progress.config(value=0)
+            return
+        done, total = job.progress or (0, 0)
+        text = f"Running: {job.title}"
+        if total:
+            text += f" ({done}/{total})"
+        if waiting:
+            text += f", {waiting} queued"
+        self.job_label.config(text=text)
+        self.job_progress.config(value=done / total if total else 0)
+
+    def cancel_job(self):
+        if self.jobs.current is not None:
+            self.jobs.current.cancel()
 
     def create_menu_button(self, text, command):
         button = tk.Button(self.left_panel, text=text, command=command, width=20, bg=self.button_bg, fg=self.button_fg, font=self.button_font, relief=tk.RAISED, borderwidth=3)
@@ -49,6 +353,57 @@ class MilitarySimulatorApp:
             widget.destroy()
         self.content_label = tk.Label(self.right_panel, text="", wraplength=400, bg=self.bg_color, fg=self.text_color, font=self.text_font)
         self.content_label.pack(pady=20)
+        self.result_frame = None
+
+    def replace_result(self, frame):
+        """Show frame below the action buttons in place of the previous report or list"""
+        if self.result_frame is not None:
+            self.result_frame.destroy()
+        self.result_frame = frame
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    # Report lines handed to the Tk thread at a time
+    REPORT_BATCH = 500
+
+    def show_report(self, lines, title="", total=None):
+        """Stream a report's lines into a scrollable box below the action buttons.
+
+        The lines are produced by a background job and shown batch by batch;
+        the job stops if the box is replaced before the report is finished.
+        Given the number of lines to expect, the job reports its progress.
+        """
+        self.content_label.config(text=title)
+        frame = tk.Frame(self.right_panel, bg=self.bg_color)
+        self.replace_result(frame)
+        scrollbar = tk.Scrollbar(frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text_box = tk.Text(frame, wrap=tk.NONE, height=20, bg=self.bg_color, fg=self.text_color,
+                           font=self.text_font, yscrollcommand=scrollbar.set, state=tk.DISABLED)
+        text_box.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=text_box.yview)
+
+        def produce(job):
+            iterator = iter(lines)
+            done = 0
+            while not job.cancelled:
+                chunk = list(itertools.islice(iterator, self.REPORT_BATCH))
+                if not chunk:
+                    break
+                job.publish("".join(chunk))
+                if total:
+                    done += len(chunk)
+                    job.report(done, total)
+
+        def show(text):
+            if not append_text(text_box, text):
+                job.cancel()
+
+        job = self.jobs.submit(title.rstrip(":") or "Report", produce, on_update=show)
+
+    def show_listing(self, kind, title, **options):
+        """Show a sortable, filterable list of soldiers, teams, missions or events below the action buttons"""
+        self.content_label.config(text=title)
+        self.replace_result(VirtualTree(self.right_panel, self.simulator, self.jobs, kind, **options).frame)
 
     def show_soldier_menu(self):
         self.clear_content()
@@ -117,109 +472,124 @@ class MilitarySimulatorApp:
         if name:
             rank = simpledialog.askstring("Create Soldier", "Enter rank (default: Private):") or "Private"
             status = simpledialog.askstring("Create Soldier", "Enter status (default: Active):") or "Active"
-            soldier = self.simulator.create_soldier(name, status=status, rank=rank)
-            self.content_label.config(text=f"Soldier created: {soldier}")
+            try:
+                with self.jobs.hold_simulator():
+                    soldier = self.simulator.create_soldier(name, status=status, rank=rank)
+                    self.content_label.config(text=f"Soldier created: {soldier}")
+            except ValueError as e:
+                self.content_label.config(text=str(e))
 
     def view_soldier_details(self):
         name = simpledialog.askstring("View Soldier Details", "Enter soldier name:")
         if name:
-            soldier = self.simulator.find_soldier(name)
-            if soldier:
-                details = "\n".join([f"{key.capitalize()}: {value}" for key, value in soldier.report_status().items()])
-                self.content_label.config(text=f"Soldier Details:\n{details}")
-            else:
-                self.content_label.config(text=f"Soldier '{name}' not found")
+            with self.jobs.hold_simulator():
+                soldier = self.simulator.find_soldier(name)
+                if soldier:
+                    details = "\n".join([f"{key.capitalize()}: {value}" for key, value in soldier.report_status().items()])
+                    self.content_label.config(text=f"Soldier Details:\n{details}")
+                else:
+                    self.content_label.config(text=f"Soldier '{name}' not found")
 
     def update_soldier_status(self):
         name = simpledialog.askstring("Update Soldier Status", "Enter soldier name:")
         if name:
             status = simpledialog.askstring("Update Soldier Status", "Enter new status (Active/Injured/Unavailable/OnLeave/MIA):")
-            soldier = self.simulator.find_soldier(name)
-            if soldier:
-                if soldier.update_status(status):
-                    self.content_label.config(text=f"Soldier {name} status updated to {status}")
+            with self.jobs.hold_simulator():
+                soldier = self.simulator.find_soldier(name)
+                if soldier:
+                    if soldier.update_status(status):
+                        self.content_label.config(text=f"Soldier {name} status updated to {status}")
+                    else:
+                        self.content_label.config(text="Invalid status")
                 else:
-                    self.content_label.config(text="Invalid status")
-            else:
-                self.content_label.config(text=f"Soldier '{name}' not found")
+                    self.content_label.config(text=f"Soldier '{name}' not found")
 
     def add_equipment_to_soldier(self):
         name = simpledialog.askstring("Add Equipment to Soldier", "Enter soldier name:")
         if name:
             item = simpledialog.askstring("Add Equipment to Soldier", "Enter equipment item:")
             quantity = simpledialog.askstring("Add Equipment to Soldier", "Enter quantity:")
-            soldier = self.simulator.find_soldier(name)
-            if soldier:
-                try:
-                    quantity = int(quantity)
-                    soldier.add_equipment(item, quantity)
-                    self.content_label.config(text=f"Added {quantity} {item} to {name}")
-                except ValueError:
-                    self.content_label.config(text="Invalid quantity")
-            else:
-                self.content_label.config(text=f"Soldier '{name}' not found")
+            with self.jobs.hold_simulator():
+                soldier = self.simulator.find_soldier(name)
+                if soldier:
+                    try:
+                        quantity = int(quantity)
+                        soldier.add_equipment(item, quantity)
+                        self.content_label.config(text=f"Added {quantity} {item} to {name}")
+                    except ValueError:
+                        self.content_label.config(text="Invalid quantity")
+                else:
+                    self.content_label.config(text=f"Soldier '{name}' not found")
 
     def update_soldier_health(self):
         name = simpledialog.askstring("Update Soldier Health", "Enter soldier name:")
         if name:
             health_change = simpledialog.askstring("Update Soldier Health", "Enter health change (positive to heal, negative for damage):")
-            soldier = self.simulator.find_soldier(name)
-            if soldier:
-                try:
-                    health_change = int(health_change)
-                    new_health = soldier.update_health(health_change)
-                    self.content_label.config(text=f"Soldier {name} health updated to {new_health}")
-                except ValueError:
-                    self.content_label.config(text="Invalid health change")
-            else:
-                self.content_label.config(text=f"Soldier '{name}' not found")
+            with self.jobs.hold_simulator():
+                soldier = self.simulator.find_soldier(name)
+                if soldier:
+                    try:
+                        health_change = int(health_change)
+                        new_health = soldier.update_health(health_change)
+                        self.content_label.config(text=f"Soldier {name} health updated to {new_health}")
+                    except ValueError:
+                        self.content_label.config(text="Invalid health change")
+                else:
+                    self.content_label.config(text=f"Soldier '{name}' not found")
 
     def list_all_soldiers(self):
-        soldiers = self.simulator.soldiers
+        with self.jobs.hold_simulator():
+            soldiers = len(self.simulator.soldiers)
         if not soldiers:
             self.content_label.config(text="No soldiers found")
         else:
-            soldier_list = "\n".join([str(soldier) for soldier in soldiers])
-            self.content_label.config(text=f"All Soldiers:\n{soldier_list}")
+            self.show_listing("soldiers", f"All Soldiers ({soldiers}):", statuses=Soldier.STATUS_TYPES)
 
     def create_team(self):
         name = simpledialog.askstring("Create Team", "Enter team name:")
         if name:
-            team = self.simulator.create_team(name)
-            self.content_label.config(text=f"Team created: {team}")
+            try:
+                with self.jobs.hold_simulator():
+                    team = self.simulator.create_team(name)
+                    self.content_label.config(text=f"Team created: {team}")
+            except ValueError as e:
+                self.content_label.config(text=str(e))
 
     def add_soldier_to_team(self):
         team_name = simpledialog.askstring("Add Soldier to Team", "Enter team name:")
         if team_name:
             soldier_name = simpledialog.askstring("Add Soldier to Team", "Enter soldier name:")
-            team = self.simulator.find_team(team_name)
-            soldier = self.simulator.find_soldier(soldier_name)
-            if team and soldier:
-                team.add_member(soldier)
-                self.content_label.config(text=f"Soldier {soldier_name} added to team {team_name}")
-            else:
-                self.content_label.config(text="Team or soldier not found")
+            with self.jobs.hold_simulator():
+                team = self.simulator.find_team(team_name)
+                soldier = self.simulator.find_soldier(soldier_name)
+                if team and soldier:
+                    team.add_member(soldier)
+                    self.content_label.config(text=f"Soldier {soldier_name} added to team {team_name}")
+                else:
+                    self.content_label.config(text="Team or soldier not found")
 
     def set_team_commander(self):
         team_name = simpledialog.askstring("Set Team Commander", "Enter team name:")
         if team_name:
             soldier_name = simpledialog.askstring("Set Team Commander", "Enter soldier name:")
-            team = self.simulator.find_team(team_name)
-            soldier = self.simulator.find_soldier(soldier_name)
-            if team and soldier:
-                if team.set_commander(soldier):
-                    self.content_label.config(text=f"{soldier_name} set as commander of team {team_name}")
+            with self.jobs.hold_simulator():
+                team = self.simulator.find_team(team_name)
+                soldier = self.simulator.find_soldier(soldier_name)
+                if team and soldier:
+                    if team.set_commander(soldier):
+                        self.content_label.config(text=f"{soldier_name} set as commander of team {team_name}")
+                    else:
+                        self.content_label.config(text="Soldier not in team")
                 else:
-                    self.content_label.config(text="Soldier not in team")
-            else:
-                self.content_label.config(text="Team or soldier not found")
+                    self.content_label.config(text="Team or soldier not found")
 
     def view_team_status(self):
         team_name = simpledialog.askstring("View Team Status", "Enter team name:")
         if team_name:
-            team = self.simulator.find_team(team_name)
+            with self.jobs.hold_simulator():
+                team = self.simulator.find_team(team_name)
             if team:
-                self.content_label.config(text=team.team_status())
+                self.show_report(team.team_status_lines())
             else:
                 self.content_label.config(text=f"Team '{team_name}' not found")
 
@@ -228,24 +598,31 @@ class MilitarySimulatorApp:
         if team_name:
             x = simpledialog.askstring("Move Team", "Enter X coordinate:")
             y = simpledialog.askstring("Move Team", "Enter Y coordinate:")
-            team = self.simulator.find_team(team_name)
-            if team:
-                try:
-                    x = int(x)
-                    y = int(y)
-                    team.move_team((x, y))
-                    self.content_label.config(text=f"Team {team_name} moved to ({x}, {y})")
-                except ValueError:
-                    self.content_label.config(text="Invalid coordinates")
-            else:
-                self.content_label.config(text=f"Team '{team_name}' not found")
+            formation = simpledialog.askstring("Move Team", "Enter formation (line/column/wedge/circle):") or "line"
+            speed = simpledialog.askstring("Move Team", "Enter speed per tick (blank to move instantly):")
+            with self.jobs.hold_simulator():
+                team = self.simulator.find_team(team_name)
+                if team:
+                    try:
+                        x = int(x)
+                        y = int(y)
+                        speed = float(speed) if speed else None
+                        if team.move_team((x, y), formation=formation, speed=speed):
+                            self.content_label.config(text=f"Team {team_name} moved to ({x}, {y})")
+                        else:
+                            self.content_label.config(text=f"Could not move team {team_name}")
+                    except ValueError:
+                        self.content_label.config(text="Invalid coordinates")
+                else:
+                    self.content_label.config(text=f"Team '{team_name}' not found")
 
     def generate_equipment_report(self):
         team_name = simpledialog.askstring("Generate Equipment Report", "Enter team name:")
         if team_name:
-            team = self.simulator.find_team(team_name)
+            with self.jobs.hold_simulator():
+                team = self.simulator.find_team(team_name)
             if team:
-                self.content_label.config(text=team.equipment_report())
+                self.show_report(team.equipment_report_lines())
             else:
                 self.content_label.config(text=f"Team '{team_name}' not found")
 
@@ -254,25 +631,26 @@ class MilitarySimulatorApp:
         if team_name:
             item = simpledialog.askstring("Distribute Equipment", "Enter equipment item:")
             quantity = simpledialog.askstring("Distribute Equipment", "Enter quantity:")
-            team = self.simulator.find_team(team_name)
+            with self.jobs.hold_simulator():
+                team = self.simulator.find_team(team_name)
             if team:
                 try:
                     quantity = int(quantity)
-                    equipment_dict = {item: quantity}
-                    team.distribute_equipment(equipment_dict)
-                    self.content_label.config(text=f"Distributed {quantity} {item} to team {team_name}")
                 except ValueError:
                     self.content_label.config(text="Invalid quantity")
+                    return
+                self.jobs.submit(f"Distribute {item} to {team_name}", lambda job: team.distribute_equipment({item: quantity}),
+                                 on_done=lambda result: self.content_label.config(text=f"Distributed {quantity} {item} to team {team_name}"))
             else:
                 self.content_label.config(text=f"Team '{team_name}' not found")
 
     def list_all_teams(self):
-        teams = self.simulator.teams
+        with self.jobs.hold_simulator():
+            teams = len(self.simulator.teams)
         if not teams:
             self.content_label.config(text="No teams found")
         else:
-            team_list = "\n".join([str(team) for team in teams])
-            self.content_label.config(text=f"All Teams:\n{team_list}")
+            self.show_listing("teams", f"All Teams ({teams}):")
 
     def create_mission(self):
         name = simpledialog.askstring("Create Mission", "Enter mission name:")
@@ -283,208 +661,214 @@ class MilitarySimulatorApp:
             try:
                 x = int(x)
                 y = int(y)
-                mission = self.simulator.create_mission(name, description, (x, y))
-                self.content_label.config(text=f"Mission created: {mission}")
             except ValueError:
                 self.content_label.config(text="Invalid coordinates")
+                return
+            try:
+                with self.jobs.hold_simulator():
+                    mission = self.simulator.create_mission(name, description, (x, y))
+                    self.content_label.config(text=f"Mission created: {mission}")
+            except ValueError as e:
+                self.content_label.config(text=str(e))
 
     def add_team_to_mission(self):
         mission_name = simpledialog.askstring("Add Team to Mission", "Enter mission name:")
         if mission_name:
             team_name = simpledialog.askstring("Add Team to Mission", "Enter team name:")
-            mission = self.simulator.find_mission(mission_name)
-            team = self.simulator.find_team(team_name)
-            if mission and team:
-                mission.add_team(team)
-                self.content_label.config(text=f"Team {team_name} added to mission {mission_name}")
-            else:
-                self.content_label.config(text="Mission or team not found")
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                team = self.simulator.find_team(team_name)
+                if mission and team:
+                    mission.add_team(team)
+                    self.content_label.config(text=f"Team {team_name} added to mission {mission_name}")
+                else:
+                    self.content_label.config(text="Mission or team not found")
 
     def add_objective_to_mission(self):
         mission_name = simpledialog.askstring("Add Objective to Mission", "Enter mission name:")
         if mission_name:
             objective = simpledialog.askstring("Add Objective to Mission", "Enter objective description:")
-            mission = self.simulator.find_mission(mission_name)
-            if mission:
-                mission.add_objective(objective)
-                self.content_label.config(text=f"Objective added to mission {mission_name}")
-            else:
-                self.content_label.config(text=f"Mission '{mission_name}' not found")
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                if mission:
+                    mission.add_objective(objective)
+                    self.content_label.config(text=f"Objective added to mission {mission_name}")
+                else:
+                    self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def complete_objective(self):
         mission_name = simpledialog.askstring("Complete Objective", "Enter mission name:")
         if mission_name:
             objective_index = simpledialog.askstring("Complete Objective", "Enter objective index (starting from 1):")
-            mission = self.simulator.find_mission(mission_name)
-            if mission:
-                try:
-                    index = int(objective_index) - 1
-                    if mission.complete_objective(index):
-                        self.content_label.config(text=f"Objective {index + 1} completed in mission {mission_name}")
-                    else:
-                        self.content_label.config(text="Invalid objective index")
-                except ValueError:
-                    self.content_label.config(text="Invalid index")
-            else:
-                self.content_label.config(text=f"Mission '{mission_name}' not found")
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                if mission:
+                    try:
+                        index = int(objective_index) - 1
+                        if mission.complete_objective(index):
+                            self.content_label.config(text=f"Objective {index + 1} completed in mission {mission_name}")
+                        else:
+                            self.content_label.config(text="Invalid objective index")
+                    except ValueError:
+                        self.content_label.config(text="Invalid index")
+                else:
+                    self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def change_mission_status(self):
         mission_name = simpledialog.askstring("Change Mission Status", "Enter mission name:")
         if mission_name:
             status = simpledialog.askstring("Change Mission Status", "Enter new status (Pending/Active/Completed/Failed/Aborted):")
-            mission = self.simulator.find_mission(mission_name)
-            if mission:
-                if mission.update_status(status):
-                    self.content_label.config(text=f"Mission {mission_name} status updated to {status}")
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                if mission:
+                    if mission.update_status(status):
+                        self.content_label.config(text=f"Mission {mission_name} status updated to {status}")
+                    else:
+                        self.content_label.config(text="Invalid status")
                 else:
-                    self.content_label.config(text="Invalid status")
-            else:
-                self.content_label.config(text=f"Mission '{mission_name}' not found")
+                    self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def view_mission_report(self):
         mission_name = simpledialog.askstring("View Mission Report", "Enter mission name:")
         if mission_name:
-            mission = self.simulator.find_mission(mission_name)
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
             if mission:
-                self.content_label.config(text=mission.mission_report())
+                self.show_report(mission.mission_report_lines())
             else:
                 self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def calculate_success_probability(self):
         mission_name = simpledialog.askstring("Calculate Success Probability", "Enter mission name:")
         if mission_name:
-            mission = self.simulator.find_mission(mission_name)
-            if mission:
-                probability = mission.calculate_success_probability()
-                self.content_label.config(text=f"Success probability for mission {mission_name}: {probability}%")
-            else:
-                self.content_label.config(text=f"Mission '{mission_name}' not found")
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                if mission:
+                    probability = mission.calculate_success_probability()
+                    self.content_label.config(text=f"Success probability for mission {mission_name}: {probability}%")
+                else:
+                    self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def set_mission_difficulty(self):
         mission_name = simpledialog.askstring("Set Mission Difficulty", "Enter mission name:")
         if mission_name:
             difficulty = simpledialog.askstring("Set Mission Difficulty", "Enter difficulty level (1-10):")
-            mission = self.simulator.find_mission(mission_name)
-            if mission:
-                try:
-                    difficulty = int(difficulty)
-                    if mission.set_difficulty(difficulty):
-                        self.content_label.config(text=f"Difficulty set to {difficulty} for mission {mission_name}")
-                    else:
-                        self.content_label.config(text="Invalid difficulty level")
-                except ValueError:
-                    self.content_label.config(text="Invalid difficulty")
-            else:
-                self.content_label.config(text=f"Mission '{mission_name}' not found")
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                if mission:
+                    try:
+                        difficulty = int(difficulty)
+                        if mission.set_difficulty(difficulty):
+                            self.content_label.config(text=f"Difficulty set to {difficulty} for mission {mission_name}")
+                        else:
+                            self.content_label.config(text="Invalid difficulty level")
+                    except ValueError:
+                        self.content_label.config(text="Invalid difficulty")
+                else:
+                    self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def list_all_missions(self):
-        missions = self.simulator.missions
+        with self.jobs.hold_simulator():
+            missions = len(self.simulator.missions)
         if not missions:
             self.content_label.config(text="No missions found")
         else:
-            mission_list = "\n".join([str(mission) for mission in missions])
-            self.content_label.config(text=f"All Missions:\n{mission_list}")
+            self.show_listing("missions", f"All Missions ({missions}):", statuses=Mission.STATUS_TYPES)
 
     def simulate_mission_progress(self):
         mission_name = simpledialog.askstring("Simulate Mission Progress", "Enter mission name:")
         if mission_name:
-            mission = self.simulator.find_mission(mission_name)
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
             if mission:
-                status = self.simulator.simulate_mission_progress(mission_name)
-                self.content_label.config(text=f"Mission progress simulated. New status: {status}")
+                self.jobs.submit(f"Simulate {mission_name}", lambda job: self.simulator.simulate_mission_progress(mission_name),
+                                 on_done=lambda status: self.content_label.config(text=f"Mission progress simulated. New status: {status}"))
             else:
                 self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def auto_complete_mission(self):
         mission_name = simpledialog.askstring("Auto-complete Mission", "Enter mission name:")
         if mission_name:
-            mission = self.simulator.find_mission(mission_name)
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                status = mission.status if mission else None
             if mission:
-                if mission.status not in ["Completed", "Failed", "Aborted"]:
-                    mission.update_status("Active")
-                    for i in range(len(mission.objectives)):
-                        mission.complete_objective(i)
-                    mission.update_status("Completed")
-                    self.content_label.config(text=f"Mission {mission_name} auto-completed")
+                if status not in ["Completed", "Failed", "Aborted"]:
+                    self.jobs.submit(f"Auto-complete {mission_name}", lambda job: self._auto_complete(job, mission),
+                                     on_done=lambda result: self.content_label.config(text=f"Mission {mission_name} auto-completed"))
                 else:
-                    self.content_label.config(text=f"Mission {mission_name} already finalized with status: {mission.status}")
+                    self.content_label.config(text=f"Mission {mission_name} already finalized with status: {status}")
             else:
                 self.content_label.config(text=f"Mission '{mission_name}' not found")
 
+    def _auto_complete(self, job, mission):
+        mission.update_status("Active")
+        total = len(mission.objectives)
+        for i in range(total):
+            if job.cancelled:
+                return
+            mission.complete_objective(i)
+            job.report(i + 1, total)
+        mission.update_status("Completed")
+
     def generate_casualty_event(self):
         team_name = simpledialog.askstring("Generate Casualty Event", "Enter team name:")
         if team_name:
-            team = self.simulator.find_team(team_name)
-            if team:
-                active_members = [m for m in team.members if m.status == "Active"]
-                if not active_members:
-                    self.content_label.config(text="No active members in team")
+            with self.jobs.hold_simulator():
+                team = self.simulator.find_team(team_name)
+                if team:
+                    casualty = self.simulator.generate_casualty_event(team.name)
+                    if not casualty:
+                        self.content_label.config(text="No active members in team")
+                    else:
+                        victim, damage = casualty
+                        self.content_label.config(text=f"Casualty event: {victim.name} took {damage} damage")
                 else:
-                    victim = random.choice(active_members)
-                    damage = random.randint(10, 50)
-                    victim.update_health(-damage)
-                    self.content_label.config(text=f"Casualty event: {victim.name} took {damage} damage")
-            else:
-                self.content_label.config(text=f"Team '{team_name}' not found")
+                    self.content_label.config(text=f"Team '{team_name}' not found")
 
     def generate_random_event(self):
         mission_name = simpledialog.askstring("Generate Random Event", "Enter mission name:")
         if mission_name:
-            mission = self.simulator.find_mission(mission_name)
-            if mission:
-                events = [
-                    "encountered unexpected resistance",
-                    "discovered valuable intelligence",
-                    "experienced equipment malfunction",
-                    "weather conditions deteriorated",
-                    "found alternate route",
-                    "communications disrupted",
-                    "supply drop received",
-                    "encountered friendly forces",
-                    "detected enemy patrol",
-                    "secured key position"
-                ]
-                event = random.choice(events)
-                mission.log_event(f"Random event: {event}")
-                self.content_label.config(text=f"Random event generated for mission {mission_name}: {event}")
-            else:
-                self.content_label.config(text=f"Mission '{mission_name}' not found")
+            with self.jobs.hold_simulator():
+                mission = self.simulator.find_mission(mission_name)
+                if mission:
+                    event = self.simulator.generate_random_event(mission.name)
+                    self.content_label.config(text=f"Random event generated for mission {mission_name}: {event}")
+                else:
+                    self.content_label.config(text=f"Mission '{mission_name}' not found")
 
     def global_status_report(self):
-        self.content_label.config(text=self.simulator.global_status_report())
+        self.show_report(self.simulator.global_status_report_lines())
 
     def team_skill_assessment(self):
-        teams = self.simulator.teams
+        with self.jobs.hold_simulator():
+            teams = list(self.simulator.teams)
         if not teams:
             self.content_label.config(text="No teams found")
         else:
-            report = "\n".join([team.team_skill_report() for team in teams])
-            self.content_label.config(text=f"Team Skill Assessment:\n{report}")
+            self.show_report(itertools.chain.from_iterable(team.team_skill_report_lines() for team in teams),
+                             "Team Skill Assessment:")
 
     def mission_success_probabilities(self):
-        missions = self.simulator.missions
+        with self.jobs.hold_simulator():
+            missions = list(self.simulator.missions)
         if not missions:
             self.content_label.config(text="No missions found")
         else:
-            report = "\n".join([f"Mission: {mission.name}\nSuccess Probability: {mission.calculate_success_probability()}%" for mission in missions])
-            self.content_label.config(text=f"Mission Success Probabilities:\n{report}")
+            self.show_report((f"Mission: {mission.name}\nSuccess Probability: {mission.calculate_success_probability()}%\n"
+                              for mission in missions), "Mission Success Probabilities:", total=len(missions))
 
     def recent_events_log(self):
-        logs = self.simulator.events_log
+        with self.jobs.hold_simulator():
+            logs = len(self.simulator.events_log)
         if not logs:
             self.content_label.config(text="No recent events")
         else:
-            logs_to_show = min(20, len(logs))
-            self.content_label.config(text=f"Recent Events Log:\n" + "\n".join(logs[-logs_to_show:]))
+            self.show_listing("events", "Recent Events Log (newest first):", descending=True)
 
     def equipment_summary(self):
-        all_equipment = {}
-        for soldier in self.simulator.soldiers:
-            for item, qty in soldier.equipment.items():
-                if item in all_equipment:
-                    all_equipment[item] += qty
-                else:
-                    all_equipment[item] = qty
+        with self.jobs.hold_simulator():
+            all_equipment = dict(self.simulator.equipment_totals)
         if not all_equipment:
             self.content_label.config(text="No equipment found")
         else:
@@ -492,18 +876,16 @@ class MilitarySimulatorApp:
             self.content_label.config(text=f"Equipment Summary:\n{report}")
 
     def personnel_status(self):
-        status_groups = {}
-        for soldier in self.simulator.soldiers:
-            if soldier.status not in status_groups:
-                status_groups[soldier.status] = []
-            status_groups[soldier.status].append(soldier)
-        if not status_groups:
+        with self.jobs.hold_simulator():
+            status_counts = self.simulator.soldier_statuses.counts()
+        if not status_counts:
             self.content_label.config(text="No personnel found")
         else:
-            report = "\n".join([f"\n{status} Personnel ({len(soldiers)}):\n" + "\n".join([f"- {soldier.rank} {soldier.name}, Health: {soldier.health}%" for soldier in soldiers]) for status, soldiers in status_groups.items()])
-            self.content_label.config(text=f"Personnel Status:\n{report}")
+            counts = ", ".join(f"{status}: {count}" for status, count in status_counts.items())
+            self.show_listing("soldiers", f"Personnel Status ({counts})", statuses=Soldier.STATUS_TYPES)
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = MilitarySimulatorApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    app.simulator.close()
\ No newline at end of file
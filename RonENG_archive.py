@@ -0,0 +1,296 @@
+import ast
+import heapq
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from СonsoleRonENG import EventRecord, _epoch, _in_period, _literal_args
+
+
+class EventSpill:
+    """Append-only segment file receiving entries evicted from EventHistory buffers.
+    
+    EventRecords are written unrendered (a "#" line introduces each event-type
+    format the first time it is used) and only formatted when read back.
+    Without a path a temporary file is created on the first eviction and
+    removed again by close().
+    """
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.file = None
+        self.temporary = path is None
+        self.next_key = 0
+        self.written_kinds = set()
+    
+    def register(self):
+        """Return a new key identifying one history in the segment file"""
+        key = self.next_key
+        self.next_key += 1
+        return key
+    
+    def write(self, key, entry):
+        if self.file is None:
+            if self.path is None:
+                handle, self.path = tempfile.mkstemp(prefix="military-sim-", suffix=".log")
+                os.close(handle)
+            self.file = open(self.path, "a", encoding="utf-8")
+        
+        if not isinstance(entry, EventRecord):
+            self.file.write(f"{key}\t\t{json.dumps(str(entry))}\n")
+            return
+        if entry.kind not in self.written_kinds:
+            self.written_kinds.add(entry.kind)
+            self.file.write(f"#\t{entry.kind}\t{json.dumps(EventRecord.formats[entry.kind])}\n")
+        self.file.write(f"{key}\t{entry.timestamp}\t{entry.kind}\t{_literal_args(entry.args)!r}\n")
+    
+    def read(self, key, start=None, end=None):
+        """Yield every spilled entry for a key as text, oldest first, or only those logged in [start, end)"""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        if self.file:
+            self.file.flush()
+        
+        start, end = _epoch(start), _epoch(end)
+        prefix = f"{key}\t"
+        formats = {}
+        with open(self.path, encoding="utf-8") as segment:
+            for line in segment:
+                if line.startswith("#\t"):
+                    _, kind, fmt = line.rstrip("\n").split("\t", 2)
+                    formats[int(kind)] = json.loads(fmt)
+                elif line.startswith(prefix):
+                    _, timestamp, rest = line.rstrip("\n").split("\t", 2)
+                    if not timestamp:
+                        if _in_period(None, start, end):
+                            yield json.loads(rest)
+                        continue
+                    if not _in_period(int(timestamp), start, end):
+                        continue
+                    kind, args = rest.split("\t", 1)
+                    timestamp = datetime.fromtimestamp(int(timestamp)).strftime("%Y-%m-%d %H:%M:%S")
+                    yield f"{timestamp}: {formats[int(kind)].format(*ast.literal_eval(args))}"
+    
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        if self.temporary and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+            self.path = None
+
+
+class EventArchive:
+    """EventSpill replacement keeping evicted entries in memory-mapped, indexed segments.
+    
+    Entries are buffered in memory until SEGMENT_RECORDS have arrived and
+    then sealed into the archive directory as one segment: a fixed-width
+    record array (timestamp, history key, event-type code and where the
+    arguments start and end), a file of packed argument literals, and two
+    sidecar indexes, one sorted by (key, timestamp) and one by timestamp.
+    archive.json lists every segment with its time and key range, the
+    event-type formats and the next free key, so an archive can be
+    reopened. Segments are read with np.load(mmap_mode="r"): queries skip
+    segments whose ranges cannot match and binary-search the indexes, so
+    they only touch the pages holding matching records. Without a path a
+    temporary directory is used and removed again by close().
+    """
+    SEGMENT_RECORDS = 65_536
+    RECORD = np.dtype([("timestamp", "<i8"), ("key", "<i4"), ("kind", "<i4"), ("offset", "<i8"), ("length", "<i4")])
+    # The entity index packs (key, timestamp) into one int64; timestamps are clipped below 2**34 (year 2514)
+    TIME_BITS = 34
+    INDEXES = ("records", "entity-keys", "entity-rows", "time-keys", "time-rows")
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.temporary = path is None
+        self.segments = []  # Manifest entry of every sealed segment
+        self.formats = []  # Archive event-type code -> format string
+        self.next_key = 0
+        manifest = path and os.path.join(path, "archive.json")
+        if manifest and os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as stream:
+                state = json.load(stream)
+            self.segments, self.formats, self.next_key = state["segments"], state["formats"], state["next_key"]
+        self.format_codes = {fmt: code for code, fmt in enumerate(self.formats)}
+        self.tail = []  # (timestamp, key, kind, arguments literal) not sealed yet
+        self.tail_index = {}  # key -> positions in tail
+        self.mapped = {}  # Segment number -> its memory-mapped arrays
+    
+    def register(self):
+        """Return a new key identifying one history in the archive"""
+        key = self.next_key
+        self.next_key += 1
+        return key
+    
+    def write(self, key, entry):
+        if isinstance(entry, EventRecord):
+            fmt = EventRecord.formats[entry.kind]
+            kind = self.format_codes.get(fmt)
+            if kind is None:
+                kind = self.format_codes[fmt] = len(self.formats)
+                self.formats.append(fmt)
+            record = (entry.timestamp, key, kind, repr(_literal_args(entry.args)))
+        else:
+            record = (-1, key, -1, repr(str(entry)))
+        self.tail_index.setdefault(key, []).append(len(self.tail))
+        self.tail.append(record)
+        if len(self.tail) >= self.SEGMENT_RECORDS:
+            self.seal()
+    
+    def seal(self):
+        """Write the buffered entries out as a new segment"""
+        if not self.tail:
+            return
+        if self.path is None:
+            self.path = tempfile.mkdtemp(prefix="military-sim-archive-")
+        os.makedirs(self.path, exist_ok=True)
+        
+        timestamps, keys, kinds, literals = zip(*self.tail)
+        blobs = [literal.encode("utf-8") for literal in literals]
+        records = np.empty(len(blobs), dtype=self.RECORD)
+        records["timestamp"] = timestamps
+        records["key"] = keys
+        records["kind"] = kinds
+        records["length"] = np.fromiter(map(len, blobs), dtype=np.int32, count=len(blobs))
+        records["offset"] = np.cumsum(records["length"], dtype=np.int64) - records["length"]
+        
+        # Stable sorts keep append order among records logged in the same second
+        entity_keys = self._entity_key(records["key"].astype(np.int64), records["timestamp"])
+        by_entity = np.argsort(entity_keys, kind="stable")
+        by_time = np.argsort(records["timestamp"], kind="stable")
+        base = self._base(len(self.segments))
+        np.save(base + ".records.npy", records)
+        with open(base + ".args", "wb") as stream:
+            stream.write(b"".join(blobs))
+        np.save(base + ".entity-keys.npy", entity_keys[by_entity])
+        np.save(base + ".entity-rows.npy", by_entity.astype(np.int32))
+        np.save(base + ".time-keys.npy", records["timestamp"][by_time])
+        np.save(base + ".time-rows.npy", by_time.astype(np.int32))
+        
+        timed = records["timestamp"][records["timestamp"] >= 0]
+        self.segments.append({
+            "records": len(records),
+            "first": int(timed.min()) if len(timed) else None,
+            "last": int(timed.max()) if len(timed) else None,
+            "low_key": min(keys),
+            "high_key": max(keys),
+        })
+        self._write_manifest()
+        self.tail = []
+        self.tail_index = {}
+    
+    def read(self, key, start=None, end=None):
+        """Yield the archived entries for a key as text, oldest first.
+        
+        With start or end (datetimes or epoch seconds) only entries logged
+        in [start, end) are returned; entries without a timestamp are left out.
+        """
+        start, end = _epoch(start), _epoch(end)
+        bounded = start is not None or end is not None
+        low = self._entity_key(key, self._second(start, 0))
+        high = self._entity_key(key + 1, 0) if end is None else self._entity_key(key, self._second(end, 0))
+        for number, segment in enumerate(self.segments):
+            if not segment["low_key"] <= key <= segment["high_key"] or not self._overlaps(segment, start, end):
+                continue
+            arrays = self._segment(number)
+            entity_keys = arrays["entity-keys"]
+            rows = np.sort(arrays["entity-rows"][np.searchsorted(entity_keys, low):np.searchsorted(entity_keys, high)])
+            for record in arrays["records"][rows].tolist():
+                if not bounded or record[0] >= 0:
+                    yield self._render(arrays, record)
+        for position in self.tail_index.get(key, ()):
+            timestamp, _, kind, literal = self.tail[position]
+            if _in_period(None if timestamp < 0 else timestamp, start, end):
+                yield self._format(timestamp, kind, literal)
+    
+    def between(self, start=None, end=None):
+        """Yield every archived entry logged in [start, end) as text, oldest first, whichever history it belongs to"""
+        start, end = _epoch(start), _epoch(end)
+        streams = [self._logged(number, start, end) for number, segment in enumerate(self.segments)
+                   if self._overlaps(segment, start, end)]
+        streams.append(sorted((record[0], position, self._format(record[0], record[2], record[3]))
+                              for position, record in enumerate(self.tail)
+                              if record[0] >= 0 and _in_period(record[0], start, end)))
+        for _, _, text in heapq.merge(*streams):
+            yield text
+    
+    def _logged(self, number, start, end):
+        # Entries logged in the same second merge in segment order, ahead of the unsealed tail
+        order = number - len(self.segments)
+        arrays = self._segment(number)
+        times = arrays["time-keys"]
+        low = np.searchsorted(times, max(self._second(start, 0), 0))
+        high = len(times) if end is None else np.searchsorted(times, self._second(end, 0))
+        for row in arrays["time-rows"][low:high].tolist():
+            record = arrays["records"][row].tolist()
+            yield record[0], order, self._render(arrays, record)
+    
+    def _render(self, arrays, record):
+        timestamp, _, kind, offset, length = record
+        return self._format(timestamp, kind, arrays["args"][offset:offset + length].decode("utf-8"))
+    
+    def _format(self, timestamp, kind, literal):
+        args = ast.literal_eval(literal)
+        if kind < 0:
+            return args
+        timestamp = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{timestamp}: {self.formats[kind].format(*args)}"
+    
+    def _segment(self, number):
+        arrays = self.mapped.get(number)
+        if arrays is None:
+            base = self._base(number)
+            arrays = {name: np.load(f"{base}.{name}.npy", mmap_mode="r") for name in self.INDEXES}
+            with open(base + ".args", "rb") as stream:
+                arrays["args"] = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            self.mapped[number] = arrays
+        return arrays
+    
+    def _base(self, number):
+        return os.path.join(self.path, f"segment-{number:06d}")
+    
+    @classmethod
+    def _entity_key(cls, key, timestamp):
+        return (key << cls.TIME_BITS) | np.clip(timestamp, 0, (1 << cls.TIME_BITS) - 1)
+    
+    @staticmethod
+    def _second(moment, default):
+        """First whole second at or after moment"""
+        return default if moment is None else int(np.ceil(moment))
+    
+    @staticmethod
+    def _overlaps(segment, start, end):
+        if start is None and end is None:
+            return True
+        if segment["first"] is None:
+            return False
+        return (start is None or segment["last"] >= start) and (end is None or segment["first"] < end)
+    
+    def _write_manifest(self):
+        manifest = os.path.join(self.path, "archive.json")
+        with open(manifest + ".tmp", "w", encoding="utf-8") as stream:
+            json.dump({"segments": self.segments, "formats": self.formats, "next_key": self.next_key}, stream)
+        os.replace(manifest + ".tmp", manifest)
+    
+    def close(self):
+        """Seal the buffered entries (a temporary archive is deleted instead) and unmap the segments"""
+        for arrays in self.mapped.values():
+            arrays["args"].close()
+        self.mapped = {}
+        if self.temporary:
+            if self.path and os.path.exists(self.path):
+                shutil.rmtree(self.path)
+            self.path = None
+            self.segments = []
+            self.tail = []
+            self.tail_index = {}
+        elif self.tail:
+            self.seal()
+        elif os.path.isdir(self.path):
+            self._write_manifest()
@@ -0,0 +1,354 @@
+import itertools
+import marshal
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+from СonsoleRonENG import JournalSlot, LabeledEnum, Mission, Soldier, Team, write_snapshot
+
+
+class WriteAheadJournal:
+    """Append-only journal of the mutations made to one MilitarySimulator, for crash recovery.
+    
+    Every outermost call of a _journaled method on the simulator or one of
+    its soldiers, teams and missions is queued untouched once it returns.
+    Every group_seconds a background thread appends the queued calls as
+    one checksummed group, fsynced, so a crash loses at most the last
+    group. A group is marshalled in one call as columns: soldiers are named
+    by their SoldierTable row, teams and missions by kind and name, and
+    only arguments marshal cannot write (entities, enums, NumPy values)
+    go through _encode(). Names are taken when the calls are written, so
+    the simulator commits the queue before it renames or removes anything,
+    and callers must not change the arguments they passed afterwards.
+    
+    Every checkpoint_records records or checkpoint_seconds the calling
+    thread copies the world out with snapshot_sections and the background
+    thread writes the copy as a checkpoint and deletes the files before
+    it. The journal file started with a checkpoint first records the rows
+    of the soldiers in it, so recovery can find soldiers by row. A call
+    that cannot be encoded (a Terrain argument, say) drops the
+    calls after it up to a checkpoint taken at the next journaled call.
+    Changes made some other way (editing a Terrain, setting attributes
+    directly) only reach the next checkpoint.
+    MilitarySimulator.recover() loads the newest checkpoint and replays the
+    journal after it. One journal records at a time.
+    
+    Journal files hold marshal data, so they can only be recovered by the
+    Python version that wrote them.
+    """
+    # Argument types _encode() keeps as they are
+    PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+    # Group header: size and CRC-32 of the marshalled records that follow
+    GROUP_HEADER = struct.Struct("<II")
+    GROUP_SECONDS = 0.05
+    CHECKPOINT_RECORDS = 100_000
+    CHECKPOINT_SECONDS = 300
+    
+    def __init__(self, simulator, directory, group_seconds=GROUP_SECONDS,
+                 checkpoint_records=CHECKPOINT_RECORDS, checkpoint_seconds=CHECKPOINT_SECONDS):
+        self.simulator = simulator
+        self.directory = directory
+        self.group_seconds = group_seconds
+        self.checkpoint_records = checkpoint_records
+        self.checkpoint_seconds = checkpoint_seconds
+        self.depth = 0  # Journaled calls running
+        # Calls (entity, method, args, kwargs) and checkpoints (None, sections, rows, size) not written yet,
+        # four items each; a call with one positional argument only is queued as (entity, method, argument, None)
+        self.pending = deque()
+        self.checkpoint_due = False  # Set by commit() when the calling thread should take a checkpoint
+        self.checkpoints_taken = 0
+        # The rest is commit()'s, under file_lock
+        self.sequence = 0  # Number of the last record written
+        self.file = None
+        self.checkpointed = 0  # Sequence and time of the last checkpoint written
+        self.checkpoint_time = 0
+        self.checkpoints_written = 0
+        self.skipping = False  # Dropping calls until the next checkpoint, after one that could not be encoded
+        self.failure = None  # Exception that stopped the background thread
+        self.file_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.flusher = None
+    
+    def start(self):
+        """Take a first checkpoint and start recording"""
+        if JournalSlot.current is not None:
+            raise RuntimeError("Another journal is already recording")
+        os.makedirs(self.directory, exist_ok=True)
+        self.checkpoint()
+        self.commit()
+        self.flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self.flusher.start()
+        JournalSlot.current = self
+    
+    def stop(self):
+        """Write out pending records and checkpoints and stop recording"""
+        if JournalSlot.current is self:
+            JournalSlot.current = None
+        self.stopped.set()
+        if self.flusher:
+            self.flusher.join()
+        if self.failure is None:
+            self.commit()
+        if self.file:
+            self.file.close()
+            self.file = None
+        if self.failure is not None:
+            raise RuntimeError("Journal writing failed") from self.failure
+    
+    def reference(self, entity):
+        """How a record names entity: a soldier by its table row, the others by kind and name; None if not in the simulator"""
+        simulator = self.simulator
+        kind = type(entity)
+        if kind is Soldier:
+            # Rows are not reused, so the row of a removed soldier finds nobody on recovery
+            return entity.row if entity.table is simulator.soldier_table else None
+        if entity is simulator:
+            return ("simulator",)
+        if kind is Team:
+            return ("team", entity.name) if simulator.find_team(entity.name) is entity else None
+        if kind is Mission:
+            return ("mission", entity.name) if simulator.find_mission(entity.name) is entity else None
+        return None
+    
+    def _encode(self, value):
+        """value as data marshal can write, entities replaced by {"@": reference}; TypeError if it has no such form"""
+        kind = type(value)
+        if kind in self.PLAIN_TYPES:
+            return value
+        if kind is tuple or kind is list:
+            return kind(map(self._encode, value))
+        if kind is dict:
+            return {self._encode(key): self._encode(item) for key, item in value.items()}
+        if isinstance(value, LabeledEnum):
+            return value.label
+        if isinstance(value, (Soldier, Team, Mission)):
+            target = self.reference(value)
+            if target is None:
+                raise TypeError(f"Cannot journal {value}")
+            return {"@": target}
+        if isinstance(value, np.ndarray) and value.dtype.kind in "biuf":
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return self._encode(value.item())
+        for plain in (bool, int, float, str):
+            if isinstance(value, plain):
+                return plain(value)
+        raise TypeError(f"Cannot journal {kind.__name__}")
+    
+    def commit(self):
+        """Write and fsync the queued calls, and write the checkpoints queued between them"""
+        with self.file_lock:
+            items = list(itertools.starmap(self.pending.popleft, itertools.repeat((), len(self.pending))))
+            start = 0
+            for checkpoint in [4 * i for i in _positions(items[::4], None)]:
+                self._write_calls(items[start:checkpoint])
+                self._write_checkpoint(*items[checkpoint + 1:checkpoint + 4])
+                start = checkpoint + 4
+            self._write_calls(items[start:])
+            if self.checkpoints_written == self.checkpoints_taken and (
+                    self.skipping or self.sequence - self.checkpointed >= self.checkpoint_records
+                    or time.monotonic() - self.checkpoint_time >= self.checkpoint_seconds):
+                self.checkpoint_due = True
+    
+    def _write_calls(self, items):
+        """Number queued calls (four items each) and write them as one group of columns:
+        (first number, entities, methods, args, kwargs)
+        """
+        if self.skipping or not items:
+            return
+        entities = items[::4]
+        count = len(entities)
+        if set(map(getattr, entities, itertools.repeat("table", count), itertools.repeat(None, count))) <= {
+                self.simulator.soldier_table, None}:
+            # Only soldiers have a row; the others are looked up below
+            targets = list(map(getattr, entities, itertools.repeat("row", count), itertools.repeat(None, count)))
+        else:
+            targets = [None] * count
+        others = {}
+        for i in _positions(targets, None):
+            entity = entities[i]
+            if entity not in others:
+                others[entity] = self.reference(entity)
+            targets[i] = others[entity]
+        methods, args, kwargs = items[1::4], items[2::4], items[3::4]
+        try:
+            group = marshal.dumps((self.sequence + 1, targets, methods, args, kwargs))
+        except ValueError:
+            for i, (call_args, call_kwargs) in enumerate(zip(args, kwargs)):
+                try:
+                    args[i], kwargs[i] = self._encode(call_args), self._encode(call_kwargs)
+                except TypeError:
+                    self.skipping = True
+                    del targets[i:], methods[i:], args[i:], kwargs[i:]
+                    break
+            if not targets:
+                return
+            group = marshal.dumps((self.sequence + 1, targets, methods, args, kwargs))
+        self.sequence += len(targets)
+        self._write_group(group)
+    
+    def _write_group(self, group):
+        self.file.write(self.GROUP_HEADER.pack(len(group), zlib.crc32(group)))
+        self.file.write(group)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+    
+    def _flush_loop(self):
+        try:
+            while not self.stopped.wait(self.group_seconds):
+                self.commit()
+        except Exception as error:
+            self.failure = error
+            self.checkpoint_due = True  # So that the next journaled call raises it
+    
+    def checkpoint(self):
+        """Copy the world out now; commit() writes it as a checkpoint after the calls queued before it"""
+        if self.failure is not None:
+            raise RuntimeError("Journal writing failed") from self.failure
+        self.checkpoint_due = False
+        self.checkpoints_taken += 1
+        simulator = self.simulator
+        table = simulator.soldier_table
+        self.pending.extend((None, simulator.snapshot_sections(), table.rows_of(simulator.soldiers).tolist(),
+                             table.size))
+    
+    def _write_checkpoint(self, sections, rows, size):
+        """Write a checkpoint, start a new journal file after it and delete the older files.
+        
+        The journal file starts with the rows of the checkpoint's soldiers
+        and the table size, so restore() can map rows to the loaded soldiers.
+        """
+        name = f"{self.sequence:012d}"
+        path = os.path.join(self.directory, f"checkpoint-{name}.snap")
+        write_snapshot(path + ".tmp", sections)
+        with open(path + ".tmp", "rb") as snapshot:
+            os.fsync(snapshot.fileno())
+        os.replace(path + ".tmp", path)
+        if self.file:
+            self.file.close()
+        self.file = open(os.path.join(self.directory, f"journal-{name}.log"), "ab")
+        self._write_group(marshal.dumps((rows, size)))
+        _fsync_directory(self.directory)
+        for old in os.listdir(self.directory):
+            if old.startswith(("checkpoint-", "journal-")) and old not in (f"checkpoint-{name}.snap", f"journal-{name}.log"):
+                os.remove(os.path.join(self.directory, old))
+        self.checkpointed = self.sequence
+        self.checkpoint_time = time.monotonic()
+        self.checkpoints_written += 1
+        self.skipping = False
+    
+    @staticmethod
+    def restore(simulator_class, directory, spill_path=None):
+        """Load the newest checkpoint in directory and replay the records after it.
+        
+        Replay stops at the first torn or missing record. Returns the
+        simulator, the number of the last record applied and how many
+        records were replayed.
+        """
+        checkpoints = sorted(name for name in os.listdir(directory)
+                             if name.startswith("checkpoint-") and name.endswith(".snap"))
+        if not checkpoints:
+            raise FileNotFoundError(f"No checkpoint in {directory}")
+        base = int(checkpoints[-1][len("checkpoint-"):-len(".snap")])
+        simulator = simulator_class.load_snapshot(os.path.join(directory, checkpoints[-1]), spill_path)
+        sequence = base
+        path = os.path.join(directory, f"journal-{base:012d}.log")
+        if not os.path.exists(path):
+            return simulator, sequence, 0
+        header = WriteAheadJournal.GROUP_HEADER
+        soldier = None
+        with open(path, "rb") as journal:
+            while True:
+                size, checksum = header.unpack(journal.read(header.size).ljust(header.size, b"\0"))
+                group = journal.read(size)
+                if not size or len(group) < size or zlib.crc32(group) != checksum:
+                    break
+                if soldier is None:
+                    soldier = WriteAheadJournal._soldier_rows(simulator, *marshal.loads(group))
+                    continue
+                first, targets, methods, args, kwargs = marshal.loads(group)
+                for number, target, method, call_args, call_kwargs in zip(itertools.count(first), targets, methods,
+                                                                          args, kwargs):
+                    if number > sequence + 1:
+                        return simulator, sequence, sequence - base
+                    if number <= sequence:
+                        continue
+                    sequence = number
+                    entity = WriteAheadJournal._resolve(simulator, target, soldier)
+                    if entity is None:
+                        continue
+                    call_args = WriteAheadJournal._decode(simulator, call_args, soldier)
+                    if call_kwargs is None:  # A lone argument, queued bare
+                        getattr(entity, method)(call_args)
+                    else:
+                        getattr(entity, method)(*call_args, **WriteAheadJournal._decode(simulator, call_kwargs, soldier))
+        return simulator, sequence, sequence - base
+    
+    @staticmethod
+    def _soldier_rows(simulator, rows, size):
+        """Row -> live soldier lookup for a simulator just loaded from a checkpoint.
+        
+        rows and size are the checkpoint's soldier rows and table size in the
+        journaled world. Soldiers created after it were given rows in the same
+        order in both worlds, so their rows differ by a fixed shift.
+        """
+        table = simulator.soldier_table
+        loaded = dict(zip(rows, simulator.soldiers))
+        shift = table.size - size
+        
+        def soldier(row):
+            found = loaded.get(row)
+            if found is None and row >= size and row + shift < table.size:
+                found = table.owner[row + shift]
+            return found if found is not None and table.owner[found.row] is found else None
+        return soldier
+    
+    @staticmethod
+    def _resolve(simulator, target, soldier=None):
+        """The entity a target names: a row (looked up by soldier, see _soldier_rows) or (kind, name)"""
+        if target is None:
+            return None
+        if type(target) is int:
+            return soldier(target)
+        kind = target[0]
+        if kind == "simulator":
+            return simulator
+        return {"soldier": simulator.find_soldier, "team": simulator.find_team,
+                "mission": simulator.find_mission}[kind](target[1])
+    
+    @staticmethod
+    def _decode(simulator, value, soldier):
+        if isinstance(value, dict):
+            if len(value) == 1 and "@" in value:
+                return WriteAheadJournal._resolve(simulator, value["@"], soldier)
+            return {key: WriteAheadJournal._decode(simulator, item, soldier) for key, item in value.items()}
+        if isinstance(value, (list, tuple)) and any(isinstance(item, (dict, list, tuple)) for item in value):
+            return type(value)(WriteAheadJournal._decode(simulator, item, soldier) for item in value)
+        return value
+
+
+def _positions(values, value):
+    """Indexes of value in the list values, searched by list.index rather than a Python loop"""
+    i = -1
+    while True:
+        try:
+            i = values.index(value, i + 1)
+        except ValueError:
+            return
+        yield i
+
+
+def _fsync_directory(directory):
+    """Make renames and new files in directory durable (where the platform allows it)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
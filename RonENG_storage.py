@@ -0,0 +1,785 @@
+import itertools
+import json
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from СonsoleRonENG import (EventRecord, Listing, MilitarySimulator, Mission, MissionStatus, Rank, Soldier,
+                           SoldierStatus, SoldierTable, SpatialGrid, Team, _coordinate, _dump_objectives, _epoch,
+                           _load_objectives, _soldier_row, _tally)
+
+
+# Tables and indexes of a SQLiteSimulator database
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS soldiers (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, name_key TEXT NOT NULL UNIQUE,
+    status INTEGER NOT NULL, rank TEXT NOT NULL, health INTEGER NOT NULL, x REAL NOT NULL, y REAL NOT NULL,
+    experience INTEGER NOT NULL, combat INTEGER NOT NULL, medical INTEGER NOT NULL,
+    recon INTEGER NOT NULL, leadership INTEGER NOT NULL, mission TEXT);
+CREATE INDEX IF NOT EXISTS soldiers_by_status ON soldiers (status, id);
+CREATE INDEX IF NOT EXISTS soldiers_by_location ON soldiers (x, y);
+CREATE TABLE IF NOT EXISTS equipment (
+    soldier INTEGER NOT NULL, item TEXT NOT NULL, quantity INTEGER NOT NULL,
+    PRIMARY KEY (soldier, item)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS equipment_by_item ON equipment (item);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, commander INTEGER, status TEXT NOT NULL,
+    x REAL NOT NULL, y REAL NOT NULL, created REAL NOT NULL, size INTEGER NOT NULL,
+    active INTEGER NOT NULL, skills TEXT NOT NULL, inventory TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS team_members (
+    team INTEGER NOT NULL, slot INTEGER NOT NULL, soldier INTEGER NOT NULL,
+    PRIMARY KEY (team, slot)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS team_members_by_soldier ON team_members (soldier);
+CREATE TABLE IF NOT EXISTS missions (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL, description TEXT NOT NULL, x REAL NOT NULL, y REAL NOT NULL,
+    status INTEGER NOT NULL, difficulty INTEGER NOT NULL, success_rate REAL NOT NULL, rewards TEXT NOT NULL,
+    objectives TEXT NOT NULL, started REAL, ended REAL, seed TEXT NOT NULL, steps INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS mission_teams (
+    mission INTEGER NOT NULL, slot INTEGER NOT NULL, team INTEGER NOT NULL,
+    PRIMARY KEY (mission, slot)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY, scope TEXT NOT NULL, entity INTEGER NOT NULL, timestamp INTEGER, text TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS events_by_entity ON events (scope, entity, id);
+"""
+
+# Soldier columns in the soldiers table, after id, name and name_key
+SOLDIER_FIELDS = ("status", "rank", "health", "x", "y", "experience", *SoldierTable.SKILLS, "mission")
+
+
+class StoredHistory:
+    """EventHistory stand-in for SQLiteSimulator keeping an entity's entries in the events table.
+    
+    Appends are buffered by the simulator and written in batches; reads
+    write the buffer first and query the table, so nothing is ever evicted.
+    """
+    __slots__ = ("simulator", "scope", "entity")
+    
+    def __init__(self, simulator, scope, entity):
+        self.simulator = simulator
+        self.scope = scope
+        self.entity = entity
+    
+    def append(self, entry):
+        pending = self.simulator.pending_events
+        pending.append((self.scope, self.entity, entry))
+        if len(pending) >= self.simulator.EVENT_BATCH:
+            self.simulator.write_events()
+    
+    @property
+    def total(self):
+        return len(self)
+    
+    def full(self):
+        return list(self)
+    
+    def records(self):
+        return list(self)
+    
+    def between(self, start=None, end=None):
+        start, end = _epoch(start), _epoch(end)
+        if start is None and end is None:
+            return list(self)
+        rows = self._query("SELECT timestamp, text FROM events WHERE scope = ? AND entity = ? "
+                           "AND timestamp >= ? AND timestamp < ? ORDER BY id",
+                           -1 if start is None else start, float("inf") if end is None else end)
+        return [self.render(timestamp, text) for timestamp, text in rows]
+    
+    def _query(self, sql, *params):
+        self.simulator.write_events()
+        return self.simulator.db.execute(sql, (self.scope, self.entity, *params))
+    
+    @staticmethod
+    def render(timestamp, text):
+        if timestamp is None:
+            return text
+        return f"{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')}: {text}"
+    
+    def _entries(self, start, count):
+        rows = self._query("SELECT timestamp, text FROM events WHERE scope = ? AND entity = ? ORDER BY id LIMIT ? OFFSET ?",
+                           count, start)
+        return [self.render(timestamp, text) for timestamp, text in rows]
+    
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM events WHERE scope = ? AND entity = ?").fetchone()[0]
+    
+    def __iter__(self):
+        rows = self._query("SELECT timestamp, text FROM events WHERE scope = ? AND entity = ? ORDER BY id")
+        return (self.render(timestamp, text) for timestamp, text in rows)
+    
+    def __getitem__(self, index):
+        size = len(self)
+        if isinstance(index, slice):
+            positions = range(*index.indices(size))
+            if not positions:
+                return []
+            low = min(positions)
+            entries = self._entries(low, max(positions) + 1 - low)
+            return [entries[i - low] for i in positions]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("history index out of range")
+        return self._entries(index, 1)[0]
+    
+    def __repr__(self):
+        return repr(list(self))
+
+
+class StoredMembers:
+    """Team.members stand-in for SQLiteSimulator backed by the team_members table.
+    
+    Only the member count is kept in memory; reading the list loads the
+    soldiers through the simulator's cache.
+    """
+    __slots__ = ("simulator", "team", "size", "next_slot")
+    
+    def __init__(self, simulator, team, size=0):
+        self.simulator = simulator
+        self.team = team  # Team id
+        self.size = size
+        self.next_slot = None  # Looked up on the first append
+    
+    def ids(self):
+        rows = self.simulator.db.execute("SELECT soldier FROM team_members WHERE team = ? ORDER BY slot", (self.team,))
+        return [soldier for soldier, in rows]
+    
+    def append(self, soldier):
+        self.extend([soldier])
+    
+    def extend(self, soldiers):
+        db, ids = self.simulator.db, self.simulator.soldier_ids
+        if self.next_slot is None:
+            self.next_slot = db.execute("SELECT COALESCE(MAX(slot) + 1, 0) FROM team_members WHERE team = ?",
+                                        (self.team,)).fetchone()[0]
+        db.executemany("INSERT INTO team_members VALUES (?, ?, ?)",
+                       ((self.team, self.next_slot + i, ids[soldier]) for i, soldier in enumerate(soldiers)))
+        self.next_slot += len(soldiers)
+        self.size += len(soldiers)
+    
+    def remove(self, soldier):
+        db = self.simulator.db
+        soldier_id = self.simulator.soldier_ids.get(soldier)
+        row = db.execute("SELECT MIN(slot) FROM team_members WHERE team = ? AND soldier = ?",
+                         (self.team, soldier_id)).fetchone()
+        if row[0] is None:
+            raise ValueError("soldier is not a team member")
+        db.execute("DELETE FROM team_members WHERE team = ? AND slot = ?", (self.team, row[0]))
+        self.size -= 1
+    
+    def __contains__(self, soldier):
+        soldier_id = self.simulator.soldier_ids.get(soldier)
+        return soldier_id is not None and self.simulator.db.execute(
+            "SELECT 1 FROM team_members WHERE team = ? AND soldier = ? LIMIT 1", (self.team, soldier_id)).fetchone() is not None
+    
+    def __len__(self):
+        return self.size
+    
+    def __iter__(self):
+        return iter(self.simulator.soldiers_by_id(self.ids()))
+    
+    def __getitem__(self, index):
+        ids = self.ids()[index]
+        if isinstance(index, slice):
+            return self.simulator.soldiers_by_id(ids)
+        return self.simulator.soldiers_by_id([ids])[0]
+    
+    def __repr__(self):
+        return f"StoredMembers(team={self.team}, size={self.size})"
+
+
+class StoredSoldiers:
+    """MilitarySimulator.soldiers stand-in for SQLiteSimulator: the soldiers with ids in [low, high),
+    oldest first, loaded a page (at most the cache size) at a time while iterating.
+    """
+    __slots__ = ("simulator", "low", "high")
+    PAGE_SIZE = 1000
+    
+    def __init__(self, simulator, low=0, high=2 ** 63 - 1):
+        self.simulator = simulator
+        self.low = low
+        self.high = high
+    
+    def _ids(self, start, count):
+        rows = self.simulator.db.execute("SELECT id FROM soldiers WHERE id >= ? AND id < ? ORDER BY id LIMIT ? OFFSET ?",
+                                         (self.low, self.high, count, start))
+        return [soldier for soldier, in rows]
+    
+    def __len__(self):
+        return self.simulator.db.execute("SELECT COUNT(*) FROM soldiers WHERE id >= ? AND id < ?",
+                                         (self.low, self.high)).fetchone()[0]
+    
+    def __bool__(self):
+        return bool(self._ids(0, 1))
+    
+    def __iter__(self):
+        last = self.low - 1
+        page = min(self.PAGE_SIZE, self.simulator.cache_size)
+        while True:
+            ids = [soldier for soldier, in self.simulator.db.execute(
+                "SELECT id FROM soldiers WHERE id > ? AND id < ? ORDER BY id LIMIT ?", (last, self.high, page))]
+            if not ids:
+                return
+            yield from self.simulator.soldiers_by_id(ids)
+            last = ids[-1]
+    
+    def __getitem__(self, index):
+        size = len(self)
+        if isinstance(index, slice):
+            positions = range(*index.indices(size))
+            if not positions:
+                return []
+            low = min(positions)
+            ids = self._ids(low, max(positions) + 1 - low)
+            return self.simulator.soldiers_by_id([ids[i - low] for i in positions])
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("soldier index out of range")
+        return self.simulator.soldiers_by_id(self._ids(index, 1))[0]
+    
+    def __contains__(self, soldier):
+        soldier_id = self.simulator.soldier_ids.get(soldier)
+        return soldier_id is not None and self.low <= soldier_id < self.high
+    
+    def __repr__(self):
+        return f"StoredSoldiers({len(self)} soldiers)"
+
+
+class StoredStatusIndex:
+    """StatusIndex over the soldiers table for SQLiteSimulator, answered by indexed queries"""
+    __slots__ = ("simulator",)
+    
+    def __init__(self, simulator):
+        self.simulator = simulator
+    
+    def count(self, status):
+        self.simulator.sync()
+        return self.simulator.db.execute("SELECT COUNT(*) FROM soldiers WHERE status = ?",
+                                         (int(SoldierStatus.parse(status)),)).fetchone()[0]
+    
+    def counts(self):
+        """Status label -> number of soldiers, for statuses that have any"""
+        self.simulator.sync()
+        rows = self.simulator.db.execute("SELECT status, COUNT(*) FROM soldiers GROUP BY status ORDER BY status")
+        return {SoldierStatus(code).label: count for code, count in rows}
+    
+    def page(self, status, start=0, size=None):
+        """Soldiers with a status, oldest first, from start on"""
+        self.simulator.sync()
+        rows = self.simulator.db.execute("SELECT id FROM soldiers WHERE status = ? ORDER BY id LIMIT ? OFFSET ?",
+                                         (int(SoldierStatus.parse(status)), -1 if size is None else size, start))
+        return self.simulator.soldiers_by_id([soldier for soldier, in rows])
+
+
+class SQLiteSimulator(MilitarySimulator):
+    """MilitarySimulator keeping its world in a SQLite database, for forces larger than memory.
+    
+    Soldiers stay on disk until they are used: find_soldier, team member
+    lists, iteration and queries load them into the SoldierTable through a
+    cache of cache_size soldiers, and the least recently used ones are
+    written back (if marked dirty in the SoldierTable) and dropped to make
+    room for the ones loaded next. A Soldier object must not be kept
+    across more than cache_size other lookups; commanders and soldiers on
+    the move are never dropped. Teams and
+    missions live in memory (their member lists do not); events go to the
+    events table. Counts, status pages, area queries and equipment totals
+    are indexed queries. Changes are committed by flush() and close();
+    messages, moves in progress and the RNG state are not stored.
+    """
+    CACHE_SIZE = 10_000
+    # Buffered log entries written to the events table at once
+    EVENT_BATCH = 1000
+    # Ranks are stored as labels; this sorts them by seniority, custom ranks last
+    RANK_ORDER = ("CASE rank " + " ".join(f"WHEN '{rank.label}' THEN {int(rank)}" for rank in Rank) +
+                  f" ELSE {len(Rank)} END, id")
+    
+    def __init__(self, path, cache_size=CACHE_SIZE, spill_path=None, seed=None, terrain=None):
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SQLITE_SCHEMA)
+        self.db.execute("BEGIN")
+        self.cache_size = cache_size
+        # Soldier id -> loaded Soldier, least recently used first
+        self.cache = OrderedDict()
+        self.soldier_ids = {}
+        self.cached_names = {}
+        self.teams_by_id = {}
+        self.pending_events = []
+        super().__init__(spill_path, seed, terrain)
+        
+        self.soldiers = StoredSoldiers(self)
+        records = self.events_log.records()
+        self.events_log = StoredHistory(self, "simulator", 0)
+        for record in records:
+            self.events_log.append(record)
+        self._load()
+    
+    def _load(self):
+        """Rebuild teams and missions from the database; soldiers stay on disk"""
+        for team_id, name, status, x, y, created, size, active, skills, inventory in self.db.execute(
+                "SELECT id, name, status, x, y, created, size, active, skills, inventory FROM teams ORDER BY id"):
+            team = Team(name, grid=self.team_grid, terrain=self.terrain)
+            self._store_team(team, team_id, size)
+            team.status = status
+            team._set_location((_coordinate(x), _coordinate(y)))
+            team.created_date = datetime.fromtimestamp(created)
+            team.active_count = active
+            team.skill_totals = json.loads(skills)
+            team.equipment_inventory = json.loads(inventory)
+            self.teams.append(team)
+            self.team_index[self._name_key(name)] = team
+        commanders = self.db.execute("SELECT id, commander FROM teams WHERE commander IS NOT NULL").fetchall()
+        for (team_id, _), soldier in zip(commanders, self.soldiers_by_id([soldier for _, soldier in commanders])):
+            self.teams_by_id[team_id].commander = soldier
+        
+        missions = {}
+        for (mission_id, name, description, x, y, status, difficulty, success_rate, rewards, objectives,
+             started, ended, seed, steps) in self.db.execute("SELECT * FROM missions ORDER BY id"):
+            mission = Mission(name, description, (_coordinate(x), _coordinate(y)), seed=int(seed),
+                              statuses=self.mission_statuses)
+            self._store_mission(mission, mission_id)
+            mission._set_status(MissionStatus(status))
+            mission.difficulty = difficulty
+            mission.success_rate = success_rate
+            mission.rewards = json.loads(rewards)
+            mission.objectives = _load_objectives(json.loads(objectives))
+            mission.start_time = started and datetime.fromtimestamp(started)
+            mission.end_time = ended and datetime.fromtimestamp(ended)
+            mission.steps = steps
+            self.missions.append(mission)
+            self.mission_grid.insert(mission, mission.location)
+            self.mission_index[self._name_key(name)] = mission
+            missions[mission_id] = mission
+        for mission_id, team_id in self.db.execute("SELECT mission, team FROM mission_teams ORDER BY mission, slot"):
+            missions[mission_id]._attach_team(self.teams_by_id[team_id], 1)
+    
+    def _store_team(self, team, team_id, size=0):
+        team.id = team_id
+        team.members = StoredMembers(self, team_id, size)
+        team.mission_log = StoredHistory(self, "team", team_id)
+        self.teams_by_id[team_id] = team
+    
+    def _store_mission(self, mission, mission_id):
+        mission.id = mission_id
+        mission.events = StoredHistory(self, "mission", mission_id)
+    
+    def soldiers_by_id(self, ids):
+        """Soldiers for database ids, loading the ones not in the cache.
+        
+        Other soldiers are dropped first to make room, so the cache only
+        outgrows cache_size while one call asks for more soldiers than that.
+        """
+        cache = self.cache
+        wanted = dict.fromkeys(ids)
+        missing = [soldier_id for soldier_id in wanted if soldier_id not in cache]
+        self._trim(len(missing), wanted)
+        for start in range(0, len(missing), 900):
+            self._hydrate(missing[start:start + 900])
+        for soldier_id in ids:
+            cache.move_to_end(soldier_id)
+        return [cache[soldier_id] for soldier_id in ids]
+    
+    def _hydrate(self, ids):
+        marks = ", ".join("?" * len(ids))
+        table = self.soldier_table
+        soldiers = {}
+        for soldier_id, name, status, rank, health, x, y, experience, *skills, mission in self.db.execute(
+                f"SELECT id, name, {', '.join(SOLDIER_FIELDS)} FROM soldiers WHERE id IN ({marks})", ids):
+            row = table.add_row(health, status, rank, (x, y))
+            soldier = Soldier.attach(table, row, name)
+            table.experience[row] = experience
+            for skill, value in zip(SoldierTable.SKILLS, skills):
+                getattr(table, skill)[row] = value
+            soldier.mission = mission
+            soldier._history = StoredHistory(self, "soldier", soldier_id)
+            table.by_status.add(soldier, status)
+            table.grid.insert(soldier, (x, y))
+            soldiers[soldier_id] = soldier
+        if len(soldiers) < len(ids):
+            raise KeyError(f"No soldier with id {next(i for i in ids if i not in soldiers)}")
+        
+        for soldier_id, item, quantity in self.db.execute(
+                f"SELECT soldier, item, quantity FROM equipment WHERE soldier IN ({marks})", ids):
+            soldiers[soldier_id].equipment[item] = quantity
+            _tally(table.equipment, item, quantity)
+        for soldier_id, team_id in self.db.execute(
+                f"SELECT soldier, team FROM team_members WHERE soldier IN ({marks}) ORDER BY team, slot", ids):
+            soldiers[soldier_id].teams += (self.teams_by_id[team_id],)
+        for soldier_id, soldier in soldiers.items():
+            self._cache(soldier_id, soldier)
+    
+    def _cache(self, soldier_id, soldier):
+        self.cache[soldier_id] = soldier
+        self.soldier_ids[soldier] = soldier_id
+        self.cached_names[self._name_key(soldier.name)] = soldier
+    
+    def _soldier_values(self, soldiers):
+        """SOLDIER_FIELDS values of loaded soldiers, one tuple each"""
+        table = self.soldier_table
+        rows = table.rows_of(soldiers)
+        return zip(table.status[rows].tolist(), [table.rank_names[code] for code in table.rank[rows].tolist()],
+                   *(getattr(table, column)[rows].tolist() for column in SOLDIER_FIELDS[2:-1]),
+                   [None if soldier.mission is None else str(soldier.mission) for soldier in soldiers])
+    
+    def _write_back(self, soldiers):
+        """Write the dirty ones of some loaded soldiers to the database"""
+        table = self.soldier_table
+        soldiers = [soldier for soldier in soldiers if table.dirty[soldier.row]]
+        if not soldiers:
+            return
+        table.dirty[table.rows_of(soldiers)] = False
+        ids = [self.soldier_ids[soldier] for soldier in soldiers]
+        assignments = ", ".join(f"{field} = ?" for field in SOLDIER_FIELDS)
+        self.db.executemany(f"UPDATE soldiers SET {assignments} WHERE id = ?",
+                            ((*values, soldier_id) for values, soldier_id in zip(self._soldier_values(soldiers), ids)))
+        self.db.executemany("DELETE FROM equipment WHERE soldier = ?", ((soldier_id,) for soldier_id in ids))
+        self.db.executemany("INSERT INTO equipment VALUES (?, ?, ?)",
+                            ((soldier_id, item, quantity) for soldier_id, soldier in zip(ids, soldiers)
+                             for item, quantity in soldier.equipment.items()))
+    
+    def _trim(self, room=0, keep=()):
+        """Write back and drop least recently used soldiers until room more fit in cache_size.
+        
+        keep holds ids of soldiers that must stay loaded.
+        """
+        excess = len(self.cache) + room - self.cache_size
+        if excess <= 0:
+            return
+        table = self.soldier_table
+        commanders = {team.commander for team in self.teams}
+        evicted = []
+        for soldier_id, soldier in self.cache.items():
+            if len(evicted) == excess:
+                break
+            if (soldier_id not in keep and soldier not in commanders and not table.speed[soldier.row]
+                    and soldier.row not in table.movers):
+                evicted.append(soldier)
+        self._write_back(evicted)
+        for soldier in evicted:
+            self._forget(soldier)
+    
+    def _forget(self, soldier):
+        """Drop a loaded soldier from memory; the Soldier object is unusable afterwards"""
+        table = self.soldier_table
+        del self.cache[self.soldier_ids.pop(soldier)]
+        self.cached_names.pop(self._name_key(soldier.name), None)
+        table.by_status.discard(soldier, soldier.status_code)
+        table.grid.remove(soldier, soldier.location)
+        for item, quantity in soldier.equipment.items():
+            _tally(table.equipment, item, -quantity)
+        table.recycle(soldier.row)
+        soldier.table = None
+    
+    def write_events(self):
+        """Insert buffered log entries into the events table"""
+        if not self.pending_events:
+            return
+        self.db.executemany("INSERT INTO events (scope, entity, timestamp, text) VALUES (?, ?, ?, ?)",
+                            ((scope, entity, entry.timestamp, entry.text) if isinstance(entry, EventRecord)
+                             else (scope, entity, None, str(entry)) for scope, entity, entry in self.pending_events))
+        self.pending_events.clear()
+    
+    def sync(self):
+        """Write changed soldiers and buffered events to the database, so queries see them"""
+        table = self.soldier_table
+        self._write_back(table.owner[np.flatnonzero(table.column("dirty"))].tolist())
+        self.write_events()
+    
+    def flush(self):
+        """Write everything held in memory to the database and commit"""
+        self.sync()
+        self.db.executemany("UPDATE teams SET name = ?, commander = ?, status = ?, x = ?, y = ?, created = ?, size = ?, "
+                            "active = ?, skills = ?, inventory = ? WHERE id = ?",
+                            ((*self._team_values(team), team.id) for team in self.teams))
+        self.db.executemany("UPDATE missions SET name = ?, description = ?, x = ?, y = ?, status = ?, difficulty = ?, "
+                            "success_rate = ?, rewards = ?, objectives = ?, started = ?, ended = ?, seed = ?, steps = ? "
+                            "WHERE id = ?", ((*self._mission_values(mission), mission.id) for mission in self.missions))
+        self.db.execute("DELETE FROM mission_teams")
+        self.db.executemany("INSERT INTO mission_teams VALUES (?, ?, ?)",
+                            ((mission.id, slot, team.id) for mission in self.missions
+                             for slot, team in enumerate(mission.teams)))
+        self.db.execute("COMMIT")
+        self.db.execute("BEGIN")
+    
+    def _team_values(self, team):
+        commander = None if team.commander is None else self.soldier_ids[team.commander]
+        return (team.name, commander, team.status, float(team.location[0]), float(team.location[1]),
+                team.created_date.timestamp(), len(team.members), team.active_count,
+                json.dumps(team.skill_totals), json.dumps(team.equipment_inventory))
+    
+    def _mission_values(self, mission):
+        return (mission.name, mission.description, float(mission.location[0]), float(mission.location[1]),
+                int(mission.status_code), mission.difficulty, mission.success_rate, json.dumps(mission.rewards),
+                json.dumps(_dump_objectives(mission.objectives)), mission.start_time and mission.start_time.timestamp(),
+                mission.end_time and mission.end_time.timestamp(), str(mission.seed), mission.steps)
+    
+    def close(self):
+        """Commit and close the database, then close the spill file and stop tick workers"""
+        self.flush()
+        self.db.close()
+        super().close()
+    
+    def create_soldier(self, name, status="Active", location=(0, 0), rank="Private"):
+        self._trim()
+        if self._stored_id(name) is not None:
+            raise ValueError(f"Soldier '{name}' already exists")
+        soldier = Soldier(name, status, location, rank, table=self.soldier_table)
+        fields = ", ".join(SOLDIER_FIELDS)
+        marks = ", ".join("?" * (len(SOLDIER_FIELDS) + 2))
+        soldier_id = self.db.execute(f"INSERT INTO soldiers (name, name_key, {fields}) VALUES ({marks})",
+                                     (name, self._name_key(name), *next(self._soldier_values([soldier])))).lastrowid
+        records = soldier.history.records()
+        soldier._history = StoredHistory(self, "soldier", soldier_id)
+        for record in records:
+            soldier._history.append(record)
+        self._cache(soldier_id, soldier)
+        self.log_event("Soldier created: {}", name)
+        return soldier
+    
+    def add_soldiers(self, names, equipment=None, **columns):
+        """Insert many soldiers straight into the database, without a log event per soldier.
+        
+        Takes the same arguments as MilitarySimulator.add_soldiers but loads
+        nothing: the soldiers are returned as a StoredSoldiers sequence.
+        """
+        keys = [self._name_key(name) for name in names]
+        seen = set()
+        taken = next((name for key, name in zip(keys, names) if key in seen or seen.add(key)), None)
+        for start in range(0, len(keys) if taken is None else 0, 900):
+            chunk = keys[start:start + 900]
+            row = self.db.execute(f"SELECT name_key FROM soldiers WHERE name_key IN ({', '.join('?' * len(chunk))}) "
+                                  "LIMIT 1", chunk).fetchone()
+            if row:
+                taken = names[start + chunk.index(row[0])]
+                break
+        if taken is not None:
+            raise ValueError(f"Soldier '{taken}' already exists")
+        
+        count = len(names)
+        defaults = {"health": 100, **dict.fromkeys(SoldierTable.SKILLS, 1)}
+        values = [np.broadcast_to(columns.get(field, defaults.get(field, 0)), count).tolist()
+                  for field in SOLDIER_FIELDS[:-1]]
+        rank_names = self.soldier_table.rank_names
+        values[1] = [rank_names[code] for code in values[1]]
+        first = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM soldiers").fetchone()[0]
+        fields = ", ".join(SOLDIER_FIELDS[:-1])
+        marks = ", ".join("?" * (len(SOLDIER_FIELDS) + 2))
+        self.db.executemany(f"INSERT INTO soldiers (id, name, name_key, {fields}) VALUES ({marks})",
+                            zip(itertools.count(first), names, keys, *values))
+        if equipment:
+            self.db.executemany("INSERT INTO equipment VALUES (?, ?, ?)",
+                                ((soldier_id, item, quantity) for soldier_id, items in zip(itertools.count(first), equipment)
+                                 for item, quantity in items.items()))
+        self.log_event("{} soldiers added", count)
+        return StoredSoldiers(self, first, first + count)
+    
+    def _stored_id(self, name):
+        row = self.db.execute("SELECT id FROM soldiers WHERE name_key = ?", (self._name_key(name),)).fetchone()
+        return row and row[0]
+    
+    def find_soldier(self, name):
+        self._trim()
+        soldier = self.cached_names.get(self._name_key(name))
+        if soldier is not None:
+            self.cache.move_to_end(self.soldier_ids[soldier])
+            return soldier
+        soldier_id = self._stored_id(name)
+        return None if soldier_id is None else self.soldiers_by_id([soldier_id])[0]
+    
+    def create_team(self, name):
+        team = super().create_team(name)
+        self._store_team(team, self.db.execute(
+            "INSERT INTO teams (name, commander, status, x, y, created, size, active, skills, inventory) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._team_values(team)).lastrowid)
+        return team
+    
+    def create_mission(self, name, description, location):
+        mission = super().create_mission(name, description, location)
+        records = mission.events.records()
+        self._store_mission(mission, self.db.execute(
+            "INSERT INTO missions (name, description, x, y, status, difficulty, success_rate, rewards, objectives, "
+            "started, ended, seed, steps) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._mission_values(mission)).lastrowid)
+        for record in records:
+            mission.events.append(record)
+        return mission
+    
+    def add_teams(self, names):
+        teams = super().add_teams(names)
+        first = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM teams").fetchone()[0]
+        self.db.executemany("INSERT INTO teams (id, name, commander, status, x, y, created, size, active, skills, "
+                            "inventory) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            ((team_id, *self._team_values(team)) for team_id, team in zip(itertools.count(first), teams)))
+        for team_id, team in zip(itertools.count(first), teams):
+            self._store_team(team, team_id)
+        return teams
+    
+    def add_missions(self, names, descriptions, locations):
+        missions = super().add_missions(names, descriptions, locations)
+        first = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM missions").fetchone()[0]
+        self.db.executemany("INSERT INTO missions (id, name, description, x, y, status, difficulty, success_rate, "
+                            "rewards, objectives, started, ended, seed, steps) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            ((mission_id, *self._mission_values(mission))
+                             for mission_id, mission in zip(itertools.count(first), missions)))
+        for mission_id, mission in zip(itertools.count(first), missions):
+            records = mission.events.records()
+            self._store_mission(mission, mission_id)
+            for record in records:
+                mission.events.append(record)
+        return missions
+    
+    def rename_soldier(self, name, new_name):
+        soldier = self.find_soldier(name)
+        if not soldier:
+            return None
+        if self._name_key(new_name) != self._name_key(name) and self._stored_id(new_name) is not None:
+            raise ValueError(f"Soldier '{new_name}' already exists")
+        
+        self._commit_journal()
+        old_name = soldier.name
+        del self.cached_names[self._name_key(old_name)]
+        soldier.name = new_name
+        self.cached_names[self._name_key(new_name)] = soldier
+        self.db.execute("UPDATE soldiers SET name = ?, name_key = ? WHERE id = ?",
+                        (new_name, self._name_key(new_name), self.soldier_ids[soldier]))
+        soldier.log_event("Renamed from {} to {}", old_name, new_name)
+        self.log_event("{} renamed: {} -> {}", "Soldier", old_name, new_name)
+        return soldier
+    
+    def remove_soldier(self, name):
+        soldier = self.find_soldier(name)
+        if not soldier:
+            return False
+        
+        self._commit_journal()
+        soldier_id = self.soldier_ids[soldier]
+        team = self.soldier_table.movers.pop(soldier.row, None)
+        if team is not None:
+            team.member_done()
+        for team in dict.fromkeys(soldier.teams):
+            while team.remove_member(soldier):
+                pass
+        for team in self.teams:
+            if team.commander is soldier:
+                team.commander = None
+        self._forget(soldier)
+        self.db.execute("DELETE FROM soldiers WHERE id = ?", (soldier_id,))
+        self.db.execute("DELETE FROM equipment WHERE soldier = ?", (soldier_id,))
+        self.log_event("Soldier removed: {}", soldier.name)
+        return True
+    
+    def remove_team(self, name):
+        team = self.find_team(name)
+        if not super().remove_team(name):
+            return False
+        del self.teams_by_id[team.id]
+        self.db.execute("DELETE FROM teams WHERE id = ?", (team.id,))
+        self.db.execute("DELETE FROM team_members WHERE team = ?", (team.id,))
+        return True
+    
+    def _detach_members(self, team, soldiers):
+        # Only loaded soldiers hold their teams; the others read them from team_members once hydrated
+        super()._detach_members(team, [soldier for soldier in self.cache.values() for _ in range(soldier.teams.count(team))])
+    
+    def remove_mission(self, name):
+        mission = self.find_mission(name)
+        if not super().remove_mission(name):
+            return False
+        self.db.execute("DELETE FROM missions WHERE id = ?", (mission.id,))
+        self.db.execute("DELETE FROM mission_teams WHERE mission = ?", (mission.id,))
+        return True
+    
+    @property
+    def soldier_statuses(self):
+        return StoredStatusIndex(self)
+    
+    def _soldier_listing(self, sort, descending, text, status):
+        # The order is one indexed query for ids; only the visible page is loaded into the cache
+        self.sync()
+        conditions, params = [], []
+        if status is not None:
+            code = SoldierStatus.parse(status)
+            if code is None:
+                raise ValueError(f"Unknown soldier status: {status}")
+            conditions.append("status = ?")
+            params.append(int(code))
+        if text:
+            conditions.append("instr(name_key, ?) > 0")
+            params.append(text)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        ordering = {None: "id", "name": "name_key", "rank": self.RANK_ORDER, "status": "status, id",
+                    "health": "health, id", "location": "x, y, id"}[sort]
+        rows = self.db.execute(f"SELECT id FROM soldiers{where} ORDER BY {ordering}", params)
+        ids = np.fromiter((soldier_id for soldier_id, in rows), dtype=np.int64)
+        if descending:
+            ids = ids[::-1]
+        return Listing(ids, lambda ids: self.soldiers_by_id(ids.tolist()), _soldier_row)
+    
+    def soldiers_in_area(self, low, high, status=None):
+        self.sync()
+        rows = self._located(low, high, status)
+        return self.soldiers_by_id([soldier_id for soldier_id, _, _ in rows])
+    
+    def soldiers_near(self, location, radius, status=None):
+        self.sync()
+        return self.soldiers_by_id(self._nearby(location, radius, status))
+    
+    def nearest_soldiers(self, location, count, status=None):
+        if count <= 0:
+            return []
+        code = self._status_code(status)
+        self.sync()
+        wanted = min(count, len(self.soldiers) if code is None else self.soldier_statuses.count(code))
+        radius = SpatialGrid.CELL_SIZE
+        while True:
+            ids = self._nearby(location, radius, status)
+            if len(ids) >= wanted:
+                return self.soldiers_by_id(ids[:count])
+            radius *= 2
+    
+    def _nearby(self, location, radius, status):
+        """Ids of soldiers within radius of location, nearest first"""
+        x, y = location
+        rows = self._located((x - radius, y - radius), (x + radius, y + radius), status)
+        if not rows:
+            return []
+        ids, xs, ys = (np.array(column) for column in zip(*rows))
+        distances = np.hypot(xs - x, ys - y)
+        order = np.argsort(distances, kind="stable")
+        return ids[order[distances[order] <= radius]].tolist()
+    
+    def _located(self, low, high, status):
+        """(id, x, y) of stored soldiers inside the box from low to high, using the location index (see sync)"""
+        query = "SELECT id, x, y FROM soldiers WHERE x BETWEEN ? AND ? AND y BETWEEN ? AND ?"
+        params = [low[0], high[0], low[1], high[1]]
+        code = self._status_code(status)
+        if code is not None:
+            query += " AND status = ?"
+            params.append(code)
+        return self.db.execute(query + " ORDER BY id", params).fetchall()
+    
+    @staticmethod
+    def _status_code(status):
+        if status is None:
+            return None
+        code = SoldierStatus.parse(status)
+        if code is None:
+            raise ValueError(f"Unknown soldier status: {status}")
+        return int(code)
+    
+    @property
+    def equipment_totals(self):
+        """Force-wide equipment ledger (item -> quantity), summed by the database"""
+        self.sync()
+        return dict(self.db.execute("SELECT item, SUM(quantity) FROM equipment GROUP BY item"))
+    
+    def tick(self, workers=None):
+        self._trim()
+        return super().tick(workers)
+    
+    def start_journal(self, directory, **options):
+        raise TypeError("SQLiteSimulator keeps its world in the database; use flush() instead of a journal")
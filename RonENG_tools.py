@@ -0,0 +1,373 @@
+import argparse
+import ast
+import inspect
+import json
+import shlex
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from RonENG_journal import WriteAheadJournal
+from RonENG_storage import SQLiteSimulator
+from СonsoleRonENG import (MilitarySimulator, Rank, SoldierStatus, SoldierTable, _gc_paused, create_sample_data,
+                           write_report)
+
+
+# Synthetic worlds (see generate_world)
+WORLD_SURNAMES = ("Johnson", "Smith", "Williams", "Miller", "Davis", "Garcia", "Wilson", "Taylor", "Brown", "Jones",
+                  "Martinez", "Anderson", "Thomas", "Moore", "Jackson", "White", "Harris", "Clark", "Lewis", "Walker")
+WORLD_CALL_SIGNS = ("Alpha", "Bravo", "Charlie", "Delta", "Echo", "Foxtrot", "Golf", "Hotel", "India", "Juliet",
+                    "Kilo", "Lima", "Mike", "November", "Oscar", "Papa", "Quebec", "Romeo", "Sierra", "Tango")
+WORLD_CODE_NAMES = (("Eagle", "Hammer", "Iron", "Silent", "Red", "Night", "Storm", "Stone"),
+                    ("Eye", "Strike", "Shield", "Arrow", "Watch", "Anvil", "Dawn", "Wolf"))
+# Share of each Rank, Private to Major, and of each SoldierStatus
+WORLD_RANK_SHARES = (0.55, 0.22, 0.13, 0.06, 0.03, 0.01)
+WORLD_STATUS_SHARES = (0.88, 0.05, 0.02, 0.04, 0.01)
+# Enlisted roles as (share, skill trained, loadout); officers all carry WORLD_OFFICER_LOADOUT and lead
+WORLD_ROLES = (
+    (0.50, "combat", {"Rifle": 1, "Ammo": 5, "Rations": 3, "Water": 2}),
+    (0.15, "combat", {"Rifle": 1, "Ammo": 4, "Grenade": 2, "Water": 2}),
+    (0.12, "medical", {"Medkit": 3, "Pistol": 1, "Water": 2}),
+    (0.10, "leadership", {"Radio": 1, "Rifle": 1, "Ammo": 3}),
+    (0.13, "recon", {"Rifle": 1, "Binoculars": 1, "Night Vision": 1, "Ammo": 3}),
+)
+WORLD_OFFICER_LOADOUT = {"Pistol": 1, "Radio": 1, "Binoculars": 1}
+# Mission kinds as (description, objectives)
+WORLD_MISSIONS = (
+    ("Reconnaissance of enemy territory",
+     ("Reach observation point", "Gather intelligence", "Document enemy movements", "Return to base")),
+    ("Clear enemy outpost",
+     ("Secure perimeter", "Neutralize enemy forces", "Secure objective", "Extract intel", "Withdraw from area")),
+    ("Rescue downed aircrew", ("Locate crash site", "Secure survivors", "Reach extraction point")),
+    ("Escort supply convoy", ("Clear the route", "Escort convoy", "Deliver supplies")),
+    ("Patrol the border", ("Reach first checkpoint", "Reach second checkpoint", "Report contacts", "Return to base")),
+)
+
+
+def generate_world(simulator, soldiers=100_000, teams=1_000, missions=1_000, seed=None, extent=1000):
+    """Fill simulator with a random world for load testing; the same seed gives the same world.
+    
+    Soldiers get a rank pyramid, role-based skills and loadouts and a few
+    injured, absent or missing; 90% of them are split into teams camped
+    around bases in a handful of theatres over an extent x extent map, led
+    by their highest-ranking member. Missions are spread over the same
+    theatres and about two thirds of the teams are on one nearby. Names are
+    numbered on from the entities already there. Everything is created in
+    bulk (add_soldiers, add_teams, add_missions, Team.add_members), so a
+    million soldiers take seconds and the log gets a handful of entries.
+    """
+    rng = np.random.default_rng(seed)
+    theatres = rng.uniform(0, extent, (max(1, round(teams ** 0.5 / 10)), 2))
+    
+    # Teams: bases around the theatres, headcounts close to the average
+    team_theatres = rng.integers(len(theatres), size=teams)
+    bases = np.clip(theatres[team_theatres] + rng.normal(0, extent / 20, (teams, 2)), 0, extent)
+    assigned = int(soldiers * 0.9) if teams else 0
+    sizes = rng.multinomial(assigned, np.full(teams, 1 / teams)) if teams else np.zeros(0, dtype=np.int64)
+    team_of = np.repeat(np.arange(teams), sizes)
+    
+    # Soldiers: members first, in team order and highest rank first, then the unassigned
+    ranks = rng.choice(len(WORLD_RANK_SHARES), size=soldiers, p=WORLD_RANK_SHARES)
+    ranks[:assigned] = ranks[np.lexsort((-ranks[:assigned], team_of))]
+    statuses = rng.choice(len(WORLD_STATUS_SHARES), size=soldiers, p=WORLD_STATUS_SHARES)
+    camps = np.concatenate((bases[team_of], theatres[rng.integers(len(theatres), size=soldiers - assigned)]))
+    positions = np.clip(camps + rng.normal(0, 3, (soldiers, 2)), 0, extent)
+    roles = rng.choice(len(WORLD_ROLES), size=soldiers, p=[share for share, _, _ in WORLD_ROLES])
+    officers = ranks >= Rank.LIEUTENANT
+    roles[officers] = len(WORLD_ROLES)
+    skills = {}
+    trained = (*(skill for _, skill, _ in WORLD_ROLES), "leadership")
+    for skill in SoldierTable.SKILLS:
+        level = rng.normal(4 + 0.5 * ranks, 1.5)
+        level += 3 * np.isin(roles, [i for i, name in enumerate(trained) if name == skill])
+        if skill == "leadership":
+            level += ranks
+        skills[skill] = np.clip(np.rint(level), 1, 10).astype(np.int32)
+    loadouts = (*(items for _, _, items in WORLD_ROLES), WORLD_OFFICER_LOADOUT)
+    
+    first = len(simulator.soldiers) + 1
+    surnames = rng.integers(len(WORLD_SURNAMES), size=soldiers).tolist()
+    with _gc_paused():
+        names = [f"{WORLD_SURNAMES[surname]} {number}" for number, surname in enumerate(surnames, first)]
+        equipment = [dict(loadouts[role]) for role in roles.tolist()]
+    roster = simulator.add_soldiers(
+        names, equipment,
+        rank=ranks, status=statuses, x=positions[:, 0], y=positions[:, 1],
+        health=np.where(statuses == SoldierStatus.INJURED, rng.integers(20, 80, size=soldiers), 100),
+        experience=100 * ranks + rng.integers(0, 100, size=soldiers), **skills)
+    del names, equipment
+    
+    first = len(simulator.teams) + 1
+    created = simulator.add_teams([f"{WORLD_CALL_SIGNS[number % len(WORLD_CALL_SIGNS)]} {number}"
+                                   for number in range(first, first + teams)])
+    bounds = np.concatenate(([0], np.cumsum(sizes))).tolist()
+    for team, base, start, stop in zip(created, bases.tolist(), bounds, bounds[1:]):
+        team._set_location(tuple(base))
+        if stop > start:
+            members = roster[start:stop]
+            team.add_members(members)
+            team.commander = members[0]
+    
+    # Missions: near a theatre, difficulty mostly 3-5; each busy team joins one in its own theatre
+    kinds = rng.integers(len(WORLD_MISSIONS), size=missions)
+    mission_theatres = rng.integers(len(theatres), size=missions)
+    sites = np.clip(theatres[mission_theatres] + rng.normal(0, extent / 10, (missions, 2)), 0, extent)
+    first = len(simulator.missions) + 1
+    words = rng.integers(len(WORLD_CODE_NAMES[0]), size=(missions, 2)).tolist()
+    planned = simulator.add_missions(
+        [f"{WORLD_CODE_NAMES[0][a]} {WORLD_CODE_NAMES[1][b]} {number}" for number, (a, b) in enumerate(words, first)],
+        [WORLD_MISSIONS[kind][0] for kind in kinds.tolist()], sites.tolist())
+    now = datetime.now()
+    for mission, kind, difficulty in zip(planned, kinds.tolist(), (1 + rng.binomial(9, 0.4, missions)).tolist()):
+        mission.difficulty = difficulty
+        mission.rewards["experience"] = difficulty * 10
+        mission.objectives = [{"description": objective, "completed": False, "added": now}
+                              for objective in WORLD_MISSIONS[kind][1]]
+    
+    if missions and teams:
+        order = np.argsort(mission_theatres, kind="stable")
+        counts = np.bincount(mission_theatres, minlength=len(theatres))
+        starts = np.cumsum(counts) - counts
+        busy = np.flatnonzero((rng.random(teams) < 0.65) & (counts[team_theatres] > 0))
+        picks = order[starts[team_theatres[busy]] + (rng.random(len(busy)) * counts[team_theatres[busy]]).astype(np.int64)]
+        for team, mission in zip(busy.tolist(), picks.tolist()):
+            planned[mission].add_team(created[team])
+    
+    simulator.log_event("World generated: {} soldiers, {} teams, {} missions", soldiers, teams, missions)
+    return simulator
+
+
+class BatchRunner:
+    """Drives a simulator from a command script or a JSONL stream, with no terminal I/O or delays.
+    
+    Script lines read "[soldier|team|mission NAME] COMMAND ARG... [KEY=VALUE...]"
+    and are split like a shell command line; each argument is a Python
+    literal where it parses as one (quote "(10, 20)") and a string
+    otherwise, and "@team:Alpha" stands for that entity. Blank lines and
+    "#" comments are skipped. A line starting with "{" is JSON instead:
+    {"command": ..., "target": ["team", "Alpha"], "args": [...], "kwargs": {...}},
+    with target optional and entities written {"@": ["soldier", "Johnson"]}
+    (WriteAheadJournal._resolve() looks them up).
+    
+    Commands are the verbs below (create, assign, move, simulate, tick,
+    report) or one of the COMMANDS methods of the simulator or target
+    entity. Report text and report line generators go to output if one is
+    given. A command that raises is counted as an error (kept in errors
+    with its line number) and one returning False as failed; the batch
+    carries on either way.
+    
+    A batch may change the world in any way the commands allow and use as
+    much time and memory as they take, but it cannot reach the file system
+    or start processes: snapshots, journals, terminal menus and the tick
+    worker pool are left out of COMMANDS on purpose.
+    """
+    # Methods a batch may call, per target kind
+    COMMANDS = {
+        "simulator": frozenset((
+            "create_soldier", "create_team", "create_mission", "add_soldiers", "add_teams", "add_missions",
+            "rename_soldier", "rename_team", "rename_mission", "remove_soldier", "remove_team", "remove_mission",
+            "assign_soldier_to_team", "assign_team_to_mission", "distribute_equipment", "simulate_mission_progress",
+            "advance_movement", "in_transit", "dispatch_team", "approach_route", "generate_casualty_event",
+            "generate_random_event", "estimate_mission_outcomes", "soldiers_near", "nearest_soldiers",
+            "soldiers_in_area", "entity_events", "global_status_report", "global_status_report_lines", "log_event")),
+        "soldier": frozenset((
+            "update_status", "update_location", "move_to", "send_message", "receive_message", "messages",
+            "mark_read", "unread_count", "assign_mission", "update_health", "add_equipment", "use_equipment",
+            "report_status", "gain_experience", "improve_skill")),
+        "team": frozenset((
+            "add_member", "add_members", "remove_member", "set_commander", "broadcast_message", "direct_message",
+            "assign_team_mission", "move_team", "eta", "distribute_equipment", "team_status", "team_status_lines",
+            "equipment_report", "equipment_report_lines", "team_skill_report", "team_skill_report_lines")),
+        "mission": frozenset((
+            "add_team", "remove_team", "add_objective", "complete_objective", "update_status", "set_difficulty",
+            "add_reward", "calculate_success_probability", "mission_report", "mission_report_lines")),
+    }
+    LITERAL_STARTS = frozenset("([{'\"-+.0123456789")
+    REPORTS = {"global": None, "team": "team_status_lines", "equipment": "equipment_report_lines",
+               "skills": "team_skill_report_lines", "mission": "mission_report_lines"}
+    
+    def __init__(self, simulator, output=None):
+        self.simulator = simulator
+        self.output = output
+        self.errors = []  # (line number, message)
+        self.verbs = {"create": self.create, "assign": self.assign, "move": self.move,
+                      "simulate": self.simulate, "tick": self.tick, "report": self.report}
+    
+    def run(self, lines):
+        """Run every command in lines (an iterable of strings) and return throughput statistics"""
+        commands = failed = 0
+        errors = len(self.errors)
+        started = time.perf_counter()
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            commands += 1
+            try:
+                result = self.execute(*(self._parse_json(line) if line.startswith("{") else self._parse(line)))
+            except Exception as error:
+                self.errors.append((number, f"{type(error).__name__}: {error}"))
+                continue
+            if result is False:
+                failed += 1
+            elif self.output is not None and (isinstance(result, str) or inspect.isgenerator(result)):
+                write_report([result] if isinstance(result, str) else result, self.output)
+        seconds = time.perf_counter() - started
+        return {
+            "commands": commands,
+            "failed": failed,
+            "errors": len(self.errors) - errors,
+            "seconds": seconds,
+            "per_second": commands / seconds if seconds > 0 else 0.0,
+        }
+    
+    def execute(self, target, command, args, kwargs):
+        """Run one command on the simulator, or on the entity target names, and return its result"""
+        if target is None and command in self.verbs:
+            return self.verbs[command](*args, **kwargs)
+        if command not in self.COMMANDS.get("simulator" if target is None else target[0], ()):
+            raise ValueError(f"Unknown command: {command}")
+        entity = self.simulator if target is None else self._entity(target)
+        return getattr(entity, command)(*args, **kwargs)
+    
+    def _parse(self, line):
+        words = shlex.split(line) if any(quote in line for quote in "\"'\\") else line.split()
+        target = None
+        if words[0] in ("soldier", "team", "mission") and len(words) > 2:
+            target, words = (words[0], words[1]), words[2:]
+        args, kwargs = [], {}
+        for word in words[1:]:
+            key, separator, value = word.partition("=")
+            if separator and key.isidentifier():
+                kwargs[key] = self._value(value)
+            else:
+                args.append(self._value(word))
+        return target, words[0], args, kwargs
+    
+    def _value(self, word):
+        if word.startswith("@") and ":" in word:
+            kind, name = word[1:].split(":", 1)
+            return self._entity((kind, name))
+        # Plain words (most names and labels) skip the literal parser
+        if word[0] not in self.LITERAL_STARTS and word not in ("True", "False", "None"):
+            return word
+        try:
+            return ast.literal_eval(word)
+        except (ValueError, SyntaxError):
+            return word
+    
+    def _parse_json(self, line):
+        entry = json.loads(line)
+        target = entry.get("target")
+        args = self._decode(entry.get("args", []))
+        kwargs = {key: self._decode(value) for key, value in entry.get("kwargs", {}).items()}
+        return target and tuple(target), entry["command"], args, kwargs
+    
+    def _decode(self, value):
+        # JSON has no tuples, and locations are tuples everywhere in the API
+        if isinstance(value, list):
+            return tuple(self._decode(item) for item in value)
+        if isinstance(value, dict):
+            if len(value) == 1 and "@" in value:
+                return self._entity(tuple(value["@"]))
+            return {key: self._decode(item) for key, item in value.items()}
+        return value
+    
+    def _entity(self, target):
+        entity = WriteAheadJournal._resolve(self.simulator, target)
+        if entity is None:
+            raise LookupError(f"No {target[0]} named {target[1]}")
+        return entity
+    
+    def create(self, kind, *args, **kwargs):
+        """create soldier|team|mission NAME ..."""
+        if kind not in ("soldier", "team", "mission"):
+            raise ValueError(f"Cannot create a {kind}")
+        return getattr(self.simulator, f"create_{kind}")(*args, **kwargs)
+    
+    def assign(self, name, group):
+        """assign SOLDIER TEAM, or assign TEAM MISSION"""
+        if self.simulator.find_soldier(name) is not None:
+            return self.simulator.assign_soldier_to_team(name, group)
+        return self.simulator.assign_team_to_mission(name, group)
+    
+    def move(self, team, x, y, **options):
+        """move TEAM X Y [speed=S] [formation=F] [formation_spacing=D]"""
+        return self._entity(("team", team)).move_team((x, y), **options)
+    
+    def simulate(self, mission, steps=1):
+        """simulate MISSION [STEPS]: simulate_mission_progress STEPS times, stopping once it cannot go on"""
+        result = None
+        for _ in range(steps):
+            result = self.simulator.simulate_mission_progress(mission)
+            if result is False:
+                break
+        return result
+    
+    def tick(self, ticks=1):
+        """tick [N]: run_ticks(N)"""
+        return self.simulator.run_ticks(ticks)
+    
+    def report(self, kind="global", name=None):
+        """report [global], or report team|equipment|skills|mission NAME: the report's line generator"""
+        if kind not in self.REPORTS:
+            raise ValueError(f"Unknown report: {kind}")
+        if kind == "global":
+            return self.simulator.global_status_report_lines()
+        return getattr(self._entity(("mission" if kind == "mission" else "team", name)), self.REPORTS[kind])()
+
+
+def main():
+    """Command line entry point: run a batch script, or the terminal menus on a new or generated world"""
+    parser = argparse.ArgumentParser(description="Military Simulator")
+    parser.add_argument("database", nargs="?", help="keep the world in this SQLite database (see SQLiteSimulator)")
+    parser.add_argument("--batch", metavar="SCRIPT", help="run a command script or JSONL stream ('-' for stdin) and exit")
+    parser.add_argument("--output", metavar="FILE", help="file receiving batch reports (default: discarded)")
+    parser.add_argument("--generate", metavar="SOLDIERS", type=int,
+                        help="start from a generated world of this many soldiers (see generate_world)")
+    parser.add_argument("--teams", type=int, help="teams in the generated world (default: SOLDIERS / 100, up to 10000)")
+    parser.add_argument("--missions", type=int, help="missions in the generated world (default: as many as teams)")
+    parser.add_argument("--seed", type=int, help="seed of the generated world")
+    options = parser.parse_args()
+    simulator = SQLiteSimulator(options.database) if options.database else MilitarySimulator()
+    
+    if options.generate is not None:
+        teams = options.teams if options.teams is not None else min(10_000, max(1, options.generate // 100))
+        missions = options.missions if options.missions is not None else teams
+        started = time.perf_counter()
+        generate_world(simulator, options.generate, teams, missions, options.seed)
+        print(f"Generated {options.generate} soldiers, {teams} teams and {missions} missions "
+              f"in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    
+    if options.batch:
+        output = open(options.output, "w", encoding="utf-8") if options.output else None
+        script = sys.stdin if options.batch == "-" else open(options.batch, encoding="utf-8")
+        runner = BatchRunner(simulator, output)
+        with script:
+            stats = runner.run(script)
+        simulator.close()
+        if output:
+            output.close()
+        for number, message in runner.errors:
+            print(f"line {number}: {message}", file=sys.stderr)
+        print(f"{stats['commands']} commands in {stats['seconds']:.3f}s ({stats['per_second']:.0f}/s), "
+              f"{stats['failed']} failed, {stats['errors']} errors", file=sys.stderr)
+        sys.exit(1 if stats["errors"] else 0)
+    
+    # Ask if user wants sample data
+    print("Military Simulator")
+    if options.generate is None:
+        use_sample = input("Would you like to load sample data? (y/n): ").lower()
+        
+        if use_sample == 'y':
+            simulator = create_sample_data(simulator)
+            print("Sample data loaded!")
+    
+    # Run the simulator interface
+    simulator.run()
+
+
+if __name__ == "__main__":
+    main()
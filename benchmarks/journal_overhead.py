@@ -0,0 +1,107 @@
+"""Time a mixed stream of fine-grained mutations with and without a WriteAheadJournal.
+
+    python benchmarks/journal_overhead.py [--mutations N] [--soldiers N] [--no-checkpoints] [--repeat N]
+
+Each run builds the same world, applies the same seeded sequence
+of soldier, team and mission mutations and reports the time per mutation.
+The journaled run includes its group commits and checkpoints. Plain and
+journaled runs alternate and the fastest of each is compared, against a
+target overhead below TARGET.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from СonsoleRonENG import MilitarySimulator, SoldierStatus, SoldierTable
+
+# The journaled run may take at most this much longer than the plain one
+TARGET = 0.10
+
+
+def build_world(simulator, soldiers, seed):
+    """soldiers spread over a 1000 x 1000 map, dealt to teams of 100 with one mission per team"""
+    rng = random.Random(seed)
+    people = simulator.add_soldiers([f"Soldier {number}" for number in range(1, soldiers + 1)],
+                                    [{"Rifle": 1, "Ammo": rng.randint(1, 4)} for _ in range(soldiers)],
+                                    x=[rng.uniform(0, 1000) for _ in range(soldiers)],
+                                    y=[rng.uniform(0, 1000) for _ in range(soldiers)])
+    for number in range(soldiers // 100):
+        simulator.create_team(f"Team {number + 1}").add_members(people[number * 100:(number + 1) * 100])
+        location = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+        simulator.create_mission(f"Mission {number + 1}", "Patrol the sector", location)
+
+
+def mutate(simulator, count, seed):
+    rng = random.Random(seed)
+    soldiers = list(simulator.soldiers)
+    teams, missions = simulator.teams, simulator.missions
+    statuses = SoldierStatus.labels()
+    items = ("Rifle", "Ammo", "Medkit", "Water")
+    started = time.perf_counter()
+    for i in range(count):
+        soldier = soldiers[rng.randrange(len(soldiers))]
+        action = i % 8
+        if action == 0:
+            soldier.update_health(rng.randint(-5, 5))
+        elif action == 1:
+            soldier.add_equipment(items[i % 4], 1)
+        elif action == 2:
+            soldier.use_equipment(items[i % 4])
+        elif action == 3:
+            soldier.improve_skill(SoldierTable.SKILLS[i % 4])
+        elif action == 4:
+            soldier.update_status(statuses[i % 2])
+        elif action == 5:
+            soldier.update_location((rng.randrange(1000), rng.randrange(1000)))
+        elif action == 6:
+            soldier.gain_experience(rng.randint(1, 10))
+        else:
+            missions[i % len(missions)].add_objective(f"Objective {i}")
+    return time.perf_counter() - started
+
+
+def run(options, journal):
+    simulator = MilitarySimulator(seed=1)
+    build_world(simulator, options.soldiers, 1)
+    directory = tempfile.mkdtemp()
+    try:
+        if journal:
+            settings = {"checkpoint_records": 10 ** 12, "checkpoint_seconds": 10 ** 12} if options.no_checkpoints else {}
+            simulator.start_journal(directory, **settings)
+        seconds = mutate(simulator, options.mutations, 2)
+        if journal:
+            started = time.perf_counter()
+            simulator.stop_journal()
+            seconds += time.perf_counter() - started
+    finally:
+        simulator.close()
+        shutil.rmtree(directory)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mutations", type=int, default=200_000)
+    parser.add_argument("--soldiers", type=int, default=10_000)
+    parser.add_argument("--no-checkpoints", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+    # Alternating the runs spreads machine noise over both sides
+    times = {False: [], True: []}
+    for _ in range(options.repeat):
+        for journal in (False, True):
+            times[journal].append(run(options, journal))
+    plain, journaled = min(times[False]), min(times[True])
+    print(f"unjournaled {plain / options.mutations * 1e6:.2f} us/mutation, "
+          f"journaled {journaled / options.mutations * 1e6:.2f} us/mutation, "
+          f"overhead {(journaled / plain - 1) * 100:+.1f}% (target < {TARGET * 100:+.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
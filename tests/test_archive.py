@@ -0,0 +1,66 @@
+import random
+
+from RonENG_archive import EventArchive
+from СonsoleRonENG import EventRecord, MilitarySimulator
+
+START = 1_700_000_000
+
+
+def fill(archive, count, seed):
+    """Write count entries over a few keys, several per second; return (key, timestamp, text) for each"""
+    rng = random.Random(seed)
+    kinds = [EventRecord.code("mission", template) for template in ("Step {} of {}", "Moved {} units to {}")]
+    keys = [archive.register() for _ in range(6)]
+    written = []
+    for i in range(count):
+        key = rng.choice(keys)
+        if rng.random() < 0.05:
+            entry, timestamp = f"Plain entry {i}", None
+        else:
+            timestamp = START + i // 4
+            entry = EventRecord(rng.choice(kinds), 0, (i, (rng.randint(0, 9), 2.5)), timestamp)
+        archive.write(key, entry)
+        written.append((key, timestamp, str(entry)))
+    return keys, written
+
+
+def in_period(timestamp, start, end):
+    if timestamp is None:
+        return start is None and end is None
+    return (start is None or timestamp >= start) and (end is None or timestamp < end)
+
+
+def check_queries(archive, keys, written):
+    periods = [(None, None), (START + 10, None), (None, START + 33), (START + 17.5, START + 52), (START + 80, START + 81)]
+    for start, end in periods:
+        for key in keys:
+            assert list(archive.read(key, start, end)) == \
+                [text for k, t, text in written if k == key and in_period(t, start, end)]
+        assert list(archive.between(start, end)) == \
+            [text for _, t, text in written if t is not None and in_period(t, start, end)]
+
+
+def test_queries_match_a_scan_across_segments(tmp_path):
+    archive = EventArchive(str(tmp_path / "archive"))
+    archive.SEGMENT_RECORDS = 37
+    keys, written = fill(archive, 400, seed=1)
+    assert len(archive.segments) == 400 // 37 and archive.tail
+    check_queries(archive, keys, written)
+    archive.close()
+    
+    reopened = EventArchive(str(tmp_path / "archive"))
+    assert reopened.register() == max(keys) + 1
+    check_queries(reopened, keys, written)
+    reopened.close()
+
+
+def test_simulator_histories_read_back_from_the_archive(tmp_path):
+    simulator = MilitarySimulator(seed=1, archive_path=str(tmp_path / "archive"))
+    soldier = simulator.create_soldier("Johnson")
+    for i in range(3000):
+        soldier.log_event("Drill {} at {}", i, (i % 7, i % 5))
+    assert len(soldier.history) < 3000
+    full = soldier.history.full()
+    assert len(full) == soldier.history.total
+    assert [line.partition(": ")[2] for line in full[-3000:]] == [f"Private Johnson - Drill {i} at {(i % 7, i % 5)}" for i in range(3000)]
+    simulator.close()
@@ -0,0 +1,93 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from RonENG_tools import BatchRunner
+from СonsoleRonENG import MilitarySimulator
+
+SCRIPT = """
+# Build a small world
+create soldier Johnson rank=Sergeant location="(10, 10)"
+create soldier Smith
+create team Alpha
+create mission "Eagle Eye" Recon "(50, 50)"
+assign Johnson Alpha
+assign Smith Alpha
+assign Alpha "Eagle Eye"
+team Alpha set_commander @soldier:Johnson
+soldier Smith add_equipment Rifle 2
+mission "Eagle Eye" add_objective "Secure the ridge"
+move Alpha 20 30 formation=wedge
+report team Alpha
+"""
+
+
+def test_script_commands_build_the_world():
+    simulator = MilitarySimulator(seed=1)
+    output = io.StringIO()
+    runner = BatchRunner(simulator, output)
+    stats = runner.run(SCRIPT.splitlines())
+    assert (stats["commands"], stats["failed"], stats["errors"]) == (12, 0, 0)
+    team = simulator.find_team("alpha")
+    assert [m.name for m in team.members] == ["Johnson", "Smith"] and team.commander.name == "Johnson"
+    assert simulator.find_soldier("Johnson").rank == "Sergeant"
+    assert simulator.find_soldier("Smith").equipment == {"Rifle": 2}
+    assert simulator.find_mission("Eagle Eye").teams == [team]
+    assert team.location == (20, 30)
+    assert output.getvalue().startswith("\nTeam Alpha Status Report:\n")
+
+
+def test_json_lines_match_script_lines():
+    scripted, streamed = MilitarySimulator(seed=1), MilitarySimulator(seed=1)
+    BatchRunner(scripted).run(SCRIPT.splitlines())
+    lines = [json.dumps(entry) for entry in [
+        {"command": "create", "args": ["soldier", "Johnson"], "kwargs": {"rank": "Sergeant", "location": [10, 10]}},
+        {"command": "create", "args": ["soldier", "Smith"]},
+        {"command": "create", "args": ["team", "Alpha"]},
+        {"command": "create", "args": ["mission", "Eagle Eye", "Recon", [50, 50]]},
+        {"command": "assign", "args": ["Johnson", "Alpha"]},
+        {"command": "assign", "args": ["Smith", "Alpha"]},
+        {"command": "assign_team_to_mission", "args": ["Alpha", "Eagle Eye"]},
+        {"command": "set_commander", "target": ["team", "Alpha"], "args": [{"@": ["soldier", "Johnson"]}]},
+        {"command": "add_equipment", "target": ["soldier", "Smith"], "args": ["Rifle", 2]},
+        {"command": "add_objective", "target": ["mission", "Eagle Eye"], "args": ["Secure the ridge"]},
+        {"command": "move", "args": ["Alpha", 20, 30], "kwargs": {"formation": "wedge"}},
+    ]]
+    assert BatchRunner(streamed).run(lines)["errors"] == 0
+    for first, second in zip(scripted.snapshot_sections()[1:], streamed.snapshot_sections()[1:]):
+        assert (first == second).all()
+    assert [o["description"] for o in streamed.missions[0].objectives] == ["Secure the ridge"]
+
+
+def test_unlisted_commands_are_errors_and_the_batch_goes_on(tmp_path):
+    simulator = MilitarySimulator(seed=1)
+    runner = BatchRunner(simulator)
+    stats = runner.run([
+        f"save_snapshot {tmp_path / 'world.snap'}",
+        "start_journal /tmp",
+        "team Nobody eta",
+        "soldier Ghost __class__",
+        "create vehicle Tank",
+        "create team Bravo",
+        "remove_team Charlie",
+    ])
+    assert (stats["commands"], stats["errors"], stats["failed"]) == (7, 5, 1)
+    assert [number for number, _ in runner.errors] == [1, 2, 3, 4, 5]
+    assert runner.errors[0][1] == "ValueError: Unknown command: save_snapshot"
+    assert not list(tmp_path.iterdir())
+    assert simulator.find_team("Bravo") is not None
+
+
+def test_command_line_runs_a_batch(tmp_path):
+    script = tmp_path / "script.txt"
+    script.write_text(SCRIPT + "report\nbogus command\n", encoding="utf-8")
+    report = tmp_path / "report.txt"
+    root = Path(__file__).resolve().parent.parent
+    done = subprocess.run([sys.executable, str(root / "RonENG_tools.py"), "--batch", str(script), "--output", str(report)],
+                          capture_output=True, text=True, timeout=120)
+    assert done.returncode == 1
+    assert "line 16: ValueError: Unknown command: bogus" in done.stderr
+    assert "14 commands" in done.stderr and "1 errors" in done.stderr
+    assert "===== GLOBAL STATUS REPORT =====" in report.read_text(encoding="utf-8")
@@ -0,0 +1,48 @@
+import pytest
+
+from СonsoleRonENG import MEMORY_TARGETS, MilitarySimulator, MissionStatus, Rank, SoldierStatus, measure_entity_memory
+
+
+def test_labels_parse_to_enum_members():
+    assert SoldierStatus.parse("OnLeave") is SoldierStatus.ON_LEAVE
+    assert SoldierStatus.parse(1) is SoldierStatus.INJURED
+    assert SoldierStatus.parse("Asleep") is None
+    assert MissionStatus.parse(MissionStatus.FAILED) is MissionStatus.FAILED
+    assert f"{Rank.CAPTAIN:>8}" == " Captain"
+    assert Rank.labels() == ["Private", "Corporal", "Sergeant", "Lieutenant", "Captain", "Major"]
+
+
+def test_entities_have_no_instance_dict():
+    simulator = MilitarySimulator()
+    for entity in (simulator.create_soldier("A"), simulator.create_team("T"), simulator.create_mission("M", "", (0, 0))):
+        assert not hasattr(entity, "__dict__")
+        with pytest.raises(AttributeError):
+            entity.nickname = "x"
+
+
+def test_statuses_and_ranks_are_stored_as_codes():
+    simulator = MilitarySimulator()
+    soldier = simulator.create_soldier("A", rank="Chaplain")
+    assert soldier.rank == "Chaplain"
+    assert soldier.rank_code == len(Rank)
+    assert not soldier.update_status("Asleep")
+    assert soldier.update_status("MIA")
+    assert soldier.status_code is SoldierStatus.MIA
+    assert simulator.soldier_table.status[soldier.row] == SoldierStatus.MIA
+    mission = simulator.create_mission("M", "", (0, 0))
+    assert not mission.update_status("Won")
+    assert mission.update_status("Active")
+    assert mission.status == "Active" and mission.status_code is MissionStatus.ACTIVE
+
+
+def test_experience_promotes_through_the_rank_enum():
+    soldier = MilitarySimulator().create_soldier("A")
+    soldier.gain_experience(100)
+    assert soldier.rank_code is Rank.CORPORAL
+    soldier.gain_experience(10_000)
+    assert soldier.rank == "Sergeant"
+
+
+def test_entities_stay_within_memory_targets():
+    measured = measure_entity_memory()
+    assert all(measured[kind] <= target for kind, target in MEMORY_TARGETS.items())
@@ -0,0 +1,57 @@
+import random
+from collections import Counter
+
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator, create_sample_data
+
+ITEMS = ["Rifle", "Ammo", "Medkit", "Radio"]
+
+
+def scan(soldiers):
+    inventory = Counter()
+    for soldier in soldiers:
+        inventory.update(soldier.equipment)
+    return dict(+inventory)
+
+
+def check_ledgers(simulator):
+    assert {item: quantity for item, quantity in simulator.equipment_totals.items() if quantity} == \
+        scan(simulator.soldiers)
+    for team in simulator.teams:
+        assert {item: quantity for item, quantity in team.equipment_inventory.items() if quantity} == \
+            scan(team.members)
+
+
+def test_ledgers_follow_random_changes():
+    simulator = MilitarySimulator(seed=2)
+    random_world(simulator, 150, 8, 3, seed=3)
+    rng = random.Random(7)
+    for i in range(600):
+        action = rng.randrange(6)
+        soldier = rng.choice(simulator.soldiers)
+        team = rng.choice(simulator.teams)
+        if action == 0:
+            soldier.add_equipment(rng.choice(ITEMS), rng.randint(1, 4))
+        elif action == 1:
+            soldier.use_equipment(rng.choice(ITEMS), rng.randint(1, 3))
+        elif action == 2:
+            simulator.assign_soldier_to_team(soldier.name, team.name)
+        elif action == 3:
+            team.remove_member(soldier)
+        elif action == 4:
+            team.distribute_equipment({rng.choice(ITEMS): rng.randint(1, 20)})
+        elif len(simulator.soldiers) > 50:
+            simulator.remove_soldier(soldier.name)
+        if i % 50 == 0:
+            check_ledgers(simulator)
+    check_ledgers(simulator)
+
+
+def test_team_report_lists_the_ledger():
+    simulator = MilitarySimulator(seed=2)
+    create_sample_data(simulator)
+    team = simulator.teams[0]
+    lines = list(team.equipment_report_lines())
+    inventory = scan(team.members)
+    assert sorted(lines[1:]) == sorted(f"- {item}: {quantity}\n" for item, quantity in inventory.items())
+    assert team.equipment_report() == "".join(team.equipment_report_lines())
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from СonsoleRonENG import EventRecord, MilitarySimulator
+
+
+def test_records_render_like_the_old_eager_strings():
+    simulator = MilitarySimulator()
+    soldier = simulator.create_soldier("Johnson", rank="Sergeant")
+    team = simulator.create_team("Alpha")
+    mission = simulator.create_mission("Eagle Eye", "Recon", (5, 5))
+    events = [(soldier.log_event("Moved to {}", (3, 4)), "Sergeant Johnson - Moved to (3, 4)"),
+              (team.log_event("Assigned to mission {}", "Eagle Eye"), "Team Alpha - Assigned to mission Eagle Eye"),
+              (mission.log_event("Objective {} complete", 2), "Objective 2 complete"),
+              (simulator.log_event("Tick {}", 7), "Tick 7")]
+    for event, text in events:
+        assert event.text == text
+        timestamp = datetime.fromtimestamp(event.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        assert str(event) == f"{timestamp}: {text}"
+
+
+def test_templates_are_registered_once():
+    simulator = MilitarySimulator()
+    first = simulator.create_soldier("Johnson")
+    second = simulator.create_soldier("Smith")
+    a = first.log_event("Healed by {} points", 10)
+    b = second.log_event("Healed by {} points", 25)
+    registered = len(EventRecord.formats)
+    c = first.log_event("Healed by {} points", 5)
+    assert a.kind == b.kind == c.kind
+    assert len(EventRecord.formats) == registered
+    assert b.args[-1] == 25 and b.text.endswith("Healed by 25 points")
+
+
+def test_descriptions_without_args_are_literal():
+    simulator = MilitarySimulator()
+    mission = simulator.create_mission("Eagle Eye", "Recon", (5, 5))
+    event = mission.log_event("Status {unchanged} at {}")
+    assert event.text == "Status {unchanged} at {}"
+    assert mission.log_event("Other {text}").kind == event.kind
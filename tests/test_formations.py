@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+import pytest
+
+from СonsoleRonENG import FORMATIONS, MilitarySimulator, formation_offsets
+
+
+def old_line_position(i, location, spacing):
+    """Position the pre-vectorized move_team loop gave roster slot i"""
+    if i == 0:
+        return location
+    if i % 2 == 1:
+        return (location[0] + ((i + 1) // 2) * spacing, location[1])
+    return (location[0] - (i // 2) * spacing, location[1])
+
+
+def team_of(size, injured=()):
+    simulator = MilitarySimulator(seed=2)
+    team = simulator.create_team("Alpha")
+    for i in range(size):
+        simulator.create_soldier(f"Soldier{i}", location=(-50, -50))
+        simulator.assign_soldier_to_team(f"Soldier{i}", "Alpha")
+    for i in injured:
+        team.members[i].update_status("Injured")
+    return simulator, team
+
+
+def test_line_matches_the_old_loop():
+    simulator, team = team_of(9, injured=(2, 5))
+    assert team.move_team((10, 20), formation_spacing=4)
+    for i, soldier in enumerate(team.members):
+        expected = (-50, -50) if i in (2, 5) else old_line_position(i, (10, 20), 4)
+        assert tuple(soldier.location) == pytest.approx(expected)
+    assert simulator.soldiers_near((10, 20), 0.5) == [team.members[0]]
+
+
+def test_formation_shapes():
+    slots = np.arange(7)
+    column = formation_offsets("column", slots, 7, 3)
+    assert np.array_equal(column, np.column_stack((np.zeros(7), -3.0 * slots)))
+    wedge = formation_offsets("wedge", slots, 7, 3)
+    assert np.array_equal(np.abs(wedge[:, 0]), -wedge[:, 1])
+    circle = formation_offsets("circle", slots, 7, 3)
+    radii = np.hypot(circle[:, 0], circle[:, 1])
+    assert np.allclose(radii, radii[0]) and radii[0] >= 3
+    # Neighbours are spacing apart along the circumference
+    assert radii[0] * 2 * math.pi / 7 == pytest.approx(3)
+    assert formation_offsets("circle", [0], 1, 3).tolist() == [[0.0, 0.0]]
+    for formation in FORMATIONS:
+        offsets = formation_offsets(formation, slots, 7, 3)
+        assert len({tuple(row) for row in offsets.round(9)}) == 7
+
+
+def test_unknown_formation_or_speed_is_refused():
+    simulator, team = team_of(3)
+    assert not team.move_team((10, 20), formation="square")
+    assert not team.move_team((10, 20), speed=0)
+    assert all(tuple(soldier.location) == (-50, -50) for soldier in team.members)
+    with pytest.raises(ValueError):
+        formation_offsets("square", [0], 1, 5)
+
+
+def test_large_team_moves_in_formation():
+    simulator, team = team_of(300)
+    assert team.move_team((0, 0), formation="circle", formation_spacing=2)
+    radii = [math.hypot(*soldier.location) for soldier in team.members]
+    assert max(radii) - min(radii) < 1e-9
+    assert len(simulator.soldiers_near((0, 0), radii[0] + 0.01)) == 300
@@ -0,0 +1,48 @@
+from collections import Counter
+
+import numpy as np
+
+from RonENG_tools import generate_world
+from СonsoleRonENG import MilitarySimulator, Rank
+
+
+def describe(simulator):
+    teams = [(t.name, t.location, [m.name for m in t.members], t.commander and t.commander.name) for t in simulator.teams]
+    missions = [(m.name, m.description, m.location, m.difficulty, [o["description"] for o in m.objectives],
+                 [t.name for t in m.teams]) for m in simulator.missions]
+    return teams, missions, simulator.snapshot_sections()[1:]
+
+
+def test_same_seed_gives_the_same_world():
+    first, second, other = (generate_world(MilitarySimulator(seed=1), 2000, 20, 15, seed=seed) for seed in (7, 7, 8))
+    teams, missions, sections = describe(first)
+    assert describe(second)[:2] == (teams, missions)
+    assert all(np.array_equal(a, b) for a, b in zip(sections, describe(second)[2]))
+    assert describe(other)[:2] != (teams, missions)
+
+
+def test_world_shape():
+    simulator = generate_world(MilitarySimulator(seed=1), 5000, 50, 30, seed=3, extent=500)
+    assert (len(simulator.soldiers), len(simulator.teams), len(simulator.missions)) == (5000, 50, 30)
+    assert sum(len(team.members) for team in simulator.teams) == 4500
+    for team in simulator.teams:
+        if team.members:
+            assert Rank.parse(team.commander.rank) == max(Rank.parse(m.rank) for m in team.members)
+    xs, ys = zip(*(soldier.location for soldier in simulator.soldiers))
+    assert 0 <= min(xs) and max(xs) <= 500 and 0 <= min(ys) and max(ys) <= 500
+    ranks = Counter(soldier.rank for soldier in simulator.soldiers)
+    assert ranks["Private"] > ranks["Corporal"] > ranks["Sergeant"] > ranks["Major"]
+    inventory = Counter()
+    for soldier in simulator.soldiers:
+        inventory.update(soldier.equipment)
+    assert simulator.equipment_totals == dict(inventory)
+    assert sum(len(mission.teams) for mission in simulator.missions) > 20
+
+
+def test_names_continue_after_existing_entities():
+    simulator = MilitarySimulator(seed=1)
+    generate_world(simulator, 100, 3, 2, seed=1)
+    generate_world(simulator, 100, 3, 2, seed=1)
+    assert len({soldier.name for soldier in simulator.soldiers}) == 200
+    assert simulator.soldiers[-1].name.endswith(" 200")
+    assert [team.name for team in simulator.teams][3:] == ["Echo 4", "Foxtrot 5", "Golf 6"]
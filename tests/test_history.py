@@ -0,0 +1,38 @@
+from RonENG_archive import EventSpill
+from СonsoleRonENG import EventHistory, EventRecord
+
+
+def record(i):
+    return EventRecord(EventRecord.code("mission", "Step {} of {}"), 0, (i, "drill"), 1_700_000_000 + i)
+
+
+def test_ring_buffer_keeps_the_most_recent_entries():
+    history = EventHistory(3)
+    for i in range(5):
+        history.append(f"entry {i}")
+    assert list(history) == ["entry 2", "entry 3", "entry 4"]
+    assert history[0] == "entry 2" and history[-1] == "entry 4"
+    assert history[1:] == ["entry 3", "entry 4"]
+    assert len(history) == 3 and history.total == 5
+
+
+def test_evicted_entries_spill_and_read_back_in_order(tmp_path):
+    spill = EventSpill(str(tmp_path / "spill.log"))
+    first, second = EventHistory(4, spill), EventHistory(4, spill)
+    for i in range(10):
+        first.append(record(i))
+        second.append(f"plain {i}")
+    assert first.full() == [str(record(i)) for i in range(10)]
+    assert second.full() == [f"plain {i}" for i in range(10)]
+    assert len(first) == 4
+    spill.close()
+
+
+def test_between_filters_spilled_and_buffered_entries(tmp_path):
+    spill = EventSpill(str(tmp_path / "spill.log"))
+    history = EventHistory(3, spill)
+    for i in range(8):
+        history.append(record(i))
+    assert history.between(1_700_000_002, 1_700_000_006) == [str(record(i)) for i in range(2, 6)]
+    assert history.between(start=1_700_000_006) == [str(record(6)), str(record(7))]
+    spill.close()
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from RonENG_UI import JobRunner
+from СonsoleRonENG import MilitarySimulator
+
+
+class StubRoot:
+    """Stands in for the Tk root: after() callbacks run when the test pumps them"""
+    
+    def __init__(self):
+        self.callbacks = []
+    
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+    
+    def update_idletasks(self):
+        pass
+    
+    def pump(self, until, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not until():
+            assert time.monotonic() < deadline, "jobs did not finish"
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.005)
+
+
+def test_jobs_run_in_order_and_report_back_on_the_polling_thread():
+    root = StubRoot()
+    runner = JobRunner(root)
+    seen = []
+    
+    def work(job):
+        for i in range(3):
+            job.report(i + 1, 3)
+            job.publish(i)
+        return job.title
+    
+    def on_update(item):
+        seen.append(("update", item, threading.current_thread() is threading.main_thread()))
+    
+    first = runner.submit("first", work, seen.append, on_update)
+    second = runner.submit("second", work, seen.append, on_update)
+    root.pump(lambda: second.state == "done")
+    assert first.state == "done" and first.progress == (3, 3)
+    updates = [("update", i, True) for i in range(3)]
+    assert seen == [*updates, "first", *updates, "second"]
+    assert runner.current is None and not runner.queued
+
+
+def test_cancelled_and_failing_jobs():
+    root = StubRoot()
+    runner = JobRunner(root)
+    release = threading.Event()
+    ran, errors = [], []
+    blocker = runner.submit("blocker", lambda job: release.wait(10))
+    dropped = runner.submit("dropped", lambda job: ran.append("dropped"))
+    failing = runner.submit("failing", lambda job: 1 / 0, on_error=errors.append)
+    dropped.cancel()
+    release.set()
+    root.pump(lambda: failing.state == "failed")
+    assert blocker.state == "done" and dropped.state == "cancelled" and not ran
+    assert isinstance(errors[0], ZeroDivisionError)
+
+
+def test_hold_simulator_waits_for_the_running_job():
+    root = StubRoot()
+    runner = JobRunner(root)
+    simulator = MilitarySimulator(seed=1)
+    started = threading.Event()
+    
+    def work(job):
+        started.set()
+        # More updates than the event queue holds: the job must not block the waiting Tk side
+        for i in range(JobRunner.BACKLOG * 3):
+            simulator.create_soldier(f"Soldier{i}")
+            job.publish(i)
+        return len(simulator.soldiers)
+    
+    updates = []
+    job = runner.submit("create", work, on_update=updates.append)
+    started.wait(10)
+    with runner.hold_simulator():
+        assert len(simulator.soldiers) == JobRunner.BACKLOG * 3
+    root.pump(lambda: job.state == "done")
+    assert updates == list(range(JobRunner.BACKLOG * 3))
@@ -0,0 +1,116 @@
+import os
+import random
+
+import numpy as np
+
+from RonENG_journal import WriteAheadJournal
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator, SoldierStatus, SoldierTable
+
+
+def same_world(first, second):
+    return all(np.array_equal(a, b) for a, b in zip(first.snapshot_sections(), second.snapshot_sections()))
+
+
+def same_state(first, second):
+    """same_world, except mission start and end times: replayed status changes are stamped when replayed"""
+    missions = [[(m.status, m.steps, m.success_rate, [o["completed"] for o in m.objectives]) for m in simulator.missions]
+                for simulator in (first, second)]
+    sections = zip(first.snapshot_sections()[1:], second.snapshot_sections()[1:])
+    return missions[0] == missions[1] and all(np.array_equal(a, b) for a, b in sections)
+
+
+def mutate(simulator, count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        soldier = rng.choice(simulator.soldiers)
+        action = rng.randrange(8)
+        if action == 0:
+            soldier.update_health(rng.randint(-20, 10))
+        elif action == 1:
+            soldier.add_equipment(rng.choice(["Rifle", "Ammo", "Medkit"]), rng.randint(1, 3))
+        elif action == 2:
+            soldier.update_status(rng.choice(SoldierStatus.labels()))
+        elif action == 3:
+            soldier.improve_skill(rng.choice(SoldierTable.SKILLS), 1)
+        elif action == 4:
+            soldier.update_location((rng.uniform(0, 100), rng.uniform(0, 100)))
+        elif action == 5:
+            simulator.rename_soldier(soldier.name, f"{soldier.name}-{i}")
+        elif action == 6:
+            simulator.remove_soldier(soldier.name)
+        else:
+            simulator.assign_soldier_to_team(soldier.name, rng.choice(simulator.teams).name)
+
+
+def test_recover_replays_to_the_live_world(tmp_path):
+    simulator = MilitarySimulator(seed=1)
+    random_world(simulator, 300, 6, 3, seed=2)
+    simulator.start_journal(str(tmp_path), checkpoint_records=250)
+    try:
+        mutate(simulator, 1000, seed=3)
+    finally:
+        simulator.stop_journal()
+    recovered = MilitarySimulator.recover(str(tmp_path))
+    recovered.stop_journal()
+    assert same_world(simulator, recovered)
+
+
+def test_recover_stops_at_a_torn_group(tmp_path):
+    simulator = MilitarySimulator(seed=4)
+    random_world(simulator, 100, 4, 2, seed=5)
+    simulator.start_journal(str(tmp_path))
+    try:
+        mutate(simulator, 200, seed=6)
+        simulator.wal.commit()
+        written = simulator.wal.sequence
+    finally:
+        simulator.stop_journal()
+    journal, = (name for name in os.listdir(tmp_path) if name.startswith("journal-"))
+    with open(tmp_path / journal, "ab") as stream:
+        stream.write(WriteAheadJournal.GROUP_HEADER.pack(1000, 0) + b"torn")
+    recovered = MilitarySimulator.recover(str(tmp_path))
+    assert recovered.stop_journal().sequence == written
+    assert same_world(simulator, recovered)
+
+
+def test_recovered_world_keeps_journaling(tmp_path):
+    simulator = MilitarySimulator(seed=7)
+    random_world(simulator, 120, 5, 6, seed=8)
+    simulator.start_journal(str(tmp_path), checkpoint_records=100)
+    try:
+        mutate(simulator, 150, seed=9)
+        simulator.run_ticks(3, workers=1)
+    finally:
+        simulator.stop_journal()
+    recovered = MilitarySimulator.recover(str(tmp_path))
+    try:
+        assert same_state(simulator, recovered)
+        mutate(recovered, 150, seed=10)
+        recovered.remove_team(recovered.teams[0].name)
+        recovered.run_ticks(3, workers=1)
+    finally:
+        recovered.stop_journal()
+    again = MilitarySimulator.recover(str(tmp_path))
+    again.stop_journal()
+    assert same_state(recovered, again)
+
+
+
+def test_recover_finds_soldiers_by_row(tmp_path):
+    """Soldiers created after the checkpoint, past a removed one, and passed as arguments"""
+    simulator = MilitarySimulator(seed=11)
+    random_world(simulator, 80, 3, 2, seed=12)
+    simulator.remove_soldier(simulator.soldiers[5].name)
+    simulator.start_journal(str(tmp_path))
+    try:
+        recruits = [simulator.create_soldier(f"Recruit {number}", location=(number, number)) for number in range(20)]
+        simulator.teams[0].add_member(recruits[3])
+        simulator.teams[1].add_members(recruits[10:])
+        simulator.teams[1].set_commander(recruits[12])
+        mutate(simulator, 300, seed=13)
+    finally:
+        simulator.stop_journal()
+    recovered = MilitarySimulator.recover(str(tmp_path))
+    recovered.stop_journal()
+    assert same_world(simulator, recovered)
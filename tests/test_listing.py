@@ -0,0 +1,81 @@
+import pytest
+
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator, Rank, SoldierStatus
+
+SOLDIER_KEYS = {
+    "name": lambda s: s.name.casefold(),
+    "rank": lambda s: Rank.parse(s.rank),
+    "status": lambda s: SoldierStatus.parse(s.status),
+    "health": lambda s: s.health,
+    "location": lambda s: (s.location[0], s.location[1]),
+}
+
+
+def world():
+    simulator = MilitarySimulator(seed=1)
+    random_world(simulator, 500, 12, 10, seed=2)
+    for i, soldier in enumerate(simulator.soldiers[::7]):
+        soldier.update_health(-(i % 5) * 30)
+    return simulator
+
+
+def rows(listing, size=45):
+    """Every row of a listing, fetched a page at a time"""
+    found = []
+    for start in range(0, len(listing), size):
+        found.extend(listing.page(start, size))
+    return found
+
+
+def expected_rows(entities, key, descending, keep):
+    order = [entity for entity in entities if keep(entity)]
+    if key is not None:
+        order.sort(key=key)
+    if descending:
+        order.reverse()
+    return order
+
+
+def test_soldier_listing_matches_a_sorted_scan():
+    simulator = world()
+    for sort, key in [(None, None), *SOLDIER_KEYS.items()]:
+        for descending in (False, True):
+            for text, status in (("", None), ("al", None), ("", "Injured"), ("E", "Active")):
+                listing = simulator.listing("soldiers", sort, descending, text, status)
+                expected = expected_rows(simulator.soldiers, key, descending,
+                                         lambda s: text.casefold() in s.name.casefold() and status in (None, s.status))
+                assert [row[0] for row in rows(listing)] == [s.name for s in expected]
+    first = simulator.soldiers[0]
+    assert simulator.listing("soldiers").page(0, 1) == [
+        (first.name, first.rank, first.status, f"{first.health}%", str(first.location))]
+
+
+def test_team_and_mission_listings_match_a_sorted_scan():
+    simulator = world()
+    teams = simulator.listing("teams", "members", descending=True)
+    assert [row[0] for row in rows(teams, 5)] == \
+        [t.name for t in expected_rows(simulator.teams, lambda t: len(t.members), True, lambda t: True)]
+    simulator.missions[2].update_status("Completed")
+    missions = simulator.listing("missions", "difficulty", status="Pending")
+    assert [row[0] for row in rows(missions, 3)] == \
+        [m.name for m in expected_rows(simulator.missions, lambda m: m.difficulty, False, lambda m: m.status == "Pending")]
+
+
+def test_event_listing_filters_and_sorts_text():
+    simulator = MilitarySimulator(seed=1)
+    for text in ("Bravo moved", "alpha moved", "Charlie held", "ALPHA held"):
+        simulator.log_event(text)
+    assert [row[1] for row in rows(simulator.listing("events", text="alpha"))] == ["alpha moved", "ALPHA held"]
+    assert [row[1] for row in rows(simulator.listing("events", "event", text="held"))] == ["ALPHA held", "Charlie held"]
+    assert rows(simulator.listing("events", descending=True))[0][1] == "ALPHA held"
+
+
+def test_unknown_listings_are_refused():
+    simulator = MilitarySimulator(seed=1)
+    with pytest.raises(ValueError):
+        simulator.listing("vehicles")
+    with pytest.raises(ValueError):
+        simulator.listing("soldiers", "commander")
+    with pytest.raises(ValueError):
+        simulator.listing("missions", status="Sleeping")
@@ -0,0 +1,40 @@
+import pytest
+
+from СonsoleRonENG import MilitarySimulator
+
+
+def test_find_ignores_case():
+    simulator = MilitarySimulator()
+    soldier = simulator.create_soldier("Johnson")
+    team = simulator.create_team("Alpha")
+    mission = simulator.create_mission("Eagle Eye", "Recon", (5, 5))
+    assert simulator.find_soldier("JOHNSON") is soldier
+    assert simulator.find_team("alpha") is team
+    assert simulator.find_mission("eagle eye") is mission
+    assert simulator.find_soldier("Smith") is None
+
+
+def test_names_collide_case_insensitively():
+    simulator = MilitarySimulator()
+    simulator.create_team("Alpha")
+    with pytest.raises(ValueError):
+        simulator.create_team("ALPHA")
+    with pytest.raises(ValueError):
+        simulator.add_teams(["Bravo", "bravo"])
+    assert [team.name for team in simulator.teams] == ["Alpha"]
+
+
+def test_rename_and_remove_update_the_index():
+    simulator = MilitarySimulator()
+    soldier = simulator.create_soldier("Johnson")
+    simulator.create_soldier("Smith")
+    with pytest.raises(ValueError):
+        simulator.rename_soldier("Johnson", "smith")
+    assert simulator.rename_soldier("johnson", "Jones") is soldier
+    assert simulator.find_soldier("Johnson") is None
+    assert simulator.find_soldier("jones") is soldier
+    assert simulator.rename_soldier("Jones", "JONES") is soldier
+    assert soldier.name == "JONES"
+    assert simulator.remove_soldier("jones")
+    assert simulator.find_soldier("Jones") is None
+    assert [soldier.name for soldier in simulator.soldiers] == ["Smith"]
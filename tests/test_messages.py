@@ -0,0 +1,62 @@
+from СonsoleRonENG import MilitarySimulator
+
+
+def team_of(size):
+    simulator = MilitarySimulator(seed=2)
+    team = simulator.create_team("Alpha")
+    for i in range(size):
+        simulator.create_soldier(f"Soldier{i}")
+        simulator.assign_soldier_to_team(f"Soldier{i}", "Alpha")
+    return simulator, team
+
+
+def texts(soldier, unread=False):
+    return [(sender, message) for sender, message, _ in soldier.messages(unread)]
+
+
+def test_broadcast_is_one_shared_entry():
+    simulator, team = team_of(500)
+    team.broadcast_message("Move out")
+    team.broadcast_message("Hold", sender="Captain")
+    assert len(team.team_chat) == 2
+    assert all(texts(member) == [("HQ", "Move out"), ("Captain", "Hold")] for member in team.members)
+    assert team.team_chat[0].endswith(" - HQ: Move out")
+    assert list(team.team_chat)[1].endswith(" - Captain: Hold")
+
+
+def test_direct_messages_only_reach_their_recipient():
+    simulator, team = team_of(3)
+    first, second, third = team.members
+    assert team.direct_message("HQ", "Soldier1", "Report in")
+    assert not team.direct_message("HQ", "Nobody", "Lost")
+    second.receive_message("Medic", "Stay put")
+    assert texts(first) == [] and texts(third) == []
+    assert texts(second) == [("HQ", "Report in"), ("Medic", "Stay put")]
+    assert team.team_chat[0].endswith(" - HQ to Soldier1: Report in")
+
+
+def test_read_cursors_and_unread_messages():
+    simulator, team = team_of(2)
+    first, second = team.members
+    team.broadcast_message("One")
+    first.mark_read()
+    team.broadcast_message("Two")
+    assert first.unread_count() == 1 and texts(first, unread=True) == [("HQ", "Two")]
+    assert second.unread_count() == 2
+    first.mark_read()
+    assert first.unread_count() == 0 and len(first.messages_received) == 2
+
+
+def test_members_only_see_messages_while_in_the_team():
+    simulator, team = team_of(2)
+    first, second = team.members
+    team.broadcast_message("Before")
+    team.remove_member(first)
+    team.broadcast_message("Away")
+    team.add_member(first)
+    team.broadcast_message("Back")
+    assert texts(first) == [("HQ", "Before"), ("HQ", "Back")]
+    assert texts(second) == [("HQ", "Before"), ("HQ", "Away"), ("HQ", "Back")]
+    late = simulator.create_soldier("Late")
+    simulator.assign_soldier_to_team("Late", "Alpha")
+    assert texts(late) == []
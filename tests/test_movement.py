@@ -0,0 +1,63 @@
+import math
+
+import pytest
+
+from СonsoleRonENG import MilitarySimulator
+
+
+def team_at(location, size=4):
+    simulator = MilitarySimulator(seed=2)
+    team = simulator.create_team("Alpha")
+    for i in range(size):
+        simulator.create_soldier(f"Soldier{i}", location=location)
+        simulator.assign_soldier_to_team(f"Soldier{i}", "Alpha")
+    return simulator, team
+
+
+def test_soldier_walks_at_its_speed_and_stops_on_arrival():
+    simulator = MilitarySimulator(seed=2)
+    soldier = simulator.create_soldier("Johnson", location=(0, 0))
+    assert not soldier.move_to((30, 40), 0)
+    assert soldier.move_to((30, 40), 10)
+    assert simulator.in_transit() == 1
+    for tick in range(1, 5):
+        assert simulator.advance_movement() == 0
+        assert tuple(soldier.location) == pytest.approx((6 * tick, 8 * tick))
+    assert simulator.advance_movement() == 1
+    assert tuple(soldier.location) == (30, 40)
+    assert simulator.in_transit() == 0
+    assert simulator.advance_movement() == 0
+    assert simulator.soldiers_near((30, 40), 0) == [soldier]
+
+
+def test_team_takes_its_destination_when_the_last_member_arrives():
+    simulator, team = team_at((0, 0))
+    eta = simulator.dispatch_team("Alpha", simulator.create_mission("Eagle", "Recon", (100, 0)).name, speed=7)
+    assert eta == team.eta() == math.ceil(110 / 7)
+    for _ in range(eta - 1):
+        simulator.advance_movement()
+        assert team.location == (0, 0) and team.in_transit
+    simulator.advance_movement()
+    assert team.location == (100, 0) and not team.in_transit and team.eta() == 0
+    assert simulator.team_grid.nearest((100, 0), 1) == [team]
+
+
+def test_run_ticks_keeps_going_while_anyone_moves():
+    simulator, team = team_at((0, 0))
+    team.move_team((50, 0), speed=5)
+    assert all(soldier.location == (0, 0) for soldier in team.members)
+    simulator.run_ticks(100, workers=1)
+    assert team.location == (50, 0)
+    assert sorted(soldier.location[0] for soldier in team.members) == [45, 50, 55, 60]
+
+
+def test_retasking_a_walking_soldier_releases_the_team():
+    simulator, team = team_at((0, 0), size=2)
+    team.move_team((40, 0), speed=4)
+    simulator.advance_movement()
+    first, second = team.members
+    second.move_to((0, 30), 3)
+    assert team.in_transit == 1
+    simulator.run_ticks(100, workers=1)
+    assert team.location == (40, 0)
+    assert tuple(second.location) == (0, 30)
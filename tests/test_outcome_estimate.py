@@ -0,0 +1,61 @@
+from СonsoleRonENG import MilitarySimulator
+
+
+def world(seed, health=5):
+    simulator = MilitarySimulator(seed=seed)
+    team = simulator.create_team("Alpha")
+    for i in range(4):
+        soldier = simulator.create_soldier(f"Soldier{i}")
+        soldier.health = health
+        simulator.assign_soldier_to_team(soldier.name, "Alpha")
+    mission = simulator.create_mission("Eagle Eye", "Recon", (5, 5))
+    for i in range(3):
+        mission.add_objective(f"Objective {i}")
+    simulator.assign_team_to_mission(team.name, mission.name)
+    return simulator, mission
+
+
+def play(seed, success_chance):
+    simulator, mission = world(seed)
+    while simulator.simulate_mission_progress(mission.name, success_chance):
+        if mission.status not in ("Pending", "Active"):
+            break
+    return mission.status, sum(soldier.health <= 0 for soldier in simulator.soldiers)
+
+
+def test_fixed_chance_matches_the_closed_form():
+    simulator, mission = world(1)
+    estimate = simulator.estimate_mission_outcomes(mission, trials=200_000, success_chance=60, seed=3)
+    # An objective is eventually completed unless a failed roll (30% of them) fails the mission
+    per_objective = 0.6 / (0.6 + 0.4 * 0.3)
+    assert abs(estimate["completion_rate"] - per_objective ** 3) < 0.01
+    assert abs(estimate["failure_rate"] - (1 - per_objective ** 3)) < 0.01
+    for reached in range(3):
+        expected = per_objective ** reached * (1 - per_objective)
+        assert abs(estimate["objectives_reached"][reached] - expected) < 0.01
+    assert all(soldier.health == 5 for soldier in simulator.soldiers)
+    assert mission.status == "Pending" and mission.steps == 0
+
+
+def test_estimate_agrees_with_repeated_simulation():
+    simulator, mission = world(1)
+    estimate = simulator.estimate_mission_outcomes(mission, trials=50_000, success_chance=70, seed=3)
+    runs = [play(seed, 70) for seed in range(400)]
+    completion = sum(status == "Completed" for status, _ in runs) / len(runs)
+    casualties = sum(count for _, count in runs) / len(runs)
+    assert abs(estimate["completion_rate"] - completion) < 0.08
+    assert abs(estimate["expected_casualties"] - casualties) < 0.08
+
+
+def test_same_seed_gives_the_same_estimate():
+    simulator, mission = world(1)
+    first = simulator.estimate_mission_outcomes(mission, trials=5_000, seed=9)
+    assert simulator.estimate_mission_outcomes(mission, trials=5_000, seed=9) == first
+
+
+def test_finished_missions_are_settled():
+    simulator, mission = world(1)
+    mission.update_status("Completed")
+    estimate = simulator.estimate_mission_outcomes(mission, trials=100, seed=9)
+    assert estimate["completion_rate"] == 1.0 and estimate["failure_rate"] == 0.0
+    assert estimate["expected_casualties"] == 0.0
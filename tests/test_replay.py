@@ -0,0 +1,59 @@
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator, OutcomeJournal
+
+
+def world(seed=4):
+    simulator = MilitarySimulator(seed=seed)
+    random_world(simulator, 200, 10, 12, seed=5)
+    return simulator
+
+
+def state(simulator):
+    missions = [(m.status, m.steps, m.success_rate, [o["completed"] for o in m.objectives]) for m in simulator.missions]
+    soldiers = [(s.health, s.status) for s in simulator.soldiers]
+    return missions, soldiers
+
+
+def record(simulator):
+    journal = simulator.start_recording()
+    for _ in range(3):
+        simulator.tick(workers=1)
+        simulator.generate_casualty_event(simulator.teams[0].name)
+        simulator.generate_random_event(simulator.missions[0].name)
+    assert simulator.stop_recording() is journal
+    return journal
+
+
+def test_replay_reproduces_the_recorded_session():
+    recorded = world()
+    journal = record(recorded)
+    kinds = {entry[0] for entry in journal}
+    assert "step" in kinds and "random_event" in kinds
+    # Different mission seeds: replay must apply the journal, not re-roll
+    replayed = world(seed=99)
+    assert replayed.replay(journal) == len(journal)
+    assert state(replayed) == state(recorded)
+
+
+def test_saved_journal_replays_the_same(tmp_path):
+    recorded = world()
+    journal = record(recorded)
+    journal.save(tmp_path / "outcomes.jsonl")
+    loaded = OutcomeJournal.load(tmp_path / "outcomes.jsonl")
+    assert len(loaded) == len(journal)
+    replayed = world(seed=99)
+    replayed.replay(loaded)
+    assert state(replayed) == state(recorded)
+
+
+def test_partial_replay_stops_early():
+    recorded = world()
+    steps = len(recorded.missions)
+    journal = recorded.start_recording()
+    recorded.tick(workers=1)
+    after_one_tick = state(recorded)
+    recorded.tick(workers=1)
+    recorded.stop_recording()
+    replayed = world()
+    assert replayed.replay(journal, stop=steps) == steps
+    assert state(replayed) == after_one_tick
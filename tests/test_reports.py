@@ -0,0 +1,70 @@
+import io
+import re
+
+from СonsoleRonENG import MilitarySimulator, create_sample_data, save_report, write_report
+
+
+def reports(simulator):
+    team, mission = simulator.teams[0], simulator.missions[0]
+    return [(team.team_status, team.team_status_lines), (team.equipment_report, team.equipment_report_lines),
+            (team.team_skill_report, team.team_skill_report_lines),
+            (mission.mission_report, mission.mission_report_lines),
+            (simulator.global_status_report, simulator.global_status_report_lines)]
+
+
+def undated(text):
+    return re.sub(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d", "<time>", text)
+
+
+def test_lines_join_into_the_report_strings():
+    # Reports log that they were generated, so each world makes one of them
+    joined, streamed = MilitarySimulator(seed=1), MilitarySimulator(seed=1)
+    create_sample_data(joined)
+    create_sample_data(streamed)
+    for (report, _), (_, lines) in zip(reports(joined), reports(streamed)):
+        lines = list(lines())
+        assert all(line.endswith("\n") for line in lines)
+        assert undated(report()) == undated("".join(lines))
+
+
+def test_team_status_report_text():
+    simulator = MilitarySimulator(seed=1)
+    team = simulator.create_team("Alpha")
+    for name, rank in (("Johnson", "Sergeant"), ("Smith", "Private")):
+        simulator.create_soldier(name, location=(1, 2), rank=rank)
+        simulator.assign_soldier_to_team(name, "Alpha")
+    team.set_commander(team.members[0])
+    team.members[1].update_health(-100)
+    assert team.team_status() == (
+        "\nTeam Alpha Status Report:\n"
+        "Total members: 2, Active: 1, Injured: 1\n"
+        "Commander: Sergeant Johnson\n"
+        f"Current location: {team.location}\n"
+        f"Current status: {team.status}\n\n"
+        "Members:\n"
+        "Sergeant Johnson: Active at (1, 2), Health: 100%\n"
+        "Private Smith: Injured at (1, 2), Health: 0%\n")
+
+
+def test_reports_stream_lazily():
+    simulator = MilitarySimulator(seed=1)
+    team = simulator.create_team("Alpha")
+    simulator.add_soldiers([f"Soldier{i}" for i in range(20_000)])
+    team.add_members(list(simulator.soldiers))
+    logged = team.mission_log.total
+    lines = team.team_status_lines()
+    assert team.mission_log.total == logged
+    assert next(lines) == "\nTeam Alpha Status Report:\n"
+    assert team.mission_log.total == logged + 1
+    assert next(lines) == "Total members: 20000, Active: 20000, Injured: 0\n"
+
+
+def test_writers_copy_the_lines(tmp_path):
+    simulator = MilitarySimulator(seed=1)
+    create_sample_data(simulator)
+    expected = "".join(simulator.teams[0].team_status_lines())
+    stream = io.StringIO()
+    write_report(simulator.teams[0].team_status_lines(), stream)
+    assert stream.getvalue() == expected
+    path = save_report(simulator.teams[0].team_status_lines(), tmp_path / "report.txt")
+    assert path.read_text(encoding="utf-8") == expected
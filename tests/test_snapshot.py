@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from worlds import random_world
+from СonsoleRonENG import SNAPSHOT_COLUMNS, MilitarySimulator
+
+
+def columns(simulator):
+    """Every saved soldier column, in roster order"""
+    table = simulator.soldier_table
+    rows = [soldier.row for soldier in simulator.soldiers]
+    return [table.column(name)[rows] for name in SNAPSHOT_COLUMNS]
+
+
+def same_world(first, second):
+    return all(np.array_equal(a, b) for a, b in zip(columns(first), columns(second)))
+
+
+def world():
+    simulator = MilitarySimulator(seed=4)
+    random_world(simulator, 300, 12, 8, seed=5)
+    simulator.teams[0].commander = simulator.teams[0].members[0]
+    simulator.soldiers[3].update_status("MIA")
+    simulator.soldiers[4].add_equipment("Flare", 2)
+    simulator.dispatch_team(simulator.teams[1].name, simulator.missions[0].name, speed=3)
+    simulator.run_ticks(2, workers=1)
+    return simulator
+
+
+def test_round_trip_restores_the_same_world(tmp_path):
+    simulator = world()
+    loaded = MilitarySimulator.load_snapshot(simulator.save_snapshot(tmp_path / "world.snap"))
+    assert same_world(simulator, loaded)
+    assert [s.name for s in loaded.soldiers] == [s.name for s in simulator.soldiers]
+    for original, copy in zip(simulator.teams, loaded.teams):
+        assert [m.name for m in copy.members] == [m.name for m in original.members]
+        assert (copy.commander and copy.commander.name) == (original.commander and original.commander.name)
+        assert copy.equipment_inventory == original.equipment_inventory
+    for original, copy in zip(simulator.missions, loaded.missions):
+        assert [t.name for t in copy.teams] == [t.name for t in original.teams]
+        assert copy.calculate_success_probability() == original.calculate_success_probability()
+    assert loaded.equipment_totals == simulator.equipment_totals
+    assert loaded.soldier_statuses.counts() == simulator.soldier_statuses.counts()
+    assert loaded.mission_statuses.counts() == simulator.mission_statuses.counts()
+    assert loaded.find_soldier(simulator.soldiers[10].name.upper()) is loaded.soldiers[10]
+
+
+def test_loaded_world_runs_on_like_the_original(tmp_path):
+    simulator = world()
+    loaded = MilitarySimulator.load_snapshot(simulator.save_snapshot(tmp_path / "world.snap"))
+    simulator.run_ticks(6, workers=1)
+    loaded.run_ticks(6, workers=1)
+    # Missions that end now get different end times, so compare them by mission state
+    assert [(m.status, m.steps, m.success_rate) for m in loaded.missions] == \
+        [(m.status, m.steps, m.success_rate) for m in simulator.missions]
+    assert same_world(simulator, loaded)
+    assert loaded.teams[1].location == simulator.teams[1].location
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "world.snap"
+    path.write_bytes(b"not a snapshot\n")
+    with pytest.raises(ValueError):
+        MilitarySimulator.load_snapshot(path)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from СonsoleRonENG import MilitarySimulator, Soldier, SoldierStatus, SoldierTable
+
+
+def test_soldiers_read_and_write_their_table_row():
+    simulator = MilitarySimulator()
+    soldier = simulator.create_soldier("Johnson", location=(3, 4))
+    table = simulator.soldier_table
+    soldier.update_health(-30)
+    soldier.improve_skill("medical", 2)
+    soldier.update_location((7, 8))
+    assert table.health[soldier.row] == 70
+    assert table.medical[soldier.row] == 3
+    assert (table.x[soldier.row], table.y[soldier.row]) == (7, 8)
+    table.experience[soldier.row] = 42
+    assert soldier.experience == 42
+    assert soldier.skills == {"combat": 1, "medical": 3, "recon": 1, "leadership": 1}
+
+
+def test_growing_the_table_keeps_every_soldier():
+    table = SoldierTable(capacity=2)
+    soldiers = [Soldier(f"Soldier {i}", "Active", (i, -i), table=table) for i in range(50)]
+    for i, soldier in enumerate(soldiers):
+        soldier.health = 100 - i
+    assert table.capacity >= 50
+    assert [soldier.location for soldier in soldiers] == [(i, -i) for i in range(50)]
+    assert table.column("health").tolist() == [100 - i for i in range(50)]
+
+
+def test_add_soldiers_fills_columns_in_bulk():
+    simulator = MilitarySimulator()
+    soldiers = simulator.add_soldiers(["A", "B", "C"], equipment=[{"Rifle": 1}, None, {"Rifle": 2, "Ammo": 5}],
+                                      health=np.array([10, 20, 30]), status=SoldierStatus.INJURED, x=5.0)
+    assert [soldier.health for soldier in soldiers] == [10, 20, 30]
+    assert {soldier.status for soldier in soldiers} == {"Injured"}
+    assert [soldier.location for soldier in soldiers] == [(5, 0)] * 3
+    assert simulator.find_soldier("b") is soldiers[1]
+    assert simulator.equipment_totals == {"Rifle": 3, "Ammo": 5}
+    assert simulator.soldier_statuses.counts() == {"Injured": 3}
+
+
+def test_removed_soldiers_release_their_row():
+    simulator = MilitarySimulator()
+    first = simulator.create_soldier("A")
+    simulator.create_soldier("B")
+    simulator.remove_soldier("A")
+    table = simulator.soldier_table
+    assert len(table) == 1
+    assert not table.in_use[first.row]
+    assert table.live_rows().tolist() == [simulator.soldiers[0].row]
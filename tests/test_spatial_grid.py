@@ -0,0 +1,138 @@
+import math
+import random
+import time
+
+import numpy as np
+
+from RonENG_tools import generate_world
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator, SpatialGrid
+
+
+def distance(soldier, center):
+    return math.hypot(soldier.location[0] - center[0], soldier.location[1] - center[1])
+
+
+def world():
+    simulator = MilitarySimulator(seed=2)
+    rng = random.Random(3)
+    for i in range(400):
+        simulator.create_soldier(f"Soldier{i}", location=(rng.uniform(-150, 150), rng.uniform(-150, 150)))
+    # Move some soldiers and give others a different status after they were indexed
+    for soldier in rng.sample(simulator.soldiers, 150):
+        soldier.update_location((rng.uniform(-300, 300), rng.randint(-40, 40)))
+    for soldier in rng.sample(simulator.soldiers, 120):
+        soldier.update_status("Injured")
+    return simulator, rng
+
+
+def test_within_and_in_box_match_a_scan():
+    simulator, rng = world()
+    for _ in range(60):
+        center = (rng.uniform(-200, 200), rng.uniform(-200, 200))
+        radius = rng.choice([0, 5, 17.5, 60, 500])
+        found = simulator.soldiers_near(center, radius)
+        assert set(found) == {s for s in simulator.soldiers if distance(s, center) <= radius}
+        distances = [distance(s, center) for s in found]
+        assert distances == sorted(distances)
+        injured = simulator.soldiers_near(center, radius, "Injured")
+        assert set(injured) == {s for s in found if s.status == "Injured"}
+        
+        low = (center[0] - rng.uniform(0, 80), center[1] - rng.uniform(0, 80))
+        high = (center[0] + rng.uniform(0, 80), center[1] + rng.uniform(0, 80))
+        assert set(simulator.soldiers_in_area(low, high)) == {
+            s for s in simulator.soldiers
+            if low[0] <= s.location[0] <= high[0] and low[1] <= s.location[1] <= high[1]}
+
+
+def test_nearest_matches_a_scan():
+    simulator, rng = world()
+    for _ in range(60):
+        center = (rng.uniform(-400, 400), rng.uniform(-400, 400))
+        count = rng.choice([1, 3, 25, 500])
+        status = rng.choice([None, "Active", "Injured"])
+        candidates = [s for s in simulator.soldiers if status is None or s.status == status]
+        expected = sorted(distance(s, center) for s in candidates)[:count]
+        found = simulator.nearest_soldiers(center, count, status)
+        assert [distance(s, center) for s in found] == expected
+        assert len(set(found)) == len(found)
+
+
+def test_crowded_cells_split_and_follow_moves_and_removals():
+    simulator = random_world(MilitarySimulator(seed=4), 1500, 12, 0, seed=5, extent=20)
+    rng = random.Random(6)
+    grid = simulator.soldier_table.grid
+    
+    def check():
+        for _ in range(20):
+            center = (rng.uniform(-5, 25), rng.uniform(-5, 25))
+            radius, count = rng.choice([0.5, 3, 12]), rng.choice([1, 10, 300])
+            found = simulator.soldiers_near(center, radius)
+            assert set(found) == {s for s in simulator.soldiers if distance(s, center) <= radius}
+            expected = sorted(distance(s, center) for s in simulator.soldiers)[:count]
+            assert [distance(s, center) for s in simulator.nearest_soldiers(center, count)] == expected
+            low, high = (center[0] - radius, center[1] - 1), (center[0] + 1, center[1] + radius)
+            assert set(simulator.soldiers_in_area(low, high)) == {
+                s for s in simulator.soldiers
+                if low[0] <= s.location[0] <= high[0] and low[1] <= s.location[1] <= high[1]}
+    
+    check()
+    assert any(child is not None for child in grid.fine.values())
+    for team in simulator.teams[:6]:
+        team.move_team((rng.uniform(0, 20), rng.uniform(0, 20)))
+    check()
+    for soldier in rng.sample(simulator.soldiers, 20):
+        soldier.update_location((rng.uniform(0, 20), rng.uniform(0, 20)))
+    check()
+    for soldier in rng.sample(simulator.soldiers, 300):
+        simulator.remove_soldier(soldier.name)
+    check()
+    for i in range(200):
+        simulator.create_soldier(f"Recruit {i}", location=(rng.uniform(0, 20), rng.uniform(0, 20)))
+    check()
+
+
+def test_crowded_cells_answer_nearest_faster():
+    simulator = generate_world(MilitarySimulator(seed=1), 100_000, 1000, 1000, seed=3)
+    table = simulator.soldier_table
+    rows = table.live_rows()
+    whole = SpatialGrid(table.locate, splits=0)
+    whole.insert_many(table.owner[rows].tolist(), table.x[rows], table.y[rows])
+    picks = np.random.default_rng(5).choice(rows, 300)
+    points = list(zip(table.x[picks].tolist(), table.y[picks].tolist()))
+    
+    def p90(grid):
+        # Each point's best of a few runs, so a busy machine only slows the whole test down
+        times = []
+        for point in points:
+            best = np.inf
+            for _ in range(3):
+                start = time.perf_counter()
+                grid.nearest(point, 10)
+                best = min(best, time.perf_counter() - start)
+            times.append(best)
+        return np.percentile(times, 90)
+    
+    assert max(map(len, whole.cells.values())) > 4 * SpatialGrid.SPLIT_SIZE
+    assert p90(table.grid) < p90(whole) / 1.5
+
+
+def test_team_and_mission_grids_follow_moves_and_removals():
+    simulator = MilitarySimulator(seed=2)
+    alpha, bravo = simulator.create_team("Alpha"), simulator.create_team("Bravo")
+    for team in (alpha, bravo):
+        simulator.create_soldier(f"{team.name} Lead")
+        simulator.assign_soldier_to_team(f"{team.name} Lead", team.name)
+    alpha.move_team((1, 1))
+    bravo.move_team((35, -8))
+    assert simulator.team_grid.nearest((0, 0), 2) == [alpha, bravo]
+    alpha.move_team((90, 90))
+    assert simulator.team_grid.within((0, 0), 50) == [bravo]
+    simulator.remove_team("Bravo")
+    assert simulator.team_grid.nearest((0, 0), 2) == [alpha]
+    
+    near = simulator.create_mission("Near", "Recon", (2, 2))
+    far = simulator.create_mission("Far", "Recon", (-70, 10))
+    assert simulator.mission_grid.in_box((-100, 0), (0, 20)) == [far]
+    simulator.remove_mission("Far")
+    assert simulator.mission_grid.nearest((-70, 10), 5) == [near]
@@ -0,0 +1,52 @@
+import random
+from collections import Counter
+
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator, MissionStatus, SoldierStatus
+
+
+def check_counters(simulator):
+    soldiers = Counter(soldier.status for soldier in simulator.soldiers)
+    missions = Counter(mission.status for mission in simulator.missions)
+    assert simulator.soldier_statuses.counts() == {s.label: soldiers[s.label] for s in SoldierStatus if soldiers[s.label]}
+    assert simulator.mission_statuses.counts() == {s.label: missions[s.label] for s in MissionStatus if missions[s.label]}
+    for status in soldiers:
+        assert set(simulator.soldier_statuses.page(status)) == \
+            {soldier for soldier in simulator.soldiers if soldier.status == status}
+
+
+def test_counters_follow_status_changes():
+    simulator = MilitarySimulator(seed=2)
+    random_world(simulator, 200, 8, 20, seed=3)
+    rng = random.Random(5)
+    for i in range(400):
+        action = rng.randrange(5)
+        soldier = rng.choice(simulator.soldiers)
+        if action == 0:
+            soldier.update_status(rng.choice(SoldierStatus.labels()))
+        elif action == 1:
+            soldier.update_health(rng.randint(-60, 30))
+        elif action == 2 and len(simulator.soldiers) > 50:
+            simulator.remove_soldier(soldier.name)
+        elif action == 3:
+            rng.choice(simulator.missions).update_status(rng.choice(MissionStatus.labels()))
+        elif len(simulator.missions) > 5:
+            simulator.remove_mission(rng.choice(simulator.missions).name)
+        if i % 40 == 0:
+            check_counters(simulator)
+    simulator.run_ticks(5, workers=1)
+    check_counters(simulator)
+
+
+def test_pages_keep_the_order_soldiers_entered_a_status():
+    simulator = MilitarySimulator(seed=2)
+    names = [f"Soldier{i}" for i in range(6)]
+    for name in names:
+        simulator.create_soldier(name)
+    for name in reversed(names[:4]):
+        simulator.find_soldier(name).update_status("OnLeave")
+    assert [soldier.name for soldier in simulator.soldier_statuses.page("OnLeave")] == names[3::-1]
+    assert [soldier.name for soldier in simulator.soldier_statuses.page("OnLeave", 1, 2)] == ["Soldier2", "Soldier1"]
+    assert simulator.soldier_statuses.count("Active") == 2
+    report = simulator.global_status_report()
+    assert "- Active: 2\n" in report and "- OnLeave: 4\n" in report
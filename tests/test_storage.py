@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from RonENG_storage import SQLiteSimulator
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator
+
+
+def build(simulator):
+    random_world(simulator, 300, 6, 4, seed=5)
+    names = [soldier.name for soldier in simulator.soldiers]
+    rng = random.Random(8)
+    for _ in range(200):
+        soldier = simulator.find_soldier(rng.choice(names))
+        action = rng.randrange(3)
+        if action == 0:
+            soldier.update_health(rng.randint(-40, 10))
+        elif action == 1:
+            soldier.add_equipment("Flare", rng.randint(1, 3))
+        else:
+            soldier.update_location((rng.uniform(0, 100), rng.uniform(0, 100)))
+    return simulator, names
+
+
+def describe(simulator, names):
+    soldiers = [(s.name, s.health, s.status, tuple(s.location), s.equipment) for s in map(simulator.find_soldier, names)]
+    teams = [(t.name, [m.name for m in t.members], t.active_count, t.skill_totals) for t in simulator.teams]
+    missions = [(m.name, [t.name for t in m.teams], m.calculate_success_probability()) for m in simulator.missions]
+    return soldiers, teams, missions
+
+
+def test_small_cache_matches_the_in_memory_simulator(tmp_path):
+    memory, names = build(MilitarySimulator(seed=4))
+    stored, _ = build(SQLiteSimulator(str(tmp_path / "world.db"), cache_size=25, seed=4))
+    assert describe(stored, names) == describe(memory, names)
+    # Team member lists loaded every member; the next lookup trims the cache again
+    stored.find_soldier(names[0])
+    assert len(stored.cache) <= 25 + len(stored.teams)
+    assert stored.soldier_statuses.counts() == memory.soldier_statuses.counts()
+    assert stored.equipment_totals == {item: n for item, n in memory.equipment_totals.items() if n}
+    for center, radius in [((50, 50), 10), ((20, 80), 35), ((500, 500), 300)]:
+        assert [s.name for s in stored.soldiers_near(center, radius)] == \
+            [s.name for s in memory.soldiers_near(center, radius)]
+        assert {s.name for s in stored.soldiers_in_area((0, 0), center)} == \
+            {s.name for s in memory.soldiers_in_area((0, 0), center)}
+    assert len(stored.nearest_soldiers((50, 50), 7, "Active")) == 7
+    stored.close()
+
+
+def test_reopened_database_has_the_same_world(tmp_path):
+    path = str(tmp_path / "world.db")
+    stored, names = build(SQLiteSimulator(path, cache_size=25, seed=4))
+    removed = names.pop()
+    stored.remove_soldier(removed)
+    before = describe(stored, names)
+    events = stored.find_soldier(names[0]).history.full()
+    stored.close()
+    
+    reopened = SQLiteSimulator(path, cache_size=25)
+    assert reopened.find_soldier(removed) is None
+    assert describe(reopened, names) == before
+    assert reopened.find_soldier(names[0]).history.full() == events
+    reopened.close()
+
+
+def test_cache_stays_within_its_size(tmp_path):
+    stored = SQLiteSimulator(str(tmp_path / "world.db"), cache_size=100, seed=4)
+    random_world(stored, 300, 6, 4, seed=5)
+    # Commanders are never dropped
+    bound = 100 + len(stored.teams)
+    assert len(stored.cache) <= bound
+    assert sum(1 for _ in stored.soldiers) == 300
+    assert len(stored.cache) <= bound
+    for team in stored.teams:
+        assert len(list(team.team_status_lines())) > len(team.members)
+    assert len(stored.cache) <= bound
+    stored.close()
+
+
+def test_only_changed_soldiers_are_written_back(tmp_path):
+    stored = SQLiteSimulator(str(tmp_path / "world.db"), cache_size=100, seed=4)
+    random_world(stored, 300, 6, 4, seed=5)
+    stored.sync()
+    dirty = stored.soldier_table.column("dirty")
+    assert not dirty.any()
+    stored.find_soldier("Soldier 7").update_location((500, 500))
+    assert dirty.sum() == 1
+    assert [s.name for s in stored.nearest_soldiers((500, 500), 1)] == ["Soldier 7"]
+    assert not dirty.any()
+    team = stored.teams[0]
+    active = {s.name for s in team.members if s.status == "Active"}
+    team.move_team((800, 800), formation_spacing=1)
+    assert dirty.sum() == len(active)
+    assert {s.name for s in stored.soldiers_in_area((700, 700), (900, 900))} == active
+    stored.close()
+
+
+def test_journals_are_refused(tmp_path):
+    stored = SQLiteSimulator(str(tmp_path / "world.db"))
+    with pytest.raises(TypeError):
+        stored.start_journal(str(tmp_path / "wal"))
+    stored.close()
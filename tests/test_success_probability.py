@@ -0,0 +1,95 @@
+import random
+from collections import Counter
+
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator, SoldierStatus, SoldierTable, create_sample_data
+
+
+def reference_totals(members):
+    active = [soldier for soldier in members if soldier.status_code == SoldierStatus.ACTIVE]
+    skills = [sum(soldier.skills[skill] for soldier in active) for skill in SoldierTable.SKILLS]
+    return len(members), len(active), skills
+
+
+def reference_probability(mission):
+    members = [soldier for team in mission.teams for soldier in team.members]
+    total, active, skills = reference_totals(members)
+    if not mission.teams or not total or not active:
+        return 0
+    probability = (sum(skills) / (active * 4) / 10) * (1 / mission.difficulty) * (active / total) * 100
+    return round(min(100, max(0, probability)), 1)
+
+
+def check_totals(simulator):
+    for team in simulator.teams:
+        _, active, skills = reference_totals(team.members)
+        assert (team.active_count, team.skill_totals) == (active, skills)
+        inventory = Counter()
+        for soldier in team.members:
+            inventory.update(soldier.equipment)
+        assert team.equipment_inventory == dict(+inventory)
+    for mission in simulator.missions:
+        members = [soldier for team in mission.teams for soldier in team.members]
+        assert (mission.member_count, mission.active_count, mission.skill_totals) == reference_totals(members)
+        assert mission.calculate_success_probability() == reference_probability(mission)
+    force = Counter()
+    for soldier in simulator.soldiers:
+        force.update(soldier.equipment)
+    assert simulator.soldier_table.equipment == dict(+force)
+
+
+def test_sample_data_matches_reference():
+    simulator = create_sample_data(MilitarySimulator(seed=1))
+    check_totals(simulator)
+
+
+def test_incremental_totals_follow_random_changes():
+    simulator = MilitarySimulator(seed=2)
+    random_world(simulator, 400, 8, 4, seed=3)
+    rng = random.Random(4)
+    soldiers = list(simulator.soldiers)
+    for _ in range(500):
+        soldier = rng.choice(soldiers)
+        action = rng.randrange(6)
+        if action == 0:
+            soldier.update_status(rng.choice(SoldierStatus.labels()))
+        elif action == 1:
+            soldier.improve_skill(rng.choice(SoldierTable.SKILLS), rng.randint(1, 3))
+        elif action == 2:
+            soldier.add_equipment(rng.choice(["Rifle", "Ammo", "Medkit"]), rng.randint(1, 3))
+        elif action == 3:
+            soldier.use_equipment(rng.choice(list(soldier.equipment) or ["Rifle"]))
+        elif action == 4:
+            rng.choice(simulator.teams).add_member(soldier)
+        else:
+            team = rng.choice(simulator.teams)
+            if team.members:
+                team.remove_member(rng.choice(team.members))
+    check_totals(simulator)
+
+
+def test_removed_team_no_longer_follows_its_members():
+    simulator = MilitarySimulator(seed=5)
+    random_world(simulator, 300, 6, 3, seed=6)
+    team, other = simulator.teams[0], simulator.teams[1]
+    members = list(team.members)
+    # Members shared with a remaining team must keep counting there
+    shared = members[:3]
+    for soldier in shared:
+        other.add_member(soldier)
+    mission = simulator.missions[0]
+    if team not in mission.teams:
+        mission.add_team(team)
+    team.broadcast_message("Regroup")
+    
+    before = (team.active_count, list(team.skill_totals), dict(team.equipment_inventory))
+    assert simulator.remove_team(team.name)
+    assert all(team not in soldier.teams for soldier in members)
+    assert all(other in soldier.teams for soldier in shared)
+    
+    for soldier in members:
+        soldier.add_equipment("Grenade", 2)
+        soldier.improve_skill("combat", 2)
+        soldier.update_status("Injured")
+    assert (team.active_count, team.skill_totals, team.equipment_inventory) == before
+    check_totals(simulator)
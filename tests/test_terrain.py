@@ -0,0 +1,110 @@
+import heapq
+import random
+
+import numpy as np
+import pytest
+
+from СonsoleRonENG import MilitarySimulator, Terrain
+
+
+def path_cost(terrain, cells):
+    return sum(terrain.costs[y, x] * ((x - px) ** 2 + (y - py) ** 2) ** 0.5
+               for (px, py), (x, y) in zip(cells, cells[1:]))
+
+
+def dijkstra(terrain, start, goal):
+    """Cheapest cost from start to goal cell with the same moves and corner rule as Terrain"""
+    costs = terrain.costs
+    best = {start: 0.0}
+    frontier = [(0.0, start)]
+    while frontier:
+        spent, (x, y) = heapq.heappop(frontier)
+        if (x, y) == goal:
+            return spent
+        if spent > best[(x, y)]:
+            continue
+        for dx, dy, length in Terrain.STEPS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < terrain.width and 0 <= ny < terrain.height) or costs[ny, nx] == np.inf:
+                continue
+            if dx and dy and costs[y, nx] == np.inf and costs[ny, x] == np.inf:
+                continue
+            total = spent + costs[ny, nx] * length
+            if total < best.get((nx, ny), np.inf):
+                best[(nx, ny)] = total
+                heapq.heappush(frontier, (total, (nx, ny)))
+    return None
+
+
+def random_terrain(seed):
+    rng = np.random.default_rng(seed)
+    terrain = Terrain(20, 15)
+    terrain.costs[:] = rng.choice([1.0, 1.0, 2.0, 5.0, np.inf], size=terrain.costs.shape)
+    terrain.costs[0, 0] = terrain.costs[-1, -1] = 1.0
+    return terrain
+
+
+def test_paths_are_as_cheap_as_a_dijkstra_search():
+    for seed in range(8):
+        terrain = random_terrain(seed)
+        rng = random.Random(seed)
+        for _ in range(10):
+            start = (rng.randrange(20), rng.randrange(15))
+            goal = (rng.randrange(20), rng.randrange(15))
+            if terrain.costs[start[1], start[0]] == np.inf:
+                continue
+            cells = terrain.path(terrain.center(start), terrain.center(goal))
+            expected = dijkstra(terrain, start, goal)
+            if expected is None:
+                assert cells is None
+                continue
+            assert cells[0] == start and cells[-1] == goal
+            assert all(max(abs(x - px), abs(y - py)) == 1 for (px, py), (x, y) in zip(cells, cells[1:]))
+            assert path_cost(terrain, cells) == pytest.approx(expected)
+
+
+def test_cache_hits_and_invalidation():
+    terrain = Terrain(10, 10, cache_size=2)
+    first = terrain.path((5, 5), (95, 5))
+    assert terrain.path((1, 1), (99, 9)) is first
+    assert terrain.path_stats()["hits"] == 1 and terrain.path_stats()["misses"] == 1
+    terrain.set_cost((40, 0), (49, 80), np.inf)
+    around = terrain.path((5, 5), (95, 5))
+    assert around is not first and all(cell[0] != 4 or cell[1] == 9 for cell in around)
+    terrain.path((5, 5), (5, 95))
+    terrain.path((5, 95), (5, 5))
+    assert terrain.path_stats()["cached_paths"] == 2
+    assert terrain.path((5, 5), (95, 5)) == around
+    assert terrain.path_stats()["misses"] == 5
+    with pytest.raises(ValueError):
+        terrain.set_cost((0, 0), (1, 1), 0)
+
+
+def test_route_merges_legs_and_ends_at_the_goal():
+    terrain = Terrain(10, 10)
+    terrain.set_cost((30, 0), (99, 99), 3.0)
+    route = terrain.route((5, 5), (92, 7))
+    assert route[-1] == ((92, 7), 3.0)
+    assert [cost for _, cost in route] == [1.0, 3.0]
+    terrain.set_cost((90, 0), (99, 99), np.inf)
+    assert terrain.route((5, 5), (92, 7)) is None
+    assert terrain.route((5, 5), (7, 8)) == [((7, 8), 1.0)]
+
+
+def test_teams_walk_around_impassable_ground():
+    simulator = MilitarySimulator(seed=2)
+    terrain = Terrain(20, 20)
+    terrain.set_cost((50, 0), (59, 150), np.inf)
+    simulator.set_terrain(terrain)
+    team = simulator.create_team("Alpha")
+    simulator.create_soldier("Johnson", location=(15, 15))
+    simulator.assign_soldier_to_team("Johnson", "Alpha")
+    team.move_team((15, 15))
+    mission = simulator.create_mission("Eagle", "Recon", (95, 15))
+    route = simulator.approach_route("Alpha", "Eagle")
+    assert route[-1][0] == (95, 15)
+    assert any(point[1] > 150 for point, _ in route)
+    eta = simulator.dispatch_team("Alpha", mission.name, speed=4)
+    simulator.run_ticks(eta + 1, workers=1)
+    assert team.location == (95, 15)
+    assert simulator.global_status_report().count("Path cache hit rate") == 1
@@ -0,0 +1,59 @@
+import numpy as np
+
+from worlds import random_world
+from СonsoleRonENG import MilitarySimulator
+
+
+def world():
+    simulator = MilitarySimulator(seed=4)
+    random_world(simulator, 400, 20, 80, seed=5)
+    # Keep using the pool as missions settle
+    simulator.PARALLEL_MIN_MISSIONS = 1
+    return simulator
+
+
+def state(simulator):
+    # Event texts without their timestamps, which depend on when each world was built
+    missions = [(m.status, m.steps, m.success_rate, [o["completed"] for o in m.objectives],
+                 [event.partition(": ")[2] for event in m.events]) for m in simulator.missions]
+    table = simulator.soldier_table
+    return missions, [table.column(name) for name in ("health", "status", "rank", "experience")]
+
+
+def test_parallel_tick_matches_serial_tick():
+    serial, parallel = world(), world()
+    try:
+        for _ in range(5):
+            assert serial.tick(workers=1) == parallel.tick(workers=4)
+        assert parallel.executor_workers == 4
+        serial_missions, serial_columns = state(serial)
+        parallel_missions, parallel_columns = state(parallel)
+        assert serial_missions == parallel_missions
+        assert all(np.array_equal(a, b) for a, b in zip(serial_columns, parallel_columns))
+    finally:
+        serial.close()
+        parallel.close()
+
+
+def test_pool_is_replaced_when_the_worker_count_changes():
+    simulator = world()
+    try:
+        simulator.tick(workers=2)
+        pool = simulator.executor
+        simulator.tick(workers=2)
+        assert simulator.executor is pool
+        simulator.tick(workers=3)
+        assert simulator.executor is not pool and simulator.executor_workers == 3
+    finally:
+        simulator.close()
+    assert simulator.executor is None and simulator.executor_workers == 0
+
+
+def test_run_ticks_stops_once_every_mission_is_settled():
+    simulator = MilitarySimulator(seed=4)
+    random_world(simulator, 40, 4, 3, seed=5)
+    simulator.run_ticks(1000, workers=1)
+    assert all(mission.status not in ("Pending", "Active") for mission in simulator.missions)
+    steps = [mission.steps for mission in simulator.missions]
+    assert simulator.run_ticks(10, workers=1) == 0
+    assert [mission.steps for mission in simulator.missions] == steps
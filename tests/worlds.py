@@ -0,0 +1,57 @@
+import random
+
+from СonsoleRonENG import Rank, SoldierStatus, SoldierTable
+
+ITEMS = ("Rifle", "Ammo", "Medkit", "Radio", "Water", "Grenade")
+
+
+def random_world(simulator, soldiers, teams, missions, seed, extent=100):
+    """Add a small random world through the simulator's public methods; the same seed gives the same world.
+    
+    Soldiers get random ranks, statuses (mostly Active), skills, equipment,
+    wounds and locations; 90% of them are dealt to the teams, each led by
+    its first member, and about two thirds of the teams join a mission.
+    Names are numbered on from the entities already there.
+    """
+    rng = random.Random(seed)
+    statuses = SoldierStatus.labels()
+    status_weights = [8] + [1] * (len(statuses) - 1)
+    ranks = Rank.labels()
+    
+    roster = []
+    first = len(simulator.soldiers) + 1
+    for number in range(first, first + soldiers):
+        location = (rng.uniform(0, extent), rng.uniform(0, extent))
+        soldier = simulator.create_soldier(f"Soldier {number}", rng.choices(statuses, status_weights)[0], location,
+                                           rank=rng.choice(ranks))
+        for skill in SoldierTable.SKILLS:
+            soldier.improve_skill(skill, rng.randint(0, 5))
+        for item in rng.sample(ITEMS, 2):
+            soldier.add_equipment(item, rng.randint(1, 4))
+        if rng.random() < 0.1:
+            soldier.update_health(-rng.randint(10, 60))
+        roster.append(soldier)
+    
+    first = len(simulator.teams) + 1
+    created = [simulator.create_team(f"Team {number}") for number in range(first, first + teams)]
+    if created:
+        for soldier in roster[:int(soldiers * 0.9)]:
+            simulator.assign_soldier_to_team(soldier.name, rng.choice(created).name)
+        for team in created:
+            if team.members:
+                team.set_commander(team.members[0])
+    
+    first = len(simulator.missions) + 1
+    planned = []
+    for number in range(first, first + missions):
+        mission = simulator.create_mission(f"Mission {number}", "Patrol the sector",
+                                           (rng.uniform(0, extent), rng.uniform(0, extent)))
+        for objective in range(rng.randint(2, 4)):
+            mission.add_objective(f"Objective {objective + 1}")
+        mission.set_difficulty(rng.randint(1, 5))
+        planned.append(mission)
+    if planned:
+        for team in created:
+            if rng.random() < 2 / 3:
+                simulator.assign_team_to_mission(team.name, rng.choice(planned).name)
+    return simulator
@@ -1,54 +1,1323 @@
 import time
 import os
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import gc
+import heapq
+import itertools
+import json
+import math
 import random
+import sys
+import tracemalloc
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
 from datetime import datetime
+from enum import IntEnum
+
+import numpy as np
+
+
+class LabeledEnum(IntEnum):
+    """Small-int enum that converts to and from the display labels used everywhere else"""
+    
+    def __new__(cls, value, label):
+        member = int.__new__(cls, value)
+        member._value_ = value
+        member.label = label
+        return member
+    
+    def __str__(self):
+        return self.label
+    
+    def __format__(self, spec):
+        return format(self.label, spec)
+    
+    @classmethod
+    def parse(cls, value):
+        """Return the member for a label, code or member, or None if it is unknown"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return _ENUM_LABELS[cls].get(value)
+        try:
+            return cls(value)
+        except ValueError:
+            return None
+    
+    @classmethod
+    def labels(cls):
+        return [member.label for member in cls]
+
+
+class SoldierStatus(LabeledEnum):
+    ACTIVE = 0, "Active"
+    INJURED = 1, "Injured"
+    UNAVAILABLE = 2, "Unavailable"
+    ON_LEAVE = 3, "OnLeave"
+    MIA = 4, "MIA"
+
+
+class Rank(LabeledEnum):
+    PRIVATE = 0, "Private"
+    CORPORAL = 1, "Corporal"
+    SERGEANT = 2, "Sergeant"
+    LIEUTENANT = 3, "Lieutenant"
+    CAPTAIN = 4, "Captain"
+    MAJOR = 5, "Major"
+
+
+class MissionStatus(LabeledEnum):
+    PENDING = 0, "Pending"
+    ACTIVE = 1, "Active"
+    COMPLETED = 2, "Completed"
+    FAILED = 3, "Failed"
+    ABORTED = 4, "Aborted"
+
+
+_ENUM_LABELS = {cls: {member.label: member for member in cls} for cls in (SoldierStatus, Rank, MissionStatus)}
+
+# Experience needed to be promoted out of each rank
+RANK_THRESHOLDS = tuple(100 * (rank + 1) for rank in Rank)
+
+
+class StatusIndex:
+    """Live per-status counts and membership for one kind of entity.
+    
+    Each status keeps an insertion-ordered dict used as a set, so counts are
+    O(statuses) and members can be paged without scanning every entity.
+    """
+    __slots__ = ("enum", "members")
+    
+    def __init__(self, enum):
+        self.enum = enum
+        self.members = [{} for _ in enum]
+    
+    def add(self, entity, code):
+        self.members[code][entity] = None
+    
+    def add_many(self, entities, codes):
+        if not len(codes):
+            return
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        for start, stop in zip([0, *bounds.tolist()], [*bounds.tolist(), len(codes)]):
+            self.members[codes[start]].update(dict.fromkeys(entities[i] for i in order[start:stop].tolist()))
+    
+    def discard(self, entity, code):
+        self.members[code].pop(entity, None)
+    
+    def move(self, entity, old, new):
+        if old != new:
+            self.members[old].pop(entity, None)
+            self.members[new][entity] = None
+    
+    def count(self, status):
+        return len(self.members[self.enum.parse(status)])
+    
+    def counts(self):
+        """Status label -> number of entities, for statuses that have any"""
+        return {member.label: len(self.members[member]) for member in self.enum if self.members[member]}
+    
+    def page(self, status, start=0, size=None):
+        """Entities with a status, in the order they entered it, from start on"""
+        stop = None if size is None else start + size
+        return list(itertools.islice(self.members[self.enum.parse(status)], start, stop))
+
+
+class SpatialGrid:
+    """Uniform grid over 2-D entity locations for radius, nearest and box queries.
+    
+    Each cell holds the entities located inside it (an insertion-ordered dict
+    used as a set). Queries only visit the cells they can reach and measure
+    those candidates with NumPy. locate(entities) returns their (xs, ys)
+    coordinate arrays; where(entities), if given to a query, returns a
+    boolean mask of the entities to keep.
+    
+    A query reaching a cell of more than SPLIT_SIZE entities splits it: a
+    finer SpatialGrid over the cell's entities (see fine) lets the query
+    search a crowded place a few small cells at a time instead of measuring
+    all of it. A finer grid only stands for its cell as a query found it,
+    so any update touching the cell drops it and the next query rebuilds it.
+    """
+    CELL_SIZE = 10
+    # Occupied cells measured together once nearest() falls back to sorting cells
+    SCAN_BATCH = 16
+    # Crowded cells split into SPLIT x SPLIT finer cells, at most SPLITS times over
+    SPLIT = 4
+    SPLIT_SIZE = 256
+    SPLITS = 2
+    
+    def __init__(self, locate, cell_size=CELL_SIZE, splits=SPLITS):
+        self.locate = locate
+        self.cell_size = cell_size
+        self.splits = splits
+        self.cells = {}
+        self.fine = {}  # Crowded cell -> finer SpatialGrid over its entities, or None if they share one finer cell
+        self.size = 0
+    
+    def _cell(self, location):
+        return (int(location[0] // self.cell_size), int(location[1] // self.cell_size))
+    
+    def insert(self, entity, location):
+        self._add(entity, self._cell(location))
+    
+    def insert_many(self, entities, xs, ys):
+        """Vectorized insert() of entities at coordinate arrays xs, ys"""
+        if not len(entities):
+            return
+        cx, cy = (xs // self.cell_size).astype(np.int64), (ys // self.cell_size).astype(np.int64)
+        # Group entities by cell so each cell's dict is updated once
+        order = np.lexsort((cy, cx))
+        cx, cy = cx[order], cy[order]
+        bounds = (np.flatnonzero((np.diff(cx) != 0) | (np.diff(cy) != 0)) + 1).tolist()
+        cells = self.cells
+        for start, stop in zip([0, *bounds], [*bounds, len(order)]):
+            cell = (int(cx[start]), int(cy[start]))
+            cells.setdefault(cell, {}).update(dict.fromkeys(entities[i] for i in order[start:stop].tolist()))
+            self.fine.pop(cell, None)
+        self.size += len(entities)
+    
+    def remove(self, entity, location):
+        self._discard(entity, self._cell(location))
+    
+    def move(self, entity, old, new):
+        old_cell, new_cell = self._cell(old), self._cell(new)
+        if old_cell != new_cell:
+            self._discard(entity, old_cell)
+            self._add(entity, new_cell)
+        else:
+            self.fine.pop(old_cell, None)
+    
+    def move_many(self, entities, old_xs, old_ys, xs, ys):
+        """Vectorized move(); only entities that change cell touch the dicts"""
+        size = self.cell_size
+        old_cx, old_cy = (old_xs // size).astype(np.int64), (old_ys // size).astype(np.int64)
+        new_cx, new_cy = (xs // size).astype(np.int64), (ys // size).astype(np.int64)
+        changed = np.flatnonzero((old_cx != new_cx) | (old_cy != new_cy))
+        # Moves within a cell still shuffle its finer cells
+        self._drop_fine(old_cx, old_cy)
+        if not len(changed):
+            return
+        self._drop_fine(new_cx[changed], new_cy[changed])
+        if isinstance(entities, np.ndarray):
+            entities = entities[changed].tolist()
+        else:
+            entities = [entities[i] for i in changed.tolist()]
+        cells = self.cells
+        for entity, old, new in zip(entities, zip(old_cx[changed].tolist(), old_cy[changed].tolist()),
+                                    zip(new_cx[changed].tolist(), new_cy[changed].tolist())):
+            members = cells.get(old)
+            if members is not None and members.pop(entity, 0) is None:
+                if not members:
+                    del cells[old]
+                cells.setdefault(new, {})[entity] = None
+    
+    def _add(self, entity, cell):
+        self.cells.setdefault(cell, {})[entity] = None
+        self.size += 1
+        self.fine.pop(cell, None)
+    
+    def _discard(self, entity, cell):
+        members = self.cells.get(cell)
+        if members is not None and entity in members:
+            del members[entity]
+            self.size -= 1
+            self.fine.pop(cell, None)
+            if not members:
+                del self.cells[cell]
+    
+    def _drop_fine(self, cx, cy):
+        """Drop the finer grids of the cells given by coordinate arrays cx, cy"""
+        if not self.fine:
+            return
+        split = np.array(sorted((x << 32) + y for x, y in self.fine), dtype=np.int64)
+        keys = (cx << 32) + cy
+        hit = split[np.minimum(np.searchsorted(split, keys), len(split) - 1)] == keys
+        for cell in set(zip(cx[hit].tolist(), cy[hit].tolist())):
+            del self.fine[cell]
+    
+    def _finer(self, cell, members):
+        """The finer grid of a crowded cell a query reached, built first if need be; None for other cells"""
+        if len(members) <= self.SPLIT_SIZE or not self.splits:
+            return None
+        if cell not in self.fine:
+            entities = list(members)
+            child = SpatialGrid(self.locate, self.cell_size / self.SPLIT, self.splits - 1)
+            child.insert_many(entities, *self.locate(entities))
+            # Entities piled on one spot all land in one finer cell, which would not narrow any query
+            self.fine[cell] = child if len(child.cells) > 1 else None
+        return self.fine[cell]
+    
+    def within(self, center, radius, where=None):
+        """Entities within radius of center, nearest first"""
+        x, y = center
+        found = self._candidates((x - radius, y - radius), (x + radius, y + radius))
+        found, distances = self._measure(found, center, where)
+        keep = np.flatnonzero(distances <= radius)
+        return [found[i] for i in keep[np.argsort(distances[keep], kind="stable")]]
+    
+    def in_box(self, low, high, where=None):
+        """Entities inside the box from low (x, y) to high (x, y), edges included"""
+        found = self._candidates(low, high)
+        if where is not None and found:
+            found = [found[i] for i in np.flatnonzero(where(found))]
+        if not found:
+            return []
+        xs, ys = self.locate(found)
+        inside = (xs >= low[0]) & (xs <= high[0]) & (ys >= low[1]) & (ys <= high[1])
+        return [found[i] for i in np.flatnonzero(inside)]
+    
+    def nearest(self, center, k, where=None):
+        """Up to k entities nearest to center, nearest first"""
+        if k <= 0:
+            return []
+        found, distances = [], []
+        for members, bound in self._outward(center):
+            members, measured = self._measure(members, center, where)
+            found.extend(members)
+            distances.append(measured)
+            if len(found) >= k and np.partition(np.concatenate(distances), k - 1)[k - 1] <= bound:
+                break
+        if not found:
+            return []
+        order = np.argsort(np.concatenate(distances), kind="stable")[:k]
+        return [found[i] for i in order]
+    
+    def _measure(self, entities, center, where):
+        if where is not None and entities:
+            entities = [entities[i] for i in np.flatnonzero(where(entities))]
+        if not entities:
+            return entities, np.empty(0)
+        xs, ys = self.locate(entities)
+        return entities, np.hypot(xs - center[0], ys - center[1])
+    
+    def _candidates(self, low, high):
+        """Entities in every cell overlapping the box from low to high"""
+        (x0, y0), (x1, y1) = self._cell(low), self._cell(high)
+        found = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(self.cells):
+            cells = ((cell, self.cells.get(cell)) for cell in itertools.product(range(x0, x1 + 1), range(y0, y1 + 1)))
+        else:
+            cells = ((cell, members) for cell, members in self.cells.items()
+                     if x0 <= cell[0] <= x1 and y0 <= cell[1] <= y1)
+        for cell, members in cells:
+            if not members:
+                continue
+            # A crowded cell the box only partly covers hands over the matching part of its finer grid
+            child = None if x0 < cell[0] < x1 and y0 < cell[1] < y1 else self._finer(cell, members)
+            if child is not None:
+                found.extend(child._candidates(low, high))
+            else:
+                found.extend(members)
+        return found
+    
+    def _outward(self, center):
+        """Yield (entities, bound) batches moving away from center.
+        
+        bound is a lower bound on the distance of every entity not yet yielded.
+        Crowded cells reached are opened into a heap of their finer cells by
+        distance, which are yielded as the search moves past them.
+        """
+        cx, cy = self._cell(center)
+        opened = []  # (distance, tie, grid, cell) for the finer cells of the crowded cells reached
+        ties = itertools.count()
+        ring = 0
+        while (2 * ring + 1) ** 2 <= len(self.cells):
+            found = []
+            for cell in self._perimeter(cx, cy, ring):
+                members = self.cells.get(cell)
+                if members:
+                    child = self._finer(cell, members)
+                    if child is not None:
+                        child._open(opened, ties, center)
+                    else:
+                        found.extend(members)
+            # Cells past this ring of cells are at least ring * cell_size away
+            bound = ring * self.cell_size
+            yield found, min(bound, opened[0][0]) if opened else bound
+            yield from self._drain(opened, ties, center, bound)
+            ring += 1
+        
+        # Walking mostly empty rings would now cost more than sorting the occupied cells by distance
+        outside = [(cell, members) for cell, members in self.cells.items()
+                   if max(abs(cell[0] - cx), abs(cell[1] - cy)) >= ring]
+        if outside:
+            corners = np.array([cell for cell, members in outside], dtype=np.float64) * self.cell_size
+            point = np.asarray(center, dtype=np.float64)
+            gaps = np.maximum(np.maximum(corners - point, point - (corners + self.cell_size)), 0)
+            closest = np.hypot(gaps[:, 0], gaps[:, 1])
+            order = np.argsort(closest, kind="stable")
+            for start in range(0, len(order), self.SCAN_BATCH):
+                stop = start + self.SCAN_BATCH
+                bound = closest[order[stop]] if stop < len(order) else np.inf
+                found = []
+                for cell, members in (outside[i] for i in order[start:stop]):
+                    child = self._finer(cell, members)
+                    if child is not None:
+                        child._open(opened, ties, center)
+                    else:
+                        found.extend(members)
+                yield found, min(bound, opened[0][0]) if opened else bound
+                yield from self._drain(opened, ties, center, bound)
+        yield from self._drain(opened, ties, center, np.inf)
+    
+    def _open(self, opened, ties, center):
+        """Push every occupied cell of this (finer) grid onto the heap opened, by distance from center"""
+        size = self.cell_size
+        for cell in self.cells:
+            gap_x = max(cell[0] * size - center[0], center[0] - (cell[0] + 1) * size, 0)
+            gap_y = max(cell[1] * size - center[1], center[1] - (cell[1] + 1) * size, 0)
+            heapq.heappush(opened, (math.hypot(gap_x, gap_y), next(ties), self, cell))
+    
+    @staticmethod
+    def _drain(opened, ties, center, bound):
+        """Yield the cells on the heap opened nearer than bound, nearest first, opening crowded ones in turn"""
+        while opened and opened[0][0] < bound:
+            _, _, grid, cell = heapq.heappop(opened)
+            members = grid.cells[cell]
+            child = grid._finer(cell, members)
+            if child is not None:
+                child._open(opened, ties, center)
+                continue
+            yield list(members), min(bound, opened[0][0]) if opened else bound
+    
+    @staticmethod
+    def _perimeter(cx, cy, ring):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield (x, cy - ring)
+            yield (x, cy + ring)
+        for y in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, y)
+            yield (cx + ring, y)
+
+
+
+@contextmanager
+def _gc_paused():
+    """Hold off cyclic garbage collection while creating objects in bulk.
+    
+    Millions of new objects would otherwise trigger repeated full
+    collections over everything allocated so far.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class JournalSlot:
+    """Where _journaled methods find the WriteAheadJournal (see RonENG_journal) recording, if any"""
+    current = None
+
+
+def _journaled(method):
+    """Queue calls of a mutating method for the WriteAheadJournal recording, if any.
+    
+    Only the outermost journaled call is queued: the calls it makes in
+    turn are replayed along with it. The journal's background thread
+    encodes and writes the call.
+    """
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def journaled(self, *args, **kwargs):
+        journal = JournalSlot.current
+        if journal is None or journal.depth:
+            return method(self, *args, **kwargs)
+        journal.depth += 1
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            journal.depth -= 1
+        # Queued flat, four items a call, and a lone argument bare with None for the keywords:
+        # each object the queue holds brings the next garbage collection closer
+        if kwargs or len(args) != 1:
+            journal.pending.extend((self, name, args, kwargs))
+        else:
+            journal.pending.extend((self, name, args[0], None))
+        if journal.checkpoint_due:
+            journal.checkpoint()
+        return result
+    return journaled
+
+
+def _entity_locations(entities):
+    """SpatialGrid locate function for entities with a plain (x, y) location"""
+    coordinates = np.array([entity.location for entity in entities], dtype=np.float64).reshape(-1, 2)
+    return coordinates[:, 0], coordinates[:, 1]
+
+
+class Terrain:
+    """Grid of movement costs with A* routing and an LRU cache of computed paths.
+    
+    Each cell_size x cell_size cell has a cost per unit travelled (1 is open
+    ground, np.inf is impassable); the grid covers (0, 0) up to
+    (width, height) cells, and points outside it use the nearest edge cell.
+    Paths are cached by (start cell, goal cell, version); every cost change
+    bumps the version, so stale paths are never returned and age out.
+    """
+    CELL_SIZE = 10
+    CACHE_SIZE = 4096
+    # 8-connected moves and their lengths in cells
+    STEPS = tuple((dx, dy, (dx * dx + dy * dy) ** 0.5) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+    
+    def __init__(self, width, height, cell_size=CELL_SIZE, cost=1.0, cache_size=CACHE_SIZE):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.costs = np.full((height, width), cost, dtype=np.float64)
+        self.version = 0
+        self.cache_size = cache_size
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.compute_time = 0.0
+        self._flat = None  # Row-major cost list used by the search, rebuilt after changes
+    
+    def cell(self, location):
+        cx = min(max(int(location[0] // self.cell_size), 0), self.width - 1)
+        cy = min(max(int(location[1] // self.cell_size), 0), self.height - 1)
+        return cx, cy
+    
+    def center(self, cell):
+        return ((cell[0] + 0.5) * self.cell_size, (cell[1] + 0.5) * self.cell_size)
+    
+    def cost_at(self, location):
+        cx, cy = self.cell(location)
+        return float(self.costs[cy, cx])
+    
+    def set_cost(self, low, high, cost):
+        """Set the cost of every cell overlapping the box from low (x, y) to high (x, y)"""
+        if not cost > 0:
+            raise ValueError(f"Terrain cost must be positive: {cost}")
+        (x0, y0), (x1, y1) = self.cell(low), self.cell(high)
+        self.costs[y0:y1 + 1, x0:x1 + 1] = cost
+        self.version += 1
+        self._flat = None
+    
+    def path(self, start, goal):
+        """Cells from start's cell to goal's cell (both included), or None if goal is unreachable"""
+        key = (self.cell(start), self.cell(goal), self.version)
+        if key in self.paths:
+            self.hits += 1
+            self.paths.move_to_end(key)
+            return self.paths[key]
+        
+        self.misses += 1
+        began = time.perf_counter()
+        found = self._search(key[0], key[1])
+        self.compute_time += time.perf_counter() - began
+        self.paths[key] = found
+        if len(self.paths) > self.cache_size:
+            self.paths.popitem(last=False)
+        return found
+    
+    def route(self, start, goal):
+        """Waypoints from start to goal as [((x, y), cost)], or None if goal is unreachable.
+        
+        Cells are merged into straight legs of equal cost; each leg ends at a
+        cell center except the last, which ends exactly at goal.
+        """
+        cells = self.path(start, goal)
+        if cells is None:
+            return None
+        
+        legs = []
+        for i in range(1, len(cells)):
+            (px, py), (cx, cy) = cells[i - 1], cells[i]
+            cost = float(self.costs[cy, cx])
+            if legs and legs[-1][2] == (cx - px, cy - py) and legs[-1][1] == cost:
+                legs[-1][0] = (cx, cy)
+            else:
+                legs.append([(cx, cy), cost, (cx - px, cy - py)])
+        
+        waypoints = [(self.center(cell), cost) for cell, cost, _ in legs]
+        if waypoints:
+            waypoints[-1] = (goal, waypoints[-1][1])
+        elif tuple(start) != tuple(goal):
+            waypoints.append((goal, self.cost_at(goal)))
+        return waypoints
+    
+    def path_stats(self):
+        """Cache hits, misses, hit rate and time spent computing paths"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "compute_seconds": self.compute_time,
+            "mean_compute_ms": 1000 * self.compute_time / self.misses if self.misses else 0.0,
+            "cached_paths": len(self.paths),
+        }
+    
+    def _search(self, start, goal):
+        """A* over the 8-connected grid; moving into a cell costs its cost times the step length"""
+        width, height = self.width, self.height
+        if self._flat is None:
+            self._flat = self.costs.ravel().tolist()
+        costs = self._flat
+        start_index, goal_index = start[1] * width + start[0], goal[1] * width + goal[0]
+        if costs[goal_index] == np.inf:
+            return None
+        
+        # Octile distance times the cheapest cost never overestimates
+        cheapest = float(self.costs.min())
+        gx, gy = goal
+        
+        def estimate(x, y):
+            dx, dy = abs(x - gx), abs(y - gy)
+            return cheapest * (max(dx, dy) + (2 ** 0.5 - 1) * min(dx, dy))
+        
+        best = {start_index: 0.0}
+        came_from = {}
+        frontier = [(estimate(*start), 0.0, start_index)]
+        while frontier:
+            _, spent, index = heapq.heappop(frontier)
+            if index == goal_index:
+                cells = [goal]
+                while index in came_from:
+                    index = came_from[index]
+                    cells.append((index % width, index // width))
+                return cells[::-1]
+            if spent > best[index]:
+                continue
+            
+            x, y = index % width, index // width
+            for dx, dy, length in self.STEPS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbour = ny * width + nx
+                step = costs[neighbour]
+                if step == np.inf:
+                    continue
+                # No cutting corners between two impassable cells
+                if dx and dy and costs[y * width + nx] == np.inf and costs[ny * width + x] == np.inf:
+                    continue
+                total = spent + step * length
+                if total < best.get(neighbour, np.inf):
+                    best[neighbour] = total
+                    came_from[neighbour] = index
+                    heapq.heappush(frontier, (total + estimate(nx, ny), total, neighbour))
+        return None
+
+
+class SoldierTable:
+    """Columnar (struct-of-arrays) storage for per-soldier numeric state.
+    
+    Every Soldier owns one row; the columns can be used directly for
+    force-wide math. Column views returned by column() stay valid until
+    the table grows.
+    """
+    SKILLS = ("combat", "medical", "recon", "leadership")
+    COLUMNS = {
+        "health": np.int64,
+        "status": np.int8,
+        "rank": np.int16,
+        "x": np.float64,
+        "y": np.float64,
+        "experience": np.int64,
+        "combat": np.int32,
+        "medical": np.int32,
+        "recon": np.int32,
+        "leadership": np.int32,
+        "in_use": np.bool_,
+        # Set when a stored column, the equipment or the mission of the row's soldier changes;
+        # SQLiteSimulator writes back only these rows and clears the flag
+        "dirty": np.bool_,
+        # Movement: soldiers with a non-zero speed walk toward (target_x, target_y) every tick
+        "target_x": np.float64,
+        "target_y": np.float64,
+        "speed": np.float64,
+        "owner": object,
+    }
+    
+    def __init__(self, capacity=1024, spill=None):
+        self.capacity = max(1, capacity)
+        self.size = 0
+        for column, dtype in self.COLUMNS.items():
+            setattr(self, column, np.zeros(self.capacity, dtype=dtype))
+        
+        self.status_names = SoldierStatus.labels()
+        # Ranks are interned: the Rank enum codes come first, custom ranks are appended
+        self.rank_names = Rank.labels()
+        self.rank_codes = {rank: i for i, rank in enumerate(self.rank_names)}
+        # Live soldiers per status and per grid cell, kept by Soldier
+        self.by_status = StatusIndex(SoldierStatus)
+        self.grid = SpatialGrid(self.locate)
+        # Equipment ledger (item -> quantity) over all live soldiers, kept by Soldier
+        self.equipment = {}
+        # Row -> team whose move the moving soldier is part of
+        self.movers = {}
+        # EventSpill for soldier histories made on first use (see Soldier.attach)
+        self.spill = spill
+        # Rows given back by recycle(), handed out again by add_row
+        self.free = []
+    
+    def add_row(self, health=100, status="Active", rank="Private", location=(0, 0), owner=None):
+        if self.free:
+            row = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            row = self.size
+            self.size += 1
+        self.health[row] = health
+        self.status[row] = SoldierStatus.parse(status)
+        self.rank[row] = self.rank_code(rank)
+        self.x[row], self.y[row] = location
+        self.experience[row] = 0
+        for skill in self.SKILLS:
+            getattr(self, skill)[row] = 1
+        self.in_use[row] = True
+        self.dirty[row] = False
+        self.owner[row] = owner
+        return row
+    
+    def add_rows(self, count, **columns):
+        """Append count rows at once and return them.
+        
+        columns maps column names to arrays (or scalars) of values, status
+        and rank given as codes; missing columns get add_row's defaults.
+        """
+        if self.size + count > self.capacity:
+            self._grow(max(self.capacity * 2, self.size + count))
+        start = self.size
+        self.size += count
+        defaults = {"health": 100, "in_use": True, **dict.fromkeys(self.SKILLS, 1)}
+        for column in self.COLUMNS:
+            if column != "owner":
+                getattr(self, column)[start:self.size] = columns.get(column, defaults.get(column, 0))
+        return np.arange(start, self.size)
+    
+    def release(self, row):
+        """Mark a row as no longer belonging to a live soldier (the row is not reused)"""
+        self.in_use[row] = False
+        self.dirty[row] = False
+        self.speed[row] = 0
+        self.owner[row] = None
+    
+    def recycle(self, row):
+        """release() a row and let add_row hand it out again.
+        
+        Only for soldiers nothing refers to by row any more: soldier event
+        records use the row as entity id (see SQLiteSimulator for the one user).
+        """
+        self.release(row)
+        self.free.append(row)
+    
+    def rank_code(self, rank):
+        if isinstance(rank, Rank):
+            return rank
+        code = self.rank_codes.get(rank)
+        if code is None:
+            code = len(self.rank_names)
+            self.rank_names.append(rank)
+            self.rank_codes[rank] = code
+        return code
+    
+    def column(self, name):
+        return getattr(self, name)[:self.size]
+    
+    @staticmethod
+    def rows_of(soldiers):
+        return np.fromiter((soldier.row for soldier in soldiers), dtype=np.intp, count=len(soldiers))
+    
+    def locate(self, soldiers):
+        rows = self.rows_of(soldiers)
+        return self.x[rows], self.y[rows]
+    
+    def relocate(self, soldiers, xs, ys):
+        """Move many soldiers at once, keeping the spatial grid in step"""
+        rows = self.rows_of(soldiers)
+        xs = np.broadcast_to(np.asarray(xs, dtype=np.float64), rows.shape)
+        ys = np.broadcast_to(np.asarray(ys, dtype=np.float64), rows.shape)
+        self.grid.move_many(soldiers, self.x[rows], self.y[rows], xs, ys)
+        self.x[rows] = xs
+        self.y[rows] = ys
+        self.dirty[rows] = True
+    
+    def set_targets(self, soldiers, xs, ys, speed, mover=None):
+        """Start soldiers walking toward (xs, ys) at speed units per tick.
+        
+        Returns the movers they were previously walking for, once per soldier.
+        """
+        rows = self.rows_of(soldiers)
+        self.target_x[rows] = xs
+        self.target_y[rows] = ys
+        self.speed[rows] = speed
+        row_list = rows.tolist()
+        previous = [self.movers.pop(row) for row in row_list if row in self.movers]
+        if mover is not None:
+            self.movers.update(dict.fromkeys(row_list, mover))
+        return previous
+    
+    def advance(self, ticks=1):
+        """Move every soldier with a speed `ticks` steps toward its target; return the rows that arrived"""
+        rows = np.flatnonzero(self.column("speed"))
+        if not len(rows):
+            return rows
+        
+        x, y = self.x[rows], self.y[rows]
+        target_x, target_y = self.target_x[rows], self.target_y[rows]
+        dx, dy = target_x - x, target_y - y
+        distance = np.hypot(dx, dy)
+        step = self.speed[rows] * ticks
+        arrived = distance <= step
+        scale = step / np.where(arrived, 1.0, distance)
+        new_x = np.where(arrived, target_x, x + dx * scale)
+        new_y = np.where(arrived, target_y, y + dy * scale)
+        
+        self.grid.move_many(self.owner[rows], x, y, new_x, new_y)
+        self.x[rows] = new_x
+        self.y[rows] = new_y
+        self.dirty[rows] = True
+        done = rows[arrived]
+        self.speed[done] = 0
+        return done
+    
+    def live_rows(self):
+        return np.flatnonzero(self.column("in_use"))
+    
+    def status_counts(self):
+        """Live soldiers per status"""
+        return self.by_status.counts()
+    
+    def _grow(self, capacity):
+        for column in self.COLUMNS:
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, column, new)
+        self.capacity = capacity
+    
+    def __len__(self):
+        return int(np.count_nonzero(self.column("in_use")))
+
+
+class SkillsView(MutableMapping):
+    """Dict-like view of one soldier's skill columns"""
+    __slots__ = ("soldier",)
+    
+    def __init__(self, soldier):
+        self.soldier = soldier
+    
+    def __getitem__(self, skill):
+        if skill not in SoldierTable.SKILLS:
+            raise KeyError(skill)
+        return int(getattr(self.soldier.table, skill)[self.soldier.row])
+    
+    def __setitem__(self, skill, value):
+        if skill not in SoldierTable.SKILLS:
+            raise KeyError(skill)
+        column = getattr(self.soldier.table, skill)
+        delta = value - int(column[self.soldier.row])
+        column[self.soldier.row] = value
+        self.soldier.table.dirty[self.soldier.row] = True
+        if delta and self.soldier.teams and self.soldier.status_code == SoldierStatus.ACTIVE:
+            deltas = tuple(delta if name == skill else 0 for name in SoldierTable.SKILLS)
+            for team in self.soldier.teams:
+                team.update_totals(0, 0, deltas)
+    
+    def __delitem__(self, skill):
+        raise TypeError("Skills cannot be removed")
+    
+    def __iter__(self):
+        return iter(SoldierTable.SKILLS)
+    
+    def __len__(self):
+        return len(SoldierTable.SKILLS)
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def _tally(ledger, item, quantity):
+    """Add quantity (may be negative) of item to an equipment ledger, dropping empty entries"""
+    total = ledger.get(item, 0) + quantity
+    if total:
+        ledger[item] = total
+    else:
+        ledger.pop(item, None)
+
+
+def _tally_all(ledger, inventories):
+    """_tally() every entry of many item -> quantity dicts into ledger, summing them up first"""
+    totals = {}
+    get = totals.get
+    for inventory in inventories:
+        for item, quantity in inventory.items():
+            totals[item] = get(item, 0) + quantity
+    for item, quantity in totals.items():
+        _tally(ledger, item, quantity)
+
+
+def _coordinate(value):
+    """Return whole-number coordinates as ints so locations print as before"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class EventRecord:
+    """One log entry: integer timestamp, event-type code, entity id and format arguments.
+    
+    The text is only formatted when the record is read, and renders exactly
+    like the "<timestamp>: <prefix><description>" strings logged before.
+    """
+    __slots__ = ("timestamp", "kind", "entity", "args")
+    
+    # Prefix each kind of entity puts in front of its descriptions
+    SCOPES = {"soldier": "{} {} - ", "team": "Team {} - ", "mission": "", "simulator": ""}
+    formats = []  # event-type code -> format string
+    codes = {}  # (scope, template) -> event-type code
+    last_timestamp = 0
+    
+    def __init__(self, kind, entity, args, timestamp=None):
+        if timestamp is None:
+            # Records logged within the same second share one int object
+            timestamp = int(time.time())
+            if timestamp == EventRecord.last_timestamp:
+                timestamp = EventRecord.last_timestamp
+            else:
+                EventRecord.last_timestamp = timestamp
+        self.timestamp = timestamp
+        self.kind = kind
+        self.entity = entity
+        self.args = args
+    
+    @classmethod
+    def code(cls, scope, template):
+        """Return the event-type code for a description template, registering it on first use"""
+        key = (scope, template)
+        code = cls.codes.get(key)
+        if code is None:
+            code = len(cls.formats)
+            cls.formats.append(cls.SCOPES[scope] + template)
+            cls.codes[key] = code
+        return code
+    
+    @classmethod
+    def create(cls, scope, entity, prefix, description, args):
+        """Build a record for log_event(description, *args); without args the description is literal"""
+        if args:
+            return cls(cls.code(scope, description), entity, prefix + args)
+        return cls(cls.code(scope, "{}"), entity, prefix + (description,))
+    
+    @property
+    def text(self):
+        return self.formats[self.kind].format(*self.args)
+    
+    def __str__(self):
+        timestamp = datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{timestamp}: {self.text}"
+    
+    def __repr__(self):
+        return f"EventRecord({str(self)!r})"
+
+
+# Argument types that survive a repr()/ast.literal_eval() round trip
+_LITERAL_TYPES = (str, int, float, bool, type(None))
+_LITERAL_TYPE_SET = frozenset(_LITERAL_TYPES)
+
+
+def _literal_args(args):
+    if _LITERAL_TYPE_SET.issuperset(map(type, args)):
+        return args
+    return tuple(arg if isinstance(arg, _LITERAL_TYPES) or
+                 (isinstance(arg, tuple) and all(isinstance(a, _LITERAL_TYPES) for a in arg)) else str(arg)
+                 for arg in args)
+
+
+# Ids for teams and missions in event records (soldiers use their table row)
+_entity_ids = itertools.count(1)
+
+
+def _epoch(moment):
+    """Seconds since the epoch for a datetime; numbers and None are returned as they are"""
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return moment
+
+
+def _in_period(timestamp, start, end):
+    """Whether an entry logged at timestamp (None if it has none) falls in [start, end)"""
+    if timestamp is None:
+        return start is None and end is None
+    return (start is None or timestamp >= start) and (end is None or timestamp < end)
+
+
+class EventHistory:
+    """Fixed-capacity ring buffer of log entries that behaves like a list of the most recent ones.
+    
+    Entries are stored as given (usually EventRecords) and rendered to text
+    when read; records() returns them unrendered. Evicted entries go to the
+    spill file (if any); full() reads them back. A capacity of None keeps
+    every entry in memory.
+    """
+    __slots__ = ("capacity", "entries", "start", "total", "spill", "key")
+    
+    def __init__(self, capacity, spill=None):
+        self.capacity = capacity
+        self.entries = []
+        self.start = 0
+        self.total = 0  # Entries ever appended, including evicted ones
+        self.spill = spill
+        self.key = spill.register() if spill else None
+    
+    def append(self, entry):
+        self.total += 1
+        if self.capacity is None or len(self.entries) < self.capacity:
+            self.entries.append(entry)
+            return
+        
+        evicted = self.entries[self.start]
+        self.entries[self.start] = entry
+        self.start = (self.start + 1) % self.capacity
+        if self.spill:
+            self.spill.write(self.key, evicted)
+    
+    def full(self):
+        """Return every entry, including the ones spilled to disk"""
+        spilled = list(self.spill.read(self.key)) if self.spill else []
+        return spilled + list(self)
+    
+    def between(self, start=None, end=None):
+        """Return the entries logged in [start, end) (datetimes or epoch seconds) as text, oldest first, spilled ones included"""
+        start, end = _epoch(start), _epoch(end)
+        spilled = list(self.spill.read(self.key, start, end)) if self.spill else []
+        return spilled + [str(entry) for entry in self.records()
+                          if _in_period(getattr(entry, "timestamp", None), start, end)]
+    
+    def records(self):
+        """Return the in-memory entries oldest first, without rendering them"""
+        return self.entries[self.start:] + self.entries[:self.start]
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __iter__(self):
+        entries, start = self.entries, self.start
+        for i in range(len(entries)):
+            yield str(entries[(start + i) % len(entries)])
+    
+    def __getitem__(self, index):
+        size = len(self.entries)
+        if isinstance(index, slice):
+            return [str(self.entries[(self.start + i) % size]) for i in range(*index.indices(size))]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("history index out of range")
+        return str(self.entries[(self.start + index) % size])
+    
+    def __repr__(self):
+        return repr(list(self))
+
+
+class MessageLog:
+    """Append-only message channel: a team's chat or one soldier's private inbox.
+    
+    Entries are (timestamp, sender, message, recipient) tuples, recipient
+    being None for a message to every reader. Readers only keep positions
+    (see Subscription), so posting is one append however many soldiers
+    read the channel. Iterating renders entries like the old chat strings.
+    """
+    __slots__ = ("entries",)
+    
+    def __init__(self):
+        self.entries = []
+    
+    def post(self, sender, message, recipient=None):
+        self.entries.append((time.time(), sender, message, recipient))
+    
+    @staticmethod
+    def render(entry):
+        timestamp, sender, message, recipient = entry
+        timestamp = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        if recipient is None:
+            return f"{timestamp} - {sender}: {message}"
+        return f"{timestamp} - {sender} to {recipient.name}: {message}"
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __iter__(self):
+        return map(self.render, self.entries)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.render(entry) for entry in self.entries[index]]
+        return self.render(self.entries[index])
+
+
+class Subscription:
+    """A soldier's read cursor in one MessageLog and the spans of it they can see.
+    
+    A span is [start, stop) in log positions, stop being None while the
+    soldier is still a reader; leaving and rejoining a team opens a new span.
+    """
+    __slots__ = ("cursor", "spans")
+    
+    def __init__(self, start):
+        self.cursor = start
+        self.spans = [[start, None]]
+    
+    def entries(self, log, reader, start=0):
+        """Yield the entries of log visible to reader from position start on"""
+        entries = log.entries
+        for first, stop in self.spans:
+            for i in range(max(first, start), len(entries) if stop is None else stop):
+                entry = entries[i]
+                if entry[3] is None or entry[3] is reader:
+                    yield entry
+
 
 class Soldier:
-    RANKS = ["Private", "Corporal", "Sergeant", "Lieutenant", "Captain", "Major"]
-    STATUS_TYPES = ["Active", "Injured", "Unavailable", "OnLeave", "MIA"]
+    RANKS = Rank.labels()
+    STATUS_TYPES = SoldierStatus.labels()
+    __slots__ = ("table", "row", "name", "equipment", "mission", "channels", "inbox", "_history", "teams")
+    
+    HISTORY_CAPACITY = 50
+    
+    # Soldiers created outside a MilitarySimulator share this table
+    default_table = None
     
-    def __init__(self, name, status, location, rank="Private", health=100, equipment=None):
+    def __init__(self, name, status, location, rank="Private", health=100, equipment=None, table=None, spill=None):
+        if table is None:
+            if Soldier.default_table is None:
+                Soldier.default_table = SoldierTable()
+            table = Soldier.default_table
+        
+        self.table = table
+        self.teams = ()  # Teams this soldier is a member of (once per membership)
+        self.row = table.add_row(
+            health=health,
+            status=SoldierStatus.parse(status) or SoldierStatus.ACTIVE,
+            rank=rank,
+            location=location,
+            owner=self,
+        )
         self.name = name
-        self.status = status if status in self.STATUS_TYPES else "Active"
-        self.location = location  # (x, y) coordinates
-        self.rank = rank
-        self.health = health
+        table.by_status.add(self, table.status[self.row])
+        table.grid.insert(self, location)
         self.equipment = equipment or {}
+        for item, quantity in self.equipment.items():
+            _tally(table.equipment, item, quantity)
         self.mission = None
-        self.messages_received = []
-        self.experience = 0
-        self.skills = {"combat": 1, "medical": 1, "recon": 1, "leadership": 1}
-        self.history = []
-        self.log_event(f"Soldier created with rank {rank}")
+        # MessageLog -> Subscription for every channel read, and the private inbox once used
+        self.channels = None
+        self.inbox = None
+        self._history = EventHistory(self.HISTORY_CAPACITY, spill)
+        self.log_event("Soldier created with rank {}", rank)
+    
+    @classmethod
+    def attach(cls, table, row, name, equipment=None):
+        """Soldier view over a row filled in by SoldierTable.add_rows.
+        
+        Nothing is indexed or logged, and the history is only made once used;
+        MilitarySimulator.add_soldiers does the indexing in bulk.
+        """
+        soldier = cls.__new__(cls)
+        soldier.table = table
+        soldier.row = row
+        soldier.name = name
+        soldier.teams = ()
+        soldier.equipment = {} if equipment is None else equipment
+        soldier.mission = None
+        soldier.channels = None
+        soldier.inbox = None
+        soldier._history = None
+        table.owner[row] = soldier
+        return soldier
     
+    @property
+    def history(self):
+        if self._history is None:
+            self._history = EventHistory(self.HISTORY_CAPACITY, self.table.spill)
+        return self._history
+    
+    @property
+    def status(self):
+        return self.table.status_names[self.table.status[self.row]]
+    
+    @status.setter
+    def status(self, value):
+        code = SoldierStatus.parse(value)
+        if code is None:
+            raise ValueError(f"Unknown soldier status: {value}")
+        old_code = self.table.status[self.row]
+        was_active = old_code == SoldierStatus.ACTIVE
+        self.table.status[self.row] = code
+        self.table.dirty[self.row] = True
+        self.table.by_status.move(self, old_code, code)
+        
+        # Keep team and mission running totals of active members in step
+        if self.teams and was_active != (code == SoldierStatus.ACTIVE):
+            sign = -1 if was_active else 1
+            skills = tuple(sign * value for value in self.skills.values())
+            for team in self.teams:
+                team.update_totals(0, sign, skills)
+    
+    @property
+    def status_code(self):
+        return SoldierStatus(self.table.status[self.row])
+    
+    @property
+    def rank(self):
+        return self.table.rank_names[self.table.rank[self.row]]
+    
+    @rank.setter
+    def rank(self, value):
+        self.table.rank[self.row] = self.table.rank_code(value)
+        self.table.dirty[self.row] = True
+    
+    @property
+    def rank_code(self):
+        """Rank enum member, or the table's interned code for a custom rank"""
+        code = int(self.table.rank[self.row])
+        return Rank(code) if code < len(Rank) else code
+    
+    @property
+    def health(self):
+        return int(self.table.health[self.row])
+    
+    @health.setter
+    def health(self, value):
+        self.table.health[self.row] = value
+        self.table.dirty[self.row] = True
+    
+    @property
+    def experience(self):
+        return int(self.table.experience[self.row])
+    
+    @experience.setter
+    def experience(self, value):
+        self.table.experience[self.row] = value
+        self.table.dirty[self.row] = True
+    
+    @property
+    def location(self):
+        # (x, y) coordinates
+        return (_coordinate(self.table.x[self.row]), _coordinate(self.table.y[self.row]))
+    
+    @location.setter
+    def location(self, value):
+        table = self.table
+        table.grid.move(self, (table.x[self.row], table.y[self.row]), value)
+        table.x[self.row], table.y[self.row] = value
+        table.dirty[self.row] = True
+    
+    @property
+    def skills(self):
+        return SkillsView(self)
+    
+    @_journaled
     def update_status(self, new_status):
-        if new_status not in self.STATUS_TYPES:
+        code = SoldierStatus.parse(new_status)
+        if code is None:
             return False
             
         old_status = self.status
-        self.status = new_status
-        self.log_event(f"Status updated from {old_status} to {self.status}")
+        self.status = code
+        self.log_event("Status updated from {} to {}", old_status, self.status)
         return True
     
+    @_journaled
     def update_location(self, new_location):
         distance = self._calculate_distance(self.location, new_location)
         self.location = new_location
-        self.log_event(f"Location updated to {self.location} (moved {distance:.2f} units)")
+        self.log_event("Location updated to {} (moved {:.2f} units)", self.location, distance)
+        return True
+    
+    @_journaled
+    def move_to(self, target, speed):
+        """Start walking toward target at speed units per tick (see MilitarySimulator.advance_movement)"""
+        if speed <= 0:
+            return False
+        for team in self.table.set_targets([self], target[0], target[1], speed):
+            team.member_done()
+        self.log_event("Moving to {} at speed {}", target, speed)
         return True
     
     def send_message(self, message):
         msg = f"{self.rank} {self.name} sends: {message}"
-        self.log_event(f"Sent message: {message}")
+        self.log_event("Sent message: {}", message)
         return msg
     
     def receive_message(self, sender, message):
-        self.messages_received.append((sender, message, datetime.now()))
-        self.log_event(f"Received message from {sender}")
+        if self.inbox is None:
+            self.inbox = MessageLog()
+            self.subscribe(self.inbox)
+        self.inbox.post(sender, message)
+        self.log_event("Received message from {}", sender)
+    
+    def subscribe(self, log):
+        """Start reading a MessageLog from its current end"""
+        subscription = self._subscription(log, len(log))
+        if subscription.spans[-1][1] is not None:
+            subscription.spans.append([len(log), None])
+    
+    def unsubscribe(self, log):
+        """Stop seeing new messages in a MessageLog; the ones already posted stay readable"""
+        subscription = self._subscription(log)
+        if subscription.spans[-1][1] is None:
+            subscription.spans[-1][1] = len(log)
+    
+    def _subscription(self, log, start=0):
+        if self.channels is None:
+            self.channels = {}
+        subscription = self.channels.get(log)
+        if subscription is None:
+            subscription = self.channels[log] = Subscription(start)
+        return subscription
+    
+    def _channels(self):
+        """(log, Subscription) pairs, including chats of teams joined before the chat was made"""
+        for team in self.teams:
+            if team.chat is not None:
+                self._subscription(team.chat)
+        return list(self.channels.items()) if self.channels else []
     
+    def messages(self, unread=False):
+        """(sender, message, datetime) for every message received, oldest first.
+        
+        Built from the shared channel logs when asked for; with unread set,
+        only messages past each channel's read cursor.
+        """
+        streams = [subscription.entries(log, self, subscription.cursor if unread else 0)
+                   for log, subscription in self._channels()]
+        return [(sender, message, datetime.fromtimestamp(timestamp))
+                for timestamp, sender, message, _ in heapq.merge(*streams, key=lambda entry: entry[0])]
+    
+    @property
+    def messages_received(self):
+        return self.messages()
+    
+    def unread_count(self):
+        return sum(sum(1 for _ in subscription.entries(log, self, subscription.cursor))
+                   for log, subscription in self._channels())
+    
+    def mark_read(self):
+        """Move every read cursor to the end of its channel"""
+        for log, subscription in self._channels():
+            subscription.cursor = len(log)
+    
+    @_journaled
     def assign_mission(self, mission):
         self.mission = mission
-        self.log_event(f"Assigned to mission: {mission}")
+        self.table.dirty[self.row] = True
+        self.log_event("Assigned to mission: {}", mission)
     
+    @_journaled
     def update_health(self, amount):
         old_health = self.health
         self.health += amount
@@ -60,27 +1329,38 @@ class Soldier:
             self.status = "Injured"
             self.log_event("Injured and needs medical attention!")
         
-        self.log_event(f"Health changed from {old_health} to {self.health}")
+        self.log_event("Health changed from {} to {}", old_health, self.health)
         return self.health
     
+    @_journaled
     def add_equipment(self, item, quantity=1):
         if item in self.equipment:
             self.equipment[item] += quantity
         else:
             self.equipment[item] = quantity
-        self.log_event(f"Received {quantity} {item}")
+        self._tally_equipment(item, quantity)
+        self.log_event("Received {} {}", quantity, item)
     
+    @_journaled
     def use_equipment(self, item, quantity=1):
         if item in self.equipment and self.equipment[item] >= quantity:
             self.equipment[item] -= quantity
-            self.log_event(f"Used {quantity} {item}")
+            self._tally_equipment(item, -quantity)
+            self.log_event("Used {} {}", quantity, item)
             if self.equipment[item] == 0:
                 del self.equipment[item]
             return True
         else:
-            self.log_event(f"Not enough {item}")
+            self.log_event("Not enough {}", item)
             return False
     
+    def _tally_equipment(self, item, quantity):
+        """Mirror a change in carried equipment into the force-wide and team ledgers"""
+        _tally(self.table.equipment, item, quantity)
+        self.table.dirty[self.row] = True
+        for team in self.teams:
+            _tally(team.equipment_inventory, item, quantity)
+    
     def report_status(self):
         return {
             "name": self.name,
@@ -94,26 +1374,29 @@ class Soldier:
             "skills": self.skills
         }
     
+    @_journaled
     def gain_experience(self, amount):
         self.experience += amount
-        self.log_event(f"Gained {amount} experience points")
+        self.log_event("Gained {} experience points", amount)
         
         # Check if rank promotion is possible
-        current_rank_index = self.RANKS.index(self.rank) if self.rank in self.RANKS else 0
-        if self.experience >= 100 * (current_rank_index + 1) and current_rank_index < len(self.RANKS) - 1:
-            self.rank = self.RANKS[current_rank_index + 1]
-            self.log_event(f"Promoted to {self.rank}")
-    
+        current_rank = self.rank_code
+        if not isinstance(current_rank, Rank):
+            current_rank = Rank.PRIVATE
+        if current_rank < Rank.MAJOR and self.experience >= RANK_THRESHOLDS[current_rank]:
+            self.rank = Rank(current_rank + 1)
+            self.log_event("Promoted to {}", self.rank)
+    
+    @_journaled
     def improve_skill(self, skill_name, amount=1):
         if skill_name in self.skills:
             self.skills[skill_name] += amount
-            self.log_event(f"Improved {skill_name} skill by {amount}")
+            self.log_event("Improved {} skill by {}", skill_name, amount)
             return True
         return False
     
-    def log_event(self, description):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        event = f"{timestamp}: {self.rank} {self.name} - {description}"
+    def log_event(self, description, *args):
+        event = EventRecord.create("soldier", self.row, (self.rank, self.name), description, args)
         self.history.append(event)
         return event
     
@@ -124,86 +1407,195 @@ class Soldier:
         return f"{self.rank} {self.name} ({self.status}, Health: {self.health}%)"
 
 
+FORMATIONS = ("line", "column", "wedge", "circle")
+
+
+def formation_offsets(formation, slots, size, spacing):
+    """Offsets from the formation center, one row per roster slot, for a team of size members.
+    
+    Slot 0 (the commander or first soldier) takes the center of line, column and wedge.
+    """
+    slots = np.asarray(slots, dtype=np.float64)
+    # Line and wedge alternate right (odd slots) and left (even slots) of the center
+    side = np.where(slots % 2 == 1, 1.0, -1.0)
+    rank = (slots + 1) // 2
+    if formation == "line":
+        x, y = rank * side * spacing, np.zeros_like(slots)
+    elif formation == "column":
+        x, y = np.zeros_like(slots), -slots * spacing
+    elif formation == "wedge":
+        x, y = rank * side * spacing, -rank * spacing
+    elif formation == "circle":
+        # Neighbours stay spacing apart along the circumference
+        radius = 0.0 if size < 2 else max(spacing, size * spacing / (2 * np.pi))
+        angle = 2 * np.pi * slots / max(size, 1)
+        x, y = radius * np.cos(angle), radius * np.sin(angle)
+    else:
+        raise ValueError(f"Unknown formation: {formation}")
+    return np.column_stack((x, y))
+
+
 class Team:
-    def __init__(self, name, commander=None):
+    __slots__ = ("id", "name", "members", "commander", "mission_log", "created_date", "chat",
+                 "equipment_inventory", "location", "status", "missions", "active_count", "skill_totals",
+                 "grid", "terrain", "destination", "route", "march", "in_transit")
+    LOG_CAPACITY = 100
+    
+    def __init__(self, name, commander=None, spill=None, grid=None, terrain=None):
+        self.id = next(_entity_ids)
         self.name = name
         self.members = []
         self.commander = commander
-        self.mission_log = []
+        self.mission_log = EventHistory(self.LOG_CAPACITY, spill)
         self.created_date = datetime.now()
-        self.team_chat = []
-        self.equipment_inventory = {}
+        self.chat = None  # MessageLog read by members through their Subscriptions, made on first use
+        self.equipment_inventory = {}  # Live ledger over members' equipment
         self.location = (0, 0)
+        # SpatialGrid of the owning simulator, if any
+        self.grid = grid
+        if grid is not None:
+            grid.insert(self, self.location)
+        # Terrain walking moves are routed over, if any
+        self.terrain = terrain
+        # Set while members are still walking to the team's new location:
+        # route holds the [(waypoint, speed)] legs left, the first one being walked,
+        # and march the (formation, spacing) they are walked in
+        self.destination = None
+        self.route = ()
+        self.march = None
+        self.in_transit = 0
         self.status = "Standby"
+        # Running totals over active members, mirrored into every mission the team is on
+        self.missions = ()
+        self.active_count = 0
+        self.skill_totals = [0] * len(SoldierTable.SKILLS)  # In SoldierTable.SKILLS order
     
+    @_journaled
     def add_member(self, soldier):
         self.members.append(soldier)
-        self.log_event(f"{soldier.rank} {soldier.name} added to team")
+        soldier.teams += (self,)
+        if self.chat is not None:
+            soldier.subscribe(self.chat)
+        self._count_member(soldier, 1)
+        for item, quantity in soldier.equipment.items():
+            _tally(self.equipment_inventory, item, quantity)
+        self.log_event("{} {} added to team", soldier.rank, soldier.name)
         return True
     
+    @_journaled
+    def add_members(self, soldiers):
+        """add_member() for many soldiers at once, with one log entry for the batch"""
+        if not soldiers:
+            return 0
+        self.members.extend(soldiers)
+        for soldier in soldiers:
+            soldier.teams += (self,)
+            if self.chat is not None:
+                soldier.subscribe(self.chat)
+        _tally_all(self.equipment_inventory, (soldier.equipment for soldier in soldiers))
+        
+        table = soldiers[0].table
+        rows = table.rows_of(soldiers)
+        active = rows[table.status[rows] == SoldierStatus.ACTIVE]
+        self.update_totals(len(soldiers), len(active),
+                           tuple(int(getattr(table, skill)[active].sum()) for skill in SoldierTable.SKILLS))
+        self.log_event("{} soldiers added to team", len(soldiers))
+        return len(soldiers)
+    
+    @_journaled
     def remove_member(self, soldier):
         if soldier in self.members:
             self.members.remove(soldier)
-            self.log_event(f"{soldier.rank} {soldier.name} removed from team")
+            teams = list(soldier.teams)
+            teams.remove(self)
+            soldier.teams = tuple(teams)
+            if self.chat is not None and self not in soldier.teams:
+                soldier.unsubscribe(self.chat)
+            self._count_member(soldier, -1)
+            for item, quantity in soldier.equipment.items():
+                _tally(self.equipment_inventory, item, -quantity)
+            self.log_event("{} {} removed from team", soldier.rank, soldier.name)
             return True
         return False
     
+    def _count_member(self, soldier, sign):
+        if soldier.status_code == SoldierStatus.ACTIVE:
+            self.update_totals(sign, sign, tuple(sign * value for value in soldier.skills.values()))
+        else:
+            self.update_totals(sign, 0)
+    
+    def update_totals(self, members, active, skills=None):
+        """Apply a change in headcount, active headcount and active skill totals"""
+        self.active_count += active
+        if skills:
+            totals = self.skill_totals
+            for i, delta in enumerate(skills):
+                totals[i] += delta
+        for mission in self.missions:
+            mission.update_totals(members, active, skills)
+    
+    @property
+    def team_chat(self):
+        """The team's MessageLog; members who joined before it was made read it from the start"""
+        if self.chat is None:
+            self.chat = MessageLog()
+        return self.chat
+    
+    @_journaled
     def set_commander(self, soldier):
         if soldier in self.members:
             self.commander = soldier
-            self.log_event(f"{soldier.rank} {soldier.name} is now commander")
+            self.log_event("{} {} is now commander", soldier.rank, soldier.name)
             return True
         else:
-            self.log_event(f"{soldier.rank} {soldier.name} is not in team")
+            self.log_event("{} {} is not in team", soldier.rank, soldier.name)
             return False
     
     def team_status(self):
-        active_count = sum(1 for member in self.members if member.status == "Active")
-        injured_count = sum(1 for member in self.members if member.status == "Injured")
+        return "".join(self.team_status_lines())
+    
+    def team_status_lines(self):
+        """Yield the team status report a line at a time, so large teams stream in constant memory"""
+        self.log_event("Team status report generated")
+        yield f"\nTeam {self.name} Status Report:\n"
         
-        status_report = f"\nTeam {self.name} Status Report:\n"
-        status_report += f"Total members: {len(self.members)}, Active: {active_count}, Injured: {injured_count}\n"
+        active_count = injured_count = 0
+        for member in self.members:
+            status = member.status_code
+            active_count += status == SoldierStatus.ACTIVE
+            injured_count += status == SoldierStatus.INJURED
+        yield f"Total members: {len(self.members)}, Active: {active_count}, Injured: {injured_count}\n"
         
         if self.commander:
-            status_report += f"Commander: {self.commander.rank} {self.commander.name}\n"
+            yield f"Commander: {self.commander.rank} {self.commander.name}\n"
         
-        status_report += f"Current location: {self.location}\n"
-        status_report += f"Current status: {self.status}\n\n"
+        yield f"Current location: {self.location}\n"
+        yield f"Current status: {self.status}\n\n"
         
-        status_report += "Members:\n"
+        yield "Members:\n"
         for member in self.members:
-            status_report += f"{member.rank} {member.name}: {member.status} at {member.location}, Health: {member.health}%\n"
-        
-        self.log_event("Team status report generated")
-        return status_report
+            yield f"{member.rank} {member.name}: {member.status} at {member.location}, Health: {member.health}%\n"
     
     def broadcast_message(self, message, sender="HQ"):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        broadcast = f"{timestamp} - {sender}: {message}"
-        self.team_chat.append(broadcast)
-        
-        for member in self.members:
-            member.receive_message(sender, message)
-        
-        self.log_event(f"Message broadcast from {sender}: {message}")
+        # Members read the shared chat log, so this is one append whatever the team size
+        self.team_chat.post(sender, message)
+        self.log_event("Message broadcast from {}: {}", sender, message)
         return True
     
     def direct_message(self, sender, recipient_name, message):
         for member in self.members:
             if member.name == recipient_name:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                dm = f"{timestamp} - {sender} to {recipient_name}: {message}"
-                self.team_chat.append(dm)
-                
-                member.receive_message(sender, message)
-                self.log_event(f"Direct message from {sender} to {recipient_name}")
+                self.team_chat.post(sender, message, member)
+                member.log_event("Received message from {}", sender)
+                self.log_event("Direct message from {} to {}", sender, recipient_name)
                 return True
                 
-        self.log_event(f"Recipient {recipient_name} not found")
+        self.log_event("Recipient {} not found", recipient_name)
         return False
     
+    @_journaled
     def assign_team_mission(self, mission_description):
-        mission_id = len(self.mission_log) + 1
+        mission_id = self.mission_log.total + 1
         mission = f"Mission #{mission_id}: {mission_description}"
         
         for member in self.members:
@@ -212,56 +1604,120 @@ class Team:
         
         self.mission_log.append(mission)
         self.status = "On Mission"
-        self.log_event(f"Team assigned to {mission}")
+        self.log_event("Team assigned to {}", mission)
         return mission_id
     
-    def move_team(self, new_location, formation_spacing=5):
+    @_journaled
+    def move_team(self, new_location, formation_spacing=5, formation="line", speed=None):
+        """Move active members into formation around new_location.
+        
+        Without a speed the move is instant; with one, members walk there at
+        speed units per tick and the team takes its new location once the
+        last of them arrives. On a terrain the walk follows the cheapest
+        route, slowed down by the cost of the ground crossed.
+        """
         if not self.members:
             return False
+        if formation not in FORMATIONS or (speed is not None and speed <= 0):
+            self.log_event("Cannot move in {} formation at speed {}", formation, speed)
+            return False
         
-        self.log_event(f"Moving team to {new_location}")
+        # Members keep their roster slot in the formation, but only active members move
+        table = self.members[0].table
+        slots = np.flatnonzero(table.status[table.rows_of(self.members)] == SoldierStatus.ACTIVE)
+        movers = [self.members[i] for i in slots]
+        if movers and speed:
+            legs = [(new_location, speed)]
+            if self.terrain is not None:
+                route = self.terrain.route(self.location, new_location)
+                if route is None:
+                    self.log_event("No route to {}", new_location)
+                    return False
+                legs = [(point, speed / cost) for point, cost in route] or legs
+            self.destination = new_location
+            self.route = legs
+            self.march = (formation, formation_spacing)
+            self._walk(*legs[0], take_members=True)
+            self.log_event("Moving team to {} in {} formation at speed {} ({} members, {} legs)",
+                           new_location, formation, speed, len(movers), len(legs))
+            return True
+        if movers:
+            offsets = formation_offsets(formation, slots, len(self.members), formation_spacing)
+            table.relocate(movers, new_location[0] + offsets[:, 0], new_location[1] + offsets[:, 1])
         
-        # Create formation pattern centered around the target location
-        positions = []
-        for i, member in enumerate(self.members):
-            if member.status == "Active":
-                # Simple formation pattern
-                if i == 0:  # Commander or first soldier at center
-                    pos = new_location
-                elif i % 2 == 1:  # Positions to right
-                    offset = ((i + 1) // 2) * formation_spacing
-                    pos = (new_location[0] + offset, new_location[1])
-                else:  # Positions to left
-                    offset = (i // 2) * formation_spacing
-                    pos = (new_location[0] - offset, new_location[1])
-                
-                positions.append((member, pos))
+        # One entry for the whole move instead of one per soldier
+        self.log_event("Moving team to {} in {} formation ({} members moved)", new_location, formation, len(movers))
+        self._set_location(new_location)
+        return True
+    
+    def _walk(self, point, speed, take_members=False):
+        """Start active members walking into formation around point; returns how many walk.
         
-        # Execute movement
-        for member, pos in positions:
-            member.update_location(pos)
+        Members walking for another team are left alone unless take_members is set.
+        """
+        table = self.members[0].table
+        rows = table.rows_of(self.members)
+        walking = (table.status[rows] == SoldierStatus.ACTIVE)
+        if not take_members and table.movers:
+            walking &= np.fromiter((row not in table.movers for row in rows.tolist()), dtype=bool, count=len(rows))
+        slots = np.flatnonzero(walking)
+        if not len(slots):
+            return 0
         
-        self.location = new_location
-        return True
+        formation, spacing = self.march
+        movers = [self.members[i] for i in slots]
+        offsets = formation_offsets(formation, slots, len(self.members), spacing)
+        previous = table.set_targets(movers, point[0] + offsets[:, 0], point[1] + offsets[:, 1], speed, self)
+        self.in_transit += len(movers)
+        for team in previous:
+            team.member_done()
+        return len(movers)
+        
+    def member_done(self):
+        """A member reached, or stopped walking to, the team's current waypoint"""
+        self.in_transit -= 1
+        if self.in_transit:
+            return
+        self._set_location(self.route.pop(0)[0])
+        while self.route:
+            if self._walk(*self.route[0]):
+                return
+            self._set_location(self.route.pop(0)[0])
+        self.destination = None
+        self.march = None
+        self.log_event("Arrived at {}", self.location)
+    
+    def eta(self):
+        """Ticks until every member walking with the team has arrived (0 if none is)"""
+        if not self.in_transit:
+            return 0
+        table = self.members[0].table
+        rows = table.rows_of(self.members)
+        rows = rows[table.speed[rows] > 0]
+        remaining = np.hypot(table.target_x[rows] - table.x[rows], table.target_y[rows] - table.y[rows])
+        ticks = int(np.ceil(np.max(remaining / table.speed[rows]))) if len(rows) else 0
+        # Later legs of the route, from waypoint to waypoint
+        for (start, _), (point, speed) in zip(self.route, self.route[1:]):
+            ticks += int(np.ceil(np.hypot(point[0] - start[0], point[1] - start[1]) / speed))
+        return ticks
+    
+    def _set_location(self, location):
+        if self.grid is not None:
+            self.grid.move(self, self.location, location)
+        self.location = location
     
     def equipment_report(self):
-        report = {}
-        for member in self.members:
-            for item, quantity in member.equipment.items():
-                if item in report:
-                    report[item] += quantity
-                else:
-                    report[item] = quantity
-        
-        self.equipment_inventory = report
+        return "".join(self.equipment_report_lines())
+    
+    def equipment_report_lines(self):
+        # equipment_inventory is kept up to date as members gain and use equipment
         self.log_event("Equipment report generated")
         
-        report_str = f"\nTeam {self.name} Equipment Report:\n"
-        for item, quantity in report.items():
-            report_str += f"- {item}: {quantity}\n"
-        
-        return report_str
+        yield f"\nTeam {self.name} Equipment Report:\n"
+        for item, quantity in list(self.equipment_inventory.items()):
+            yield f"- {item}: {quantity}\n"
     
+    @_journaled
     def distribute_equipment(self, equipment_dict):
         """Distribute equipment evenly among active team members"""
         active_members = [m for m in self.members if m.status == "Active"]
@@ -281,29 +1737,29 @@ class Team:
             for i in range(remainder):
                 active_members[i].add_equipment(item, 1)
                 
-        self.log_event(f"Equipment distributed among {len(active_members)} active members")
+        self.log_event("Equipment distributed among {} active members", len(active_members))
         return True
     
     def team_skill_report(self):
         """Generate a report of team's combined skills"""
-        skills = {"combat": 0, "medical": 0, "recon": 0, "leadership": 0}
+        return "".join(self.team_skill_report_lines())
+    
+    def team_skill_report_lines(self):
+        self.log_event("Team skill report generated")
+        yield f"\nTeam {self.name} Skill Report:\n"
         
+        skills = {"combat": 0, "medical": 0, "recon": 0, "leadership": 0}
         for member in self.members:
             for skill, value in member.skills.items():
                 if skill in skills:
                     skills[skill] += value
         
-        report_str = f"\nTeam {self.name} Skill Report:\n"
         for skill, value in skills.items():
             avg = value / len(self.members) if self.members else 0
-            report_str += f"- {skill.capitalize()}: Total {value}, Avg {avg:.1f}\n"
-            
-        self.log_event("Team skill report generated")
-        return report_str
+            yield f"- {skill.capitalize()}: Total {value}, Avg {avg:.1f}\n"
     
-    def log_event(self, description):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        event = f"{timestamp}: Team {self.name} - {description}"
+    def log_event(self, description, *args):
+        event = EventRecord.create("team", self.id, (self.name,), description, args)
         self.mission_log.append(event)
         return event
     
@@ -312,43 +1768,92 @@ class Team:
 
 
 class Mission:
-    STATUS_TYPES = ["Pending", "Active", "Completed", "Failed", "Aborted"]
-    
-    def __init__(self, name, description, location, teams=None):
+    STATUS_TYPES = MissionStatus.labels()
+    __slots__ = ("id", "name", "description", "location", "teams", "status_code", "objectives", "events",
+                 "start_time", "end_time", "difficulty", "success_rate", "rewards", "seed", "steps",
+                 "member_count", "active_count", "skill_totals", "statuses")
+    EVENT_CAPACITY = 100
+    
+    def __init__(self, name, description, location, teams=None, spill=None, seed=None, statuses=None):
+        self.id = next(_entity_ids)
         self.name = name
         self.description = description
         self.location = location
-        self.teams = teams or []
-        self.status = "Pending"
+        self.teams = []
+        self.status_code = MissionStatus.PENDING
+        # StatusIndex of the owning simulator, if any
+        self.statuses = statuses
+        if statuses is not None:
+            statuses.add(self, self.status_code)
         self.objectives = []
-        self.events = []
+        self.events = EventHistory(self.EVENT_CAPACITY, spill)
         self.start_time = None
         self.end_time = None
         self.difficulty = 1  # 1-10 scale
         self.success_rate = 0
         self.rewards = {"experience": 10}
+        # Every simulation step draws from its own RNG seeded from (seed, steps)
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.steps = 0
+        # Running totals over all assigned team members (counted once per team)
+        self.member_count = 0
+        self.active_count = 0
+        self.skill_totals = [0] * len(SoldierTable.SKILLS)  # In SoldierTable.SKILLS order
+        for team in teams or []:
+            self._attach_team(team, 1)
         
-        self.log_event(f"Mission created: {name}")
+        self.log_event("Mission created: {}", name)
     
+    @_journaled
     def add_team(self, team):
-        self.teams.append(team)
-        self.log_event(f"Team {team.name} added to mission")
+        self._attach_team(team, 1)
+        self.log_event("Team {} added to mission", team.name)
         return True
     
+    @_journaled
+    def remove_team(self, team):
+        if team in self.teams:
+            self._attach_team(team, -1)
+            self.log_event("Team {} removed from mission", team.name)
+            return True
+        return False
+    
+    def _attach_team(self, team, sign):
+        if sign > 0:
+            self.teams.append(team)
+            team.missions += (self,)
+        else:
+            self.teams.remove(team)
+            missions = list(team.missions)
+            missions.remove(self)
+            team.missions = tuple(missions)
+        self.update_totals(sign * len(team.members), sign * team.active_count,
+                           tuple(sign * value for value in team.skill_totals))
+    
+    def update_totals(self, members, active, skills=None):
+        self.member_count += members
+        self.active_count += active
+        if skills:
+            totals = self.skill_totals
+            for i, delta in enumerate(skills):
+                totals[i] += delta
+    
+    @_journaled
     def add_objective(self, objective, completed=False):
         self.objectives.append({"description": objective, "completed": completed, "added": datetime.now()})
-        self.log_event(f"Objective added: {objective}")
+        self.log_event("Objective added: {}", objective)
         return True
     
+    @_journaled
     def complete_objective(self, index):
         if 0 <= index < len(self.objectives):
             self.objectives[index]["completed"] = True
             self.objectives[index]["completed_time"] = datetime.now()
-            self.log_event(f"Objective completed: {self.objectives[index]['description']}")
+            self.log_event("Objective completed: {}", self.objectives[index]['description'])
             
             # Check if all objectives completed
             if all(obj["completed"] for obj in self.objectives):
-                self.status = "Completed"
+                self._set_status(MissionStatus.COMPLETED)
                 self.end_time = datetime.now()
                 self.success_rate = 100
                 self.log_event("All objectives completed")
@@ -361,99 +1866,115 @@ class Mission:
             return True
         return False
     
-    def log_event(self, description):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        event = f"{timestamp}: {description}"
+    def log_event(self, description, *args):
+        event = EventRecord.create("mission", self.id, (), description, args)
         self.events.append(event)
         return event
     
+    @property
+    def status(self):
+        return self.status_code.label
+    
+    @status.setter
+    def status(self, value):
+        code = MissionStatus.parse(value)
+        if code is None:
+            raise ValueError(f"Unknown mission status: {value}")
+        self._set_status(code)
+    
+    def _set_status(self, code):
+        if self.statuses is not None:
+            self.statuses.move(self, self.status_code, code)
+        self.status_code = code
+    
+    @_journaled
     def update_status(self, new_status):
-        if new_status not in self.STATUS_TYPES:
+        code = MissionStatus.parse(new_status)
+        if code is None:
             return False
             
         old_status = self.status
-        self.status = new_status
+        self._set_status(code)
         
-        if new_status == "Active" and not self.start_time:
+        if code == MissionStatus.ACTIVE and not self.start_time:
             self.start_time = datetime.now()
-        elif new_status in ["Completed", "Failed", "Aborted"] and not self.end_time:
+        elif code >= MissionStatus.COMPLETED and not self.end_time:
             self.end_time = datetime.now()
             
-        self.log_event(f"Status updated from {old_status} to {self.status}")
+        self.log_event("Status updated from {} to {}", old_status, self.status)
         return True
     
+    @_journaled
     def set_difficulty(self, level):
         """Set mission difficulty on 1-10 scale"""
         if 1 <= level <= 10:
             self.difficulty = level
             self.rewards["experience"] = level * 10  # Higher difficulty, higher rewards
-            self.log_event(f"Difficulty set to {level}")
+            self.log_event("Difficulty set to {}", level)
             return True
         return False
     
+    @_journaled
     def add_reward(self, reward_type, value):
         self.rewards[reward_type] = value
-        self.log_event(f"Added reward: {reward_type} = {value}")
+        self.log_event("Added reward: {} = {}", reward_type, value)
         return True
     
     def mission_report(self):
-        completed = sum(1 for obj in self.objectives if obj["completed"])
+        return "".join(self.mission_report_lines())
+    
+    def mission_report_lines(self):
+        # Recent events are taken before this report adds its own entry
+        recent = self.events[-5:]
+        self.log_event("Mission report generated")
         
-        report = f"\nMission Report: {self.name}\n"
-        report += f"Status: {self.status}\n"
-        report += f"Location: {self.location}\n"
-        report += f"Description: {self.description}\n"
-        report += f"Difficulty: {self.difficulty}/10\n"
+        yield f"\nMission Report: {self.name}\n"
+        yield f"Status: {self.status}\n"
+        yield f"Location: {self.location}\n"
+        yield f"Description: {self.description}\n"
+        yield f"Difficulty: {self.difficulty}/10\n"
         
         if self.start_time:
-            report += f"Start time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            yield f"Start time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
         if self.end_time:
-            report += f"End time: {self.end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            yield f"End time: {self.end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
             
             if self.start_time:
                 duration = self.end_time - self.start_time
-                report += f"Duration: {duration}\n"
+                yield f"Duration: {duration}\n"
         
-        report += f"Objectives: {completed}/{len(self.objectives)} completed\n"
+        completed = sum(1 for obj in self.objectives if obj["completed"])
+        yield f"Objectives: {completed}/{len(self.objectives)} completed\n"
         
         for i, obj in enumerate(self.objectives):
             status = "✓" if obj["completed"] else "✗"
-            report += f"  {status} {i+1}. {obj['description']}\n"
+            yield f"  {status} {i+1}. {obj['description']}\n"
         
-        report += "\nTeams assigned:\n"
+        yield "\nTeams assigned:\n"
         for team in self.teams:
-            report += f"- {team.name} ({len(team.members)} members)\n"
-        
-        if self.events:
-            report += "\nRecent events:\n"
-            for event in self.events[-5:]:
-                report += f"  - {event}\n"
+            yield f"- {team.name} ({len(team.members)} members)\n"
         
-        self.log_event("Mission report generated")
-        return report
+        if recent:
+            yield "\nRecent events:\n"
+            for event in recent:
+                yield f"  - {event}\n"
     
+    @_journaled
     def calculate_success_probability(self):
         """Calculate probability of mission success based on team composition"""
-        if not self.teams or not any(team.members for team in self.teams):
+        if not self.teams or not self.member_count:
             return 0
             
-        total_members = sum(len(team.members) for team in self.teams)
-        active_members = sum(sum(1 for m in team.members if m.status == "Active") for team in self.teams)
+        total_members = self.member_count
+        active_members = self.active_count
         
         if active_members == 0:
             return 0
             
         active_ratio = active_members / total_members
         
-        # Calculate average relevant skills across all teams
-        combat = medical = recon = leadership = 0
-        for team in self.teams:
-            for member in team.members:
-                if member.status == "Active":
-                    combat += member.skills["combat"]
-                    medical += member.skills["medical"]
-                    recon += member.skills["recon"]
-                    leadership += member.skills["leadership"]
+        # Skill totals across all teams are kept up to date by update_totals
+        combat, medical, recon, leadership = self.skill_totals
         
         # Average skill level (1-10 scale)
         avg_skill = (combat + medical + recon + leadership) / (active_members * 4) if active_members > 0 else 0
@@ -463,19 +1984,117 @@ class Mission:
         probability = min(100, max(0, probability))
         
         self.success_rate = round(probability, 1)
-        self.log_event(f"Success probability calculated: {self.success_rate}%")
+        self.log_event("Success probability calculated: {}%", self.success_rate)
         return self.success_rate
     
     def __str__(self):
         return f"Mission: {self.name} ({self.status})"
 
 
+class Listing:
+    """Filtered, sorted rows over many entities, fetched and formatted only a page at a time.
+    
+    order holds the keys of the matching entities in display order
+    (positions in a list, or database ids); fetch turns a slice of them
+    into entities and render turns an entity into a row of display strings.
+    """
+    __slots__ = ("order", "fetch", "render")
+    
+    def __init__(self, order, fetch, render):
+        self.order = order
+        self.fetch = fetch
+        self.render = render
+    
+    def __len__(self):
+        return len(self.order)
+    
+    def page(self, start, size):
+        """Display rows start to start + size"""
+        return [self.render(entity) for entity in self.fetch(self.order[max(start, 0):start + size])]
+
+
+def _soldier_row(soldier):
+    return soldier.name, soldier.rank, soldier.status, f"{soldier.health}%", str(soldier.location)
+
+
+def _team_row(team):
+    return (team.name, str(len(team.members)), team.commander.name if team.commander else "None", team.status,
+            str(team.location))
+
+
+def _mission_row(mission):
+    return mission.name, mission.status, str(len(mission.teams)), f"{mission.difficulty}/10", str(mission.location)
+
+
+def _event_row(entry):
+    timestamp, separator, text = entry.partition(": ")
+    return (timestamp, text) if separator and len(timestamp) == 19 else ("", entry)
+
+
+def write_report(lines, stream=None):
+    """Write report lines to a text stream (stdout by default) as they are produced"""
+    stream = sys.stdout if stream is None else stream
+    for line in lines:
+        stream.write(line)
+    stream.flush()
+
+
+def save_report(lines, path):
+    """Write report lines to a file as they are produced and return its path"""
+    with open(path, "w", encoding="utf-8") as stream:
+        write_report(lines, stream)
+    return path
+
+
 class MilitarySimulator:
-    def __init__(self):
+    EVENT_LOG_CAPACITY = 1000
+    
+    # Worker processes used by tick(); below PARALLEL_MIN_MISSIONS it runs inline
+    TICK_WORKERS = os.cpu_count() or 1
+    PARALLEL_MIN_MISSIONS = 64
+    
+    # Soldiers listed per page in the Personnel Status report
+    PAGE_SIZE = 20
+    
+    # Columns of each listing() kind, as front-ends show them
+    LISTING_COLUMNS = {
+        "soldiers": ("Name", "Rank", "Status", "Health", "Location"),
+        "teams": ("Name", "Members", "Commander", "Status", "Location"),
+        "missions": ("Name", "Status", "Teams", "Difficulty", "Location"),
+        "events": ("Time", "Event"),
+    }
+    
+    def __init__(self, spill_path=None, seed=None, terrain=None, archive_path=None):
+        # Mission RNG seeds are drawn from here, so a fixed seed makes runs reproducible
+        self.seeds = random.Random(seed)
+        # Rolls for casualty and random events outside mission steps
+        self.event_rng = random.Random(self.seeds.getrandbits(64))
+        # OutcomeJournal receiving every roll while recording
+        self.journal = None
+        # WriteAheadJournal of mutations, for crash recovery
+        self.wal = None
+        # Process pool rolling ticks, and how many workers it was made with
+        self.executor = None
+        self.executor_workers = 0
+        # Log entries evicted from every history buffer end up in this file,
+        # or in an indexed EventArchive directory when archive_path is given
+        # (RonENG_archive builds on this module, so it is only imported here)
+        from RonENG_archive import EventArchive, EventSpill
+        self.spill = EventArchive(archive_path) if archive_path else EventSpill(spill_path)
+        self.soldier_table = SoldierTable(spill=self.spill)
         self.soldiers = []
         self.teams = []
         self.missions = []
-        self.events_log = []
+        self.mission_statuses = StatusIndex(MissionStatus)
+        self.team_grid = SpatialGrid(_entity_locations)
+        self.mission_grid = SpatialGrid(_entity_locations)
+        # Terrain that team moves are routed over (None moves in straight lines)
+        self.terrain = terrain
+        # Case-folded name -> entity, kept in sync by create/rename/remove
+        self.soldier_index = {}
+        self.team_index = {}
+        self.mission_index = {}
+        self.events_log = EventHistory(self.EVENT_LOG_CAPACITY, self.spill)
         self.equipment_database = {
             "Rifle": {"weight": 4.5, "effectiveness": 7},
             "Pistol": {"weight": 1.0, "effectiveness": 4},
@@ -490,34 +2109,171 @@ class MilitarySimulator:
         }
         self.log_event("Military Simulator initialized")
     
+    @_journaled
     def create_soldier(self, name, status="Active", location=(0, 0), rank="Private"):
-        soldier = Soldier(name, status, location, rank)
+        self._check_name(self.soldier_index, name, "Soldier")
+        soldier = Soldier(name, status, location, rank, table=self.soldier_table, spill=self.spill)
         self.soldiers.append(soldier)
-        self.log_event(f"Soldier created: {name}")
+        self.soldier_index[self._name_key(name)] = soldier
+        self.log_event("Soldier created: {}", name)
         return soldier
     
+    @_journaled
+    def add_soldiers(self, names, equipment=None, **columns):
+        """Create many soldiers straight into the SoldierTable, without a log event per soldier.
+        
+        columns are SoldierTable columns as arrays or scalars (status and rank
+        as codes, see SoldierTable.add_rows); equipment is an optional
+        sequence of per-soldier item -> quantity dicts. Returns the soldiers.
+        """
+        keys = self._check_names(self.soldier_index, names, "Soldier")
+        table = self.soldier_table
+        rows = table.add_rows(len(names), **columns)
+        with _gc_paused():
+            soldiers = [Soldier.attach(table, row, name, items)
+                        for row, name, items in zip(rows.tolist(), names, equipment or itertools.repeat(None))]
+            table.by_status.add_many(soldiers, table.status[rows])
+            table.grid.insert_many(soldiers, table.x[rows], table.y[rows])
+        if equipment:
+            _tally_all(table.equipment, (soldier.equipment for soldier in soldiers))
+        self.soldiers.extend(soldiers)
+        self.soldier_index.update(zip(keys, soldiers))
+        self.log_event("{} soldiers added", len(soldiers))
+        return soldiers
+    
+    @_journaled
     def create_team(self, name):
-        team = Team(name)
+        self._check_name(self.team_index, name, "Team")
+        team = Team(name, spill=self.spill, grid=self.team_grid, terrain=self.terrain)
         self.teams.append(team)
-        self.log_event(f"Team created: {name}")
+        self.team_index[self._name_key(name)] = team
+        self.log_event("Team created: {}", name)
         return team
     
+    @_journaled
     def create_mission(self, name, description, location):
-        mission = Mission(name, description, location)
+        self._check_name(self.mission_index, name, "Mission")
+        mission = Mission(name, description, location, spill=self.spill, seed=self.seeds.getrandbits(64),
+                          statuses=self.mission_statuses)
         self.missions.append(mission)
-        self.log_event(f"Mission created: {name}")
+        self.mission_grid.insert(mission, mission.location)
+        self.mission_index[self._name_key(name)] = mission
+        self.log_event("Mission created: {}", name)
         return mission
     
+    @_journaled
+    def add_teams(self, names):
+        """create_team() for many names at once, with one log event for the batch. Returns the teams."""
+        keys = self._check_names(self.team_index, names, "Team")
+        teams = [Team(name, spill=self.spill, grid=self.team_grid, terrain=self.terrain) for name in names]
+        self.teams.extend(teams)
+        self.team_index.update(zip(keys, teams))
+        self.log_event("{} teams added", len(teams))
+        return teams
+    
+    @_journaled
+    def add_missions(self, names, descriptions, locations):
+        """create_mission() for many missions at once, with one log event for the batch. Returns the missions."""
+        keys = self._check_names(self.mission_index, names, "Mission")
+        missions = [Mission(name, description, tuple(location), spill=self.spill, seed=self.seeds.getrandbits(64),
+                            statuses=self.mission_statuses)
+                    for name, description, location in zip(names, descriptions, locations)]
+        self.missions.extend(missions)
+        for mission in missions:
+            self.mission_grid.insert(mission, mission.location)
+        self.mission_index.update(zip(keys, missions))
+        self.log_event("{} missions added", len(missions))
+        return missions
+    
+    @_journaled
+    def rename_soldier(self, name, new_name):
+        return self._rename(self.soldier_index, name, new_name, "Soldier")
+    
+    @_journaled
+    def rename_team(self, name, new_name):
+        return self._rename(self.team_index, name, new_name, "Team")
+    
+    @_journaled
+    def rename_mission(self, name, new_name):
+        return self._rename(self.mission_index, name, new_name, "Mission")
+    
+    @_journaled
+    def remove_soldier(self, name):
+        self._commit_journal()
+        soldier = self.soldier_index.pop(self._name_key(name), None)
+        if not soldier:
+            return False
+        
+        self.soldiers.remove(soldier)
+        self.soldier_table.release(soldier.row)
+        team = self.soldier_table.movers.pop(soldier.row, None)
+        if team is not None:
+            team.member_done()
+        self.soldier_table.by_status.discard(soldier, soldier.status_code)
+        self.soldier_table.grid.remove(soldier, soldier.location)
+        for item, quantity in soldier.equipment.items():
+            _tally(self.soldier_table.equipment, item, -quantity)
+        for team in self.teams:
+            while team.remove_member(soldier):
+                pass
+            if team.commander is soldier:
+                team.commander = None
+        self.log_event("Soldier removed: {}", soldier.name)
+        return True
+    
+    @_journaled
+    def remove_team(self, name):
+        self._commit_journal()
+        team = self.team_index.pop(self._name_key(name), None)
+        if not team:
+            return False
+        
+        self.teams.remove(team)
+        self.team_grid.remove(team, team.location)
+        for mission in self.missions:
+            while mission.remove_team(team):
+                pass
+        self._detach_members(team, team.members)
+        self.log_event("Team removed: {}", team.name)
+        return True
+    
+    def _detach_members(self, team, soldiers):
+        """Take a removed team out of its members' teams, so their later changes no longer reach it"""
+        movers = self.soldier_table.movers
+        for soldier in soldiers:
+            teams = list(soldier.teams)
+            teams.remove(team)
+            soldier.teams = tuple(teams)
+            if team.chat is not None and team not in soldier.teams:
+                soldier.unsubscribe(team.chat)
+            if movers.get(soldier.row) is team:
+                del movers[soldier.row]
+    
+    @_journaled
+    def remove_mission(self, name):
+        self._commit_journal()
+        mission = self.mission_index.pop(self._name_key(name), None)
+        if not mission:
+            return False
+        
+        self.missions.remove(mission)
+        self.mission_statuses.discard(mission, mission.status_code)
+        self.mission_grid.remove(mission, mission.location)
+        self.log_event("Mission removed: {}", mission.name)
+        return True
+    
+    @_journaled
     def assign_soldier_to_team(self, soldier_name, team_name):
         soldier = self.find_soldier(soldier_name)
         team = self.find_team(team_name)
         
         if soldier and team:
             team.add_member(soldier)
-            self.log_event(f"{soldier.name} assigned to team {team.name}")
+            self.log_event("{} assigned to team {}", soldier.name, team.name)
             return True
         return False
     
+    @_journaled
     def assign_team_to_mission(self, team_name, mission_name):
         team = self.find_team(team_name)
         mission = self.find_mission(mission_name)
@@ -525,71 +2281,228 @@ class MilitarySimulator:
         if team and mission:
             mission.add_team(team)
             team.assign_team_mission(mission.name)
-            self.log_event(f"Team {team.name} assigned to mission {mission.name}")
+            self.log_event("Team {} assigned to mission {}", team.name, mission.name)
             return True
         return False
     
+    @property
+    def soldier_statuses(self):
+        """StatusIndex of live soldiers"""
+        return self.soldier_table.by_status
+    
+    def soldiers_near(self, location, radius, status=None):
+        """Soldiers within radius of location, nearest first, optionally only those with a status"""
+        return self.soldier_table.grid.within(location, radius, self._status_filter(status))
+    
+    def nearest_soldiers(self, location, count, status=None):
+        """Up to count soldiers nearest to location, optionally only those with a status"""
+        return self.soldier_table.grid.nearest(location, count, self._status_filter(status))
+    
+    def soldiers_in_area(self, low, high, status=None):
+        """Soldiers inside the box from low (x, y) to high (x, y)"""
+        return self.soldier_table.grid.in_box(low, high, self._status_filter(status))
+    
+    def _status_filter(self, status):
+        if status is None:
+            return None
+        code = SoldierStatus.parse(status)
+        if code is None:
+            raise ValueError(f"Unknown soldier status: {status}")
+        table = self.soldier_table
+        return lambda soldiers: table.status[table.rows_of(soldiers)] == code
+    
+    @property
+    def equipment_totals(self):
+        """Force-wide equipment ledger (item -> quantity), kept live by the soldiers"""
+        return self.soldier_table.equipment
+    
     def find_soldier(self, name):
-        for soldier in self.soldiers:
-            if soldier.name.lower() == name.lower():
-                return soldier
-        return None
+        return self.soldier_index.get(self._name_key(name))
     
     def find_team(self, name):
-        for team in self.teams:
-            if team.name.lower() == name.lower():
-                return team
-        return None
+        return self.team_index.get(self._name_key(name))
     
     def find_mission(self, name):
-        for mission in self.missions:
-            if mission.name.lower() == name.lower():
-                return mission
+        return self.mission_index.get(self._name_key(name))
+    
+    def entity_events(self, name, start=None, end=None):
+        """Log entries of the soldier, team or mission called name (looked up in that order), oldest first.
+        
+        start and end (datetimes or epoch seconds) limit them to [start, end);
+        spilled entries are included. Returns None if nothing has that name.
+        """
+        for find, log in ((self.find_soldier, "history"), (self.find_team, "mission_log"), (self.find_mission, "events")):
+            entity = find(name)
+            if entity is not None:
+                return getattr(entity, log).between(start, end)
         return None
     
-    def log_event(self, description):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        event = f"{timestamp}: {description}"
+    def listing(self, kind, sort=None, descending=False, text="", status=None):
+        """Listing of "soldiers", "teams", "missions" or "events" for list views.
+        
+        sort is one of the kind's LISTING_COLUMNS in lower case; text keeps
+        entries whose name (an event's text) contains it, ignoring case, and
+        status keeps soldiers, teams or missions with that status. Only the
+        order is worked out here: rows are fetched and formatted a page at a
+        time, so this stays cheap with a million soldiers.
+        """
+        columns = self.LISTING_COLUMNS.get(kind)
+        if columns is None:
+            raise ValueError(f"Unknown listing: {kind}")
+        if sort is not None and sort not in (column.lower() for column in columns):
+            raise ValueError(f"Cannot sort {kind} by {sort}")
+        build = {"soldiers": self._soldier_listing, "teams": self._team_listing,
+                 "missions": self._mission_listing, "events": self._event_listing}[kind]
+        return build(sort, descending, text.casefold(), status)
+    
+    def _soldier_listing(self, sort, descending, text, status):
+        soldiers = self.soldiers
+        table = self.soldier_table
+        rows = table.rows_of(soldiers)
+        keep = np.ones(len(rows), dtype=bool)
+        if status is not None:
+            keep &= self._status_filter(status)(soldiers)
+        if text:
+            keep &= np.fromiter((text in soldier.name.casefold() for soldier in soldiers), dtype=bool, count=len(soldiers))
+        order = np.flatnonzero(keep)
+        
+        if sort == "name":
+            order = order[np.argsort(np.array([soldiers[i].name.casefold() for i in order.tolist()]), kind="stable")]
+        elif sort == "location":
+            order = order[np.lexsort((table.y[rows[order]], table.x[rows[order]]))]
+        elif sort is not None:
+            # Rank codes follow seniority (custom ranks last), status codes the SoldierStatus order
+            order = order[np.argsort(getattr(table, sort)[rows[order]], kind="stable")]
+        if descending:
+            order = order[::-1]
+        return Listing(order, lambda positions: [soldiers[i] for i in positions.tolist()], _soldier_row)
+    
+    def _team_listing(self, sort, descending, text, status):
+        keys = {"name": lambda team: team.name.casefold(), "members": lambda team: len(team.members),
+                "commander": lambda team: team.commander.name.casefold() if team.commander else "",
+                "status": lambda team: team.status, "location": lambda team: team.location}
+        return self._entity_listing(self.teams, keys.get(sort), descending, text, status, _team_row)
+    
+    def _mission_listing(self, sort, descending, text, status):
+        if status is not None:
+            code = MissionStatus.parse(status)
+            if code is None:
+                raise ValueError(f"Unknown mission status: {status}")
+            status = code.label
+        keys = {"name": lambda mission: mission.name.casefold(), "status": lambda mission: mission.status_code,
+                "teams": lambda mission: len(mission.teams), "difficulty": lambda mission: mission.difficulty,
+                "location": lambda mission: mission.location}
+        return self._entity_listing(self.missions, keys.get(sort), descending, text, status, _mission_row)
+    
+    @staticmethod
+    def _entity_listing(entities, key, descending, text, status, render):
+        order = [i for i, entity in enumerate(entities)
+                 if text in entity.name.casefold() and (status is None or entity.status == status)]
+        if key is not None:
+            order.sort(key=lambda i: key(entities[i]))
+        if descending:
+            order.reverse()
+        return Listing(order, lambda positions: [entities[i] for i in positions], render)
+    
+    def _event_listing(self, sort, descending, text, status):
+        # Entries are kept in time order already, so only sorting by text needs to read them
+        events = self.events_log
+        if text or sort == "event":
+            entries = [(i, _event_row(entry)[1].casefold()) for i, entry in enumerate(events)]
+            order = [i for i, entry in entries if text in entry]
+            if sort == "event":
+                texts = dict(entries)
+                order.sort(key=texts.__getitem__)
+        else:
+            order = range(len(events))
+        if descending:
+            order = order[::-1]
+        return Listing(order, lambda positions: [events[i] for i in positions], _event_row)
+    
+    @staticmethod
+    def _name_key(name):
+        return name.casefold()
+    
+    def _check_name(self, index, name, kind):
+        """Reject names that collide case-insensitively with an existing entity"""
+        if self._name_key(name) in index:
+            raise ValueError(f"{kind} '{name}' already exists")
+    
+    def _check_names(self, index, names, kind):
+        """_check_name() for a batch, also rejecting names repeated within it; returns their name keys"""
+        keys = [self._name_key(name) for name in names]
+        taken = next((name for key, name in zip(keys, names) if key in index), None)
+        if taken is None and len(set(keys)) < len(keys):
+            seen = set()
+            taken = next(name for key, name in zip(keys, names) if key in seen or seen.add(key))
+        if taken is not None:
+            raise ValueError(f"{kind} '{taken}' already exists")
+        return keys
+    
+    def _rename(self, index, name, new_name, kind):
+        entity = index.get(self._name_key(name))
+        if not entity:
+            return None
+        
+        new_key = self._name_key(new_name)
+        if new_key != self._name_key(name):
+            self._check_name(index, new_name, kind)
+        
+        self._commit_journal()
+        old_name = entity.name
+        del index[self._name_key(old_name)]
+        entity.name = new_name
+        index[new_key] = entity
+        entity.log_event("Renamed from {} to {}", old_name, new_name)
+        self.log_event("{} renamed: {} -> {}", kind, old_name, new_name)
+        return entity
+    
+    def log_event(self, description, *args):
+        event = EventRecord.create("simulator", 0, (), description, args)
         self.events_log.append(event)
         return event
     
+    def close(self):
+        """Stop journaling, close the spill file (a temporary one is deleted) and stop tick workers"""
+        self.stop_journal()
+        self.spill.close()
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
+            self.executor_workers = 0
+    
     def global_status_report(self):
-        report = "\n===== GLOBAL STATUS REPORT =====\n"
+        return "".join(self.global_status_report_lines())
+    
+    def global_status_report_lines(self):
+        yield "\n===== GLOBAL STATUS REPORT =====\n"
         
-        report += f"Total personnel: {len(self.soldiers)}\n"
-        report += f"Active teams: {len(self.teams)}\n"
-        report += f"Missions: {len(self.missions)}\n\n"
+        yield f"Total personnel: {len(self.soldiers)}\n"
+        yield f"Active teams: {len(self.teams)}\n"
+        yield f"Missions: {len(self.missions)}\n\n"
         
-        status_counts = {}
-        for soldier in self.soldiers:
-            if soldier.status in status_counts:
-                status_counts[soldier.status] += 1
-            else:
-                status_counts[soldier.status] = 1
-                
-        report += "Personnel status:\n"
-        for status, count in status_counts.items():
-            report += f"- {status}: {count}\n"
+        yield "Personnel status:\n"
+        for status, count in self.soldier_statuses.counts().items():
+            yield f"- {status}: {count}\n"
         
-        mission_status = {}
-        for mission in self.missions:
-            if mission.status in mission_status:
-                mission_status[mission.status] += 1
-            else:
-                mission_status[mission.status] = 1
-                
-        report += "\nMission status:\n"
-        for status, count in mission_status.items():
-            report += f"- {status}: {count}\n"
+        yield "\nMission status:\n"
+        for status, count in self.mission_statuses.counts().items():
+            yield f"- {status}: {count}\n"
         
-        return report
+        if self.terrain is not None:
+            stats = self.terrain.path_stats()
+            yield "\nRoute planning:\n"
+            yield f"- Path cache hit rate: {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses)\n"
+            yield f"- Path computation: {stats['compute_seconds']:.3f}s total, {stats['mean_compute_ms']:.2f} ms per path\n"
     
+    @_journaled
     def distribute_equipment(self, team_name, equipment_dict):
         team = self.find_team(team_name)
         if team:
             return team.distribute_equipment(equipment_dict)
         return False
     
+    @_journaled
     def simulate_mission_progress(self, mission_name, success_chance=None):
         """Simulate mission progress automatically"""
         mission = self.find_mission(mission_name)
@@ -599,6 +2512,104 @@ class MilitarySimulator:
         if mission.status not in ["Pending", "Active"]:
             return False
             
+        state = self._begin_mission_step(mission, success_chance)
+        return self._finish_mission_step(mission, plan_mission_step(state), state[1] if success_chance is None else None)
+    
+    @_journaled
+    def tick(self, workers=None):
+        """Advance every Pending or Active mission by one simulate_mission_progress step.
+        
+        The random rolls for independent missions are made in a process pool
+        (each mission has its own seeded RNG stream, so results do not depend
+        on how missions are split across workers) and then merged back into
+        the missions, teams and soldiers in mission order. Moving soldiers and
+        teams take one step first. Returns the number of missions advanced.
+        """
+        self.advance_movement()
+        missions = [m for m in self.missions if m.status in ["Pending", "Active"]]
+        states = [self._begin_mission_step(mission) for mission in missions]
+        
+        workers = workers or self.TICK_WORKERS
+        if workers > 1 and len(states) >= self.PARALLEL_MIN_MISSIONS:
+            if self.executor is None or self.executor_workers != workers:
+                if self.executor:
+                    self.executor.shutdown()
+                self.executor = ProcessPoolExecutor(max_workers=workers)
+                self.executor_workers = workers
+            chunk = -(-len(states) // (workers * 4))
+            chunks = [states[i:i + chunk] for i in range(0, len(states), chunk)]
+            plans = [plan for plans in self.executor.map(plan_mission_steps, chunks) for plan in plans]
+        else:
+            plans = plan_mission_steps(states)
+        
+        for mission, state, plan in zip(missions, states, plans):
+            self._finish_mission_step(mission, plan, state[1])
+        return len(missions)
+    
+    def run_ticks(self, ticks=1, workers=None):
+        """Run up to `ticks` ticks, stopping early once no mission is left to advance and nobody is moving"""
+        advanced = 0
+        for _ in range(ticks):
+            count = self.tick(workers)
+            if not count and not self.in_transit():
+                break
+            advanced += count
+        return advanced
+    
+    @_journaled
+    def advance_movement(self, ticks=1):
+        """Walk every moving soldier `ticks` steps in one vectorized update.
+        
+        Teams whose last walking member arrives take their destination as
+        their location. Returns the number of soldiers that arrived.
+        """
+        table = self.soldier_table
+        arrived = table.advance(ticks)
+        for row in arrived.tolist():
+            team = table.movers.pop(row, None)
+            if team is not None:
+                team.member_done()
+        return len(arrived)
+    
+    def in_transit(self):
+        """Number of soldiers still walking to a target"""
+        return int(np.count_nonzero(self.soldier_table.column("speed")))
+    
+    @_journaled
+    def dispatch_team(self, team_name, mission_name, speed, formation="line"):
+        """Send a team walking to a mission's location; returns the ticks until it arrives, or None"""
+        team = self.find_team(team_name)
+        mission = self.find_mission(mission_name)
+        if not team or not mission or not team.move_team(mission.location, formation=formation, speed=speed):
+            return None
+        
+        eta = team.eta()
+        self.log_event("Team {} dispatched to mission {} (arrives in {} ticks)", team.name, mission.name, eta)
+        return eta
+    
+    @_journaled
+    def set_terrain(self, terrain):
+        """Route every team's walking moves over terrain from now on (None for straight lines)"""
+        self.terrain = terrain
+        for team in self.teams:
+            team.terrain = terrain
+        self.log_event("Terrain set to {}", f"{terrain.width}x{terrain.height} cells" if terrain else "none")
+    
+    def approach_route(self, team_name, mission_name):
+        """Waypoints [((x, y), cost)] from a team's location to a mission's, or None.
+        
+        Without a terrain the route is the straight line to the mission.
+        """
+        team = self.find_team(team_name)
+        mission = self.find_mission(mission_name)
+        if not team or not mission:
+            return None
+        if self.terrain is None:
+            return [(mission.location, 1.0)]
+        return self.terrain.route(team.location, mission.location)
+    
+    def _begin_mission_step(self, mission, success_chance=None):
+        """Start a pending mission and snapshot what plan_mission_step needs to roll one step"""
         # Start mission if pending
         if mission.status == "Pending":
             mission.update_status("Active")
@@ -607,43 +2618,462 @@ class MilitarySimulator:
         if success_chance is None:
             success_chance = mission.calculate_success_probability()
             
-        # Process each objective
-        for i, objective in enumerate(mission.objectives):
-            if not objective["completed"]:
-                # Random chance to complete objective based on success probability
-                if random.random() * 100 < success_chance:
-                    mission.complete_objective(i)
+        objective_index = next((i for i, obj in enumerate(mission.objectives) if not obj["completed"]), None)
+        step_seed = (mission.seed << 32) | mission.steps
+        mission.steps += 1
                     
-                    # Random events during mission
-                    if random.random() < 0.3:  # 30% chance of random event
-                        events = [
-                            "encountered light resistance",
-                            "found valuable intelligence",
-                            "had to find alternate route",
-                            "equipment malfunction occurred",
-                            "weather conditions worsened"
-                        ]
-                        mission.log_event(f"Random event: {random.choice(events)}")
+        # A soldier can sit in several of the mission's teams; their slots share one entry
+        soldiers, slots, positions = [], [], {}
+        for team in mission.teams:
+            for member in team.members:
+                if id(member) not in positions:
+                    positions[id(member)] = len(soldiers)
+                    soldiers.append(member)
+                slots.append(positions[id(member)])
+        return (step_seed, success_chance, objective_index, slots,
+                [member.status == "Active" for member in soldiers], [member.health for member in soldiers])
                     
-                    # Random injuries
-                    if random.random() < 0.2:  # 20% chance of injury
-                        for team in mission.teams:
-                            for member in team.members:
-                                if member.status == "Active" and random.random() < 0.1:
-                                    damage = random.randint(5, 25)
-                                    member.update_health(-damage)
-                                    mission.log_event(f"{member.name} took {damage} damage")
-                else:
-                    # Objective failed
-                    mission.log_event(f"Failed to complete objective: {objective['description']}")
-                    if random.random() < 0.3:  # 30% chance of mission failure on objective failure
-                        mission.update_status("Failed")
-                        return mission.status
+    def _finish_mission_step(self, mission, plan, success_rate=None):
+        """Apply the outcome rolled by plan_mission_step to the mission and its soldiers.
+        
+        success_rate is the probability calculated for the step, if any; it
+        is only needed to journal the step.
+        """
+        if self.journal is not None:
+            self.journal.append(("step", mission.name, success_rate, plan))
+        if plan is None:
+            return mission.status
                         
-                break  # Process one objective at a time
+        objective_index, success, event, injuries, failed = plan
+        if success:
+            mission.complete_objective(objective_index)
+            
+            if event:
+                mission.log_event("Random event: {}", event)
+            
+            if injuries:
+                members = [member for team in mission.teams for member in team.members]
+                for slot, damage in injuries:
+                    member = members[slot]
+                    member.update_health(-damage)
+                    mission.log_event("{} took {} damage", member.name, damage)
+        else:
+            # Objective failed
+            mission.log_event("Failed to complete objective: {}", mission.objectives[objective_index]['description'])
+            if failed:
+                mission.update_status("Failed")
                 
         return mission.status
     
+    @_journaled
+    def generate_casualty_event(self, team_name):
+        """Injure a random active member of a team; returns (soldier, damage) or None"""
+        team = self.find_team(team_name)
+        if not team:
+            return None
+        
+        active_members = [m for m in team.members if m.status == "Active"]
+        if not active_members:
+            return None
+        
+        victim = self.event_rng.choice(active_members)
+        damage = self.event_rng.randint(10, 50)
+        if self.journal is not None:
+            self.journal.append(("casualty", team.name, victim.name, damage))
+        self._apply_casualty(team, victim, damage)
+        return victim, damage
+    
+    @_journaled
+    def generate_random_event(self, mission_name):
+        """Log a random field event on a mission and return it"""
+        mission = self.find_mission(mission_name)
+        if not mission:
+            return None
+        
+        event = self.event_rng.choice(FIELD_EVENTS)
+        if self.journal is not None:
+            self.journal.append(("random_event", mission.name, event))
+        mission.log_event("Random event: {}", event)
+        return event
+    
+    def _apply_casualty(self, team, victim, damage):
+        victim.update_health(-damage)
+        team.log_event("Casualty event: {} took {} damage", victim.name, damage)
+    
+    def start_journal(self, directory, **options):
+        """Journal every mutation to directory from now on, for recover() (see WriteAheadJournal)"""
+        # RonENG_journal builds on this module, so it is only imported here
+        from RonENG_journal import WriteAheadJournal
+        self.wal = WriteAheadJournal(self, directory, **options)
+        self.wal.start()
+        self.log_event("Journaling to {}", directory)
+        return self.wal
+    
+    def _commit_journal(self):
+        # Queued journal calls name entities as they are when written: write them before a rename or removal
+        if self.wal:
+            self.wal.commit()
+    
+    def stop_journal(self):
+        wal, self.wal = self.wal, None
+        if wal:
+            wal.stop()
+        return wal
+    
+    @classmethod
+    def recover(cls, directory, spill_path=None, **options):
+        """Rebuild a simulator from a journal directory after a crash, and keep journaling there.
+        
+        The newest checkpoint is loaded and the journal records after it
+        replayed, up to the first one a crash left incomplete.
+        """
+        from RonENG_journal import WriteAheadJournal
+        simulator, sequence, replayed = WriteAheadJournal.restore(cls, directory, spill_path)
+        simulator.wal = WriteAheadJournal(simulator, directory, **options)
+        simulator.wal.sequence = sequence
+        simulator.wal.start()
+        simulator.log_event("Recovered from {} ({} journal records replayed)", directory, replayed)
+        return simulator
+    
+    def start_recording(self):
+        """Journal every random outcome from now on and return the journal"""
+        self.journal = OutcomeJournal()
+        return self.journal
+    
+    def stop_recording(self):
+        journal, self.journal = self.journal, None
+        return journal
+    
+    @_journaled
+    def replay(self, journal, stop=None):
+        """Re-apply a recorded journal (optionally only its first `stop` entries).
+        
+        The simulator must start from the same world the recording started
+        from. Nothing is re-rolled or recalculated: success probabilities
+        are taken from the journal and every outcome is applied directly.
+        Returns the number of entries applied.
+        """
+        entries = journal.entries if isinstance(journal, OutcomeJournal) else list(journal)
+        if stop is not None:
+            entries = entries[:stop]
+        
+        for entry in entries:
+            kind = entry[0]
+            if kind == "step":
+                _, mission_name, success_rate, plan = entry
+                mission = self.find_mission(mission_name)
+                if mission.status == "Pending":
+                    mission.update_status("Active")
+                if success_rate is not None:
+                    mission.success_rate = success_rate
+                    mission.log_event("Success probability calculated: {}%", success_rate)
+                mission.steps += 1
+                self._finish_mission_step(mission, plan)
+            elif kind == "casualty":
+                _, team_name, soldier_name, damage = entry
+                self._apply_casualty(self.find_team(team_name), self.find_soldier(soldier_name), damage)
+            elif kind == "random_event":
+                _, mission_name, event = entry
+                self.find_mission(mission_name).log_event("Random event: {}", event)
+            else:
+                raise ValueError(f"Unknown journal entry: {kind}")
+        return len(entries)
+    
+    def save_snapshot(self, path):
+        """Write the whole world to path in a compact binary format (see load_snapshot).
+        
+        Soldiers are written as SoldierTable columns, names as one packed
+        blob, and ranks, equipment items and assignments are interned.
+        Teams and missions refer to soldiers and teams by position, so shared
+        references survive the round trip. Event logs, messages and the
+        outcome journal are not saved.
+        """
+        sections = self.snapshot_sections()
+        write_snapshot(path, sections)
+        self.log_event("Snapshot saved to {} ({} soldiers)", path, len(self.soldiers))
+        return path
+    
+    def snapshot_sections(self):
+        """The arrays save_snapshot writes, in order, copied out of the world.
+        
+        Nothing returned shares memory with the simulator, so the sections
+        can be written by another thread while the world keeps changing.
+        """
+        table = self.soldier_table
+        soldiers = self.soldiers
+        rows = table.rows_of(soldiers)
+        # Table row -> position in self.soldiers
+        position = np.full(table.size, -1, dtype=np.int32)
+        position[rows] = np.arange(len(rows))
+        team_position = {team: i for i, team in enumerate(self.teams)}
+        
+        assignments = {}
+        assignment_codes = np.fromiter((-1 if soldier.mission is None else
+                                        assignments.setdefault(str(soldier.mission), len(assignments))
+                                        for soldier in soldiers), dtype=np.int32, count=len(soldiers))
+        items = {}
+        item_counts = np.fromiter((len(soldier.equipment) for soldier in soldiers), dtype=np.int32, count=len(soldiers))
+        carried = int(item_counts.sum())
+        item_codes = np.fromiter((items.setdefault(item, len(items)) for soldier in soldiers for item in soldier.equipment),
+                                 dtype=np.int32, count=carried)
+        quantities = np.fromiter((quantity for soldier in soldiers for quantity in soldier.equipment.values()),
+                                 dtype=np.int32, count=carried)
+        movers = np.full(len(soldiers), -1, dtype=np.int32)
+        for row, team in table.movers.items():
+            if position[row] >= 0 and team in team_position:
+                movers[position[row]] = team_position[team]
+        
+        header = {
+            "soldiers": len(soldiers),
+            "rank_names": table.rank_names,
+            "assignments": list(assignments),
+            "items": list(items),
+            "equipment_database": self.equipment_database,
+            "seeds": self.seeds.getstate(),
+            "event_rng": self.event_rng.getstate(),
+            "teams": [{
+                "name": team.name,
+                "status": team.status,
+                "location": team.location,
+                "created": team.created_date.timestamp(),
+                "commander": -1 if team.commander is None else int(position[team.commander.row]),
+                "destination": team.destination,
+                "march": team.march,
+                "logged": team.mission_log.total,
+            } for team in self.teams],
+            "missions": [{
+                "name": mission.name,
+                "description": mission.description,
+                "location": mission.location,
+                "status": int(mission.status_code),
+                "objectives": _dump_objectives(mission.objectives),
+                "start": mission.start_time and mission.start_time.timestamp(),
+                "end": mission.end_time and mission.end_time.timestamp(),
+                "difficulty": mission.difficulty,
+                "success_rate": mission.success_rate,
+                "rewards": mission.rewards,
+                "seed": mission.seed,
+                "steps": mission.steps,
+            } for mission in self.missions],
+            "terrain": self.terrain and {
+                "width": self.terrain.width,
+                "height": self.terrain.height,
+                "cell_size": self.terrain.cell_size,
+                "cache_size": self.terrain.cache_size,
+            },
+        }
+        
+        sections = [_json_array(header), *_string_arrays([soldier.name for soldier in soldiers])]
+        sections += [getattr(table, column)[rows] for column in SNAPSHOT_COLUMNS]
+        sections += [assignment_codes, item_counts, item_codes, quantities, movers]
+        
+        # Links as per-entity counts followed by one flat array
+        sections.append(np.array([len(team.members) for team in self.teams], dtype=np.int32))
+        sections.append(np.concatenate([position[table.rows_of(team.members)] for team in self.teams] +
+                                       [np.empty(0, dtype=np.int32)]))
+        sections.append(np.array([len(team.route) for team in self.teams], dtype=np.int32))
+        sections.append(np.array([(point[0], point[1], speed) for team in self.teams for point, speed in team.route],
+                                 dtype=np.float64).reshape(-1, 3))
+        sections.append(np.array([len(mission.teams) for mission in self.missions], dtype=np.int32))
+        sections.append(np.array([team_position[team] for mission in self.missions for team in mission.teams],
+                                 dtype=np.int32))
+        if self.terrain is not None:
+            sections.append(self.terrain.costs.copy())
+        return sections
+    
+    @classmethod
+    def load_snapshot(cls, path, spill_path=None):
+        """Build a new simulator from a file written by save_snapshot.
+        
+        Soldiers are created in bulk straight into the SoldierTable (see
+        add_soldiers), so no per-soldier events are logged; sections are
+        read one at a time, so peak memory stays close to the world's own size.
+        """
+        with open(path, "rb") as stream, _gc_paused():
+            if stream.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a simulator snapshot: {path}")
+            header = _read_json(stream)
+            simulator = cls(spill_path)
+            simulator.equipment_database = header["equipment_database"]
+            
+            table = simulator.soldier_table
+            table.rank_names = header["rank_names"]
+            table.rank_codes = {rank: i for i, rank in enumerate(table.rank_names)}
+            names = _read_strings(stream)
+            columns = {column: _read_array(stream) for column in SNAPSHOT_COLUMNS}
+            assignment_codes, item_counts, item_codes, quantities, movers = (_read_array(stream) for _ in range(5))
+            
+            items = header["items"]
+            item_codes, quantities = item_codes.tolist(), quantities.tolist()
+            equipment, start = [], 0
+            for stop in np.cumsum(item_counts).tolist():
+                equipment.append({items[code]: quantity
+                                  for code, quantity in zip(item_codes[start:stop], quantities[start:stop])})
+                start = stop
+            soldiers = simulator.add_soldiers(names, equipment, **columns)
+            del names, equipment, columns
+            assignments = header["assignments"]
+            for soldier, code in zip(soldiers, assignment_codes.tolist()):
+                if code >= 0:
+                    soldier.mission = assignments[code]
+            
+            if header["terrain"]:
+                simulator.terrain = Terrain(**header["terrain"])
+            
+            teams = []
+            for entry in header["teams"]:
+                team = simulator.create_team(entry["name"])
+                team.status = entry["status"]
+                team._set_location(tuple(entry["location"]))
+                team.created_date = datetime.fromtimestamp(entry["created"])
+                team.destination = entry["destination"] and tuple(entry["destination"])
+                team.march = entry["march"] and tuple(entry["march"])
+                teams.append(team)
+            members = _split(_read_array(stream), _read_array(stream))
+            for team, entry, positions in zip(teams, header["teams"], members):
+                team.add_members([soldiers[i] for i in positions])
+                if entry["commander"] >= 0:
+                    team.commander = soldiers[entry["commander"]]
+                team.mission_log.total = entry["logged"]
+            del members
+            routes = _split(_read_array(stream), _read_array(stream))
+            for team, route in zip(teams, routes):
+                team.route = [((x, y), speed) for x, y, speed in route] or ()
+            for position in np.flatnonzero(movers >= 0).tolist():
+                team = teams[movers[position]]
+                table.movers[soldiers[position].row] = team
+                team.in_transit += 1
+            
+            mission_teams = _split(_read_array(stream), _read_array(stream))
+            for entry, positions in zip(header["missions"], mission_teams):
+                mission = simulator.create_mission(entry["name"], entry["description"], tuple(entry["location"]))
+                mission._set_status(MissionStatus(entry["status"]))
+                mission.objectives = _load_objectives(entry["objectives"])
+                mission.start_time = entry["start"] and datetime.fromtimestamp(entry["start"])
+                mission.end_time = entry["end"] and datetime.fromtimestamp(entry["end"])
+                mission.difficulty = entry["difficulty"]
+                mission.success_rate = entry["success_rate"]
+                mission.rewards = entry["rewards"]
+                mission.seed = entry["seed"]
+                mission.steps = entry["steps"]
+                for i in positions:
+                    mission._attach_team(teams[i], 1)
+            
+            if simulator.terrain is not None:
+                simulator.terrain.costs = _read_array(stream)
+        # Restored last: creating the missions above drew seeds
+        simulator.seeds.setstate(_rng_state(header["seeds"]))
+        simulator.event_rng.setstate(_rng_state(header["event_rng"]))
+        simulator.log_event("Snapshot loaded from {} ({} soldiers)", path, len(soldiers))
+        return simulator
+    
+    # Upper bound on trials x soldiers cells simulated in one NumPy batch
+    ESTIMATE_BATCH_CELLS = 4_000_000
+    
+    def estimate_mission_outcomes(self, mission, trials=100_000, success_chance=None, seed=None):
+        """Monte Carlo estimate of how repeated simulate_mission_progress calls will end.
+        
+        All trials start from the mission's current state and follow the same
+        objective, failure and injury rules, simulated as NumPy batches.
+        Returns the completion and failure rates, the distribution of the
+        number of objectives completed at the end, and expected casualties
+        (soldiers reduced to 0 health and marked Injured).
+        """
+        if isinstance(mission, str):
+            mission = self.find_mission(mission)
+        if not mission:
+            return None
+        
+        rng = np.random.default_rng(seed)
+        already_done = sum(1 for obj in mission.objectives if obj["completed"])
+        remaining = len(mission.objectives) - already_done
+        
+        # One slot per (team, member) pair, like calculate_success_probability counts them
+        slot_soldiers = [member for team in mission.teams for member in team.members]
+        soldiers = list({id(member): member for member in slot_soldiers}.values())
+        position = {id(member): i for i, member in enumerate(soldiers)}
+        slot_index = np.array([position[id(member)] for member in slot_soldiers], dtype=np.intp)
+        skill_sum = np.array([sum(member.skills.values()) for member in soldiers], dtype=np.float64)
+        health = np.array([member.health for member in soldiers], dtype=np.int64)
+        active = np.array([member.status == "Active" for member in soldiers], dtype=bool)
+        
+        completed = np.zeros(trials, dtype=bool)
+        failed = np.zeros(trials, dtype=bool)
+        reached = np.zeros(trials, dtype=np.int64)
+        casualties = np.zeros(trials, dtype=np.int64)
+        
+        if mission.status not in ["Pending", "Active"] or remaining == 0:
+            completed[:] = mission.status == "Completed"
+            failed[:] = mission.status == "Failed"
+        else:
+            batch = max(1, self.ESTIMATE_BATCH_CELLS // max(1, len(soldiers)))
+            for start in range(0, trials, batch):
+                stop = min(trials, start + batch)
+                self._estimate_batch(
+                    rng, stop - start, mission.difficulty, success_chance, remaining,
+                    slot_index, skill_sum, health, active,
+                    completed[start:stop], failed[start:stop], reached[start:stop], casualties[start:stop],
+                )
+        
+        distribution = np.bincount(reached, minlength=remaining + 1) / max(1, trials)
+        return {
+            "trials": trials,
+            "completion_rate": float(completed.mean()) if trials else 0.0,
+            "failure_rate": float(failed.mean()) if trials else 0.0,
+            "objectives_reached": {already_done + i: float(p) for i, p in enumerate(distribution)},
+            "expected_casualties": float(casualties.mean()) if trials else 0.0,
+        }
+    
+    @staticmethod
+    def _estimate_batch(rng, trials, difficulty, success_chance, remaining, slot_index, skill_sum,
+                        health, active, completed, failed, reached, casualties):
+        """Play one batch of trials to the end, writing results into the output slices"""
+        health = np.repeat(health[np.newaxis, :], trials, axis=0)
+        active = np.repeat(active[np.newaxis, :], trials, axis=0)
+        slot_skills = skill_sum[slot_index]
+        total_slots = len(slot_index)
+        running = np.arange(trials)
+        
+        while running.size:
+            # Success chance from the surviving active members, as calculate_success_probability does
+            if success_chance is None:
+                slot_active = active[running][:, slot_index]
+                active_count = slot_active.sum(axis=1)
+                skills = slot_active @ slot_skills
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    probability = (skills / (active_count * 4) / 10) * (1 / difficulty) * (active_count / total_slots) * 100
+                probability = np.round(np.clip(np.where(active_count > 0, probability, 0), 0, 100), 1)
+            else:
+                probability = np.full(running.size, success_chance, dtype=np.float64)
+            
+            success = rng.random(running.size) * 100 < probability
+            
+            hit_trials = running[success]
+            reached[hit_trials] += 1
+            
+            # 20% chance of an injury event, then 10% per active member
+            injured = hit_trials[rng.random(hit_trials.size) < 0.2]
+            if injured.size and total_slots:
+                hits = (rng.random((injured.size, total_slots)) < 0.1) & active[injured][:, slot_index]
+                damage = np.where(hits, rng.integers(5, 26, size=hits.shape), 0)
+                # A soldier in several teams has several slots: scatter-add their damage
+                per_soldier = np.zeros((injured.size, health.shape[1]), dtype=np.int64)
+                np.add.at(per_soldier, (slice(None), slot_index), damage)
+                health[injured] -= per_soldier
+                down = active[injured] & (health[injured] <= 0)
+                health[injured] = np.maximum(health[injured], 0)
+                active[injured] &= ~down
+                casualties[injured] += down.sum(axis=1)
+            
+            done = reached[running] >= remaining
+            completed[running[done]] = True
+            
+            missed = running[~success]
+            lost = missed[rng.random(missed.size) < 0.3]
+            failed[lost] = True
+            
+            running = running[~(done | np.isin(running, lost))]
+    
     def clear_screen(self):
         """Clear the console screen"""
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -681,8 +3111,11 @@ class MilitarySimulator:
             rank = input("Enter soldier rank (default: Private): ") or "Private"
             status = input("Enter status (Active/Injured/Unavailable, default: Active): ") or "Active"
             
-            soldier = self.create_soldier(name, status=status, rank=rank)
-            print(f"Soldier created: {soldier}")
+            try:
+                soldier = self.create_soldier(name, status=status, rank=rank)
+                print(f"Soldier created: {soldier}")
+            except ValueError as e:
+                print(e)
             
         elif choice == "2":
             name = input("Enter soldier name: ")
@@ -778,8 +3211,11 @@ class MilitarySimulator:
         
         if choice == "1":
             name = input("Enter team name: ")
-            team = self.create_team(name)
-            print(f"Team created: {team}")
+            try:
+                team = self.create_team(name)
+                print(f"Team created: {team}")
+            except ValueError as e:
+                print(e)
             
         elif choice == "2":
             team_name = input("Enter team name: ")
@@ -822,7 +3258,7 @@ class MilitarySimulator:
             team = self.find_team(team_name)
             
             if team:
-                print(team.team_status())
+                write_report(team.team_status_lines())
             else:
                 print(f"Team '{team_name}' not found")
                 
@@ -836,9 +3272,13 @@ class MilitarySimulator:
                     y = int(input("Enter y-coordinate: "))
                     
                     spacing = int(input("Enter formation spacing (default: 5): ") or "5")
+                    formation = input(f"Enter formation ({'/'.join(FORMATIONS)}, default: line): ") or "line"
+                    speed = float(input("Enter speed per tick (blank to move instantly): ") or "0") or None
                     
-                    team.move_team((x, y), formation_spacing=spacing)
-                    print(f"Team {team_name} moved to ({x}, {y})")
+                    if team.move_team((x, y), formation_spacing=spacing, formation=formation, speed=speed):
+                        print(f"Team {team_name} moved to ({x}, {y})")
+                    else:
+                        print(f"Could not move team {team_name}")
                 except ValueError:
                     print("Invalid coordinate format")
             else:
@@ -849,7 +3289,7 @@ class MilitarySimulator:
             team = self.find_team(team_name)
             
             if team:
-                print(team.equipment_report())
+                write_report(team.equipment_report_lines())
             else:
                 print(f"Team '{team_name}' not found")
                 
@@ -919,7 +3359,13 @@ class MilitarySimulator:
                 x = int(input("Enter x-coordinate: "))
                 y = int(input("Enter y-coordinate: "))
                 location = (x, y)
+            except ValueError:
+                print("Invalid coordinate format")
+                location = None
                 
+            if location and self.find_mission(name):
+                print(f"Mission '{name}' already exists")
+            elif location:
                 mission = self.create_mission(name, description, location)
                 
                 difficulty = input("Enter mission difficulty (1-10, default: 1): ") or "1"
@@ -929,8 +3375,6 @@ class MilitarySimulator:
                     print("Invalid difficulty, using default")
                     
                 print(f"Mission created: {mission}")
-            except ValueError:
-                print("Invalid coordinate format")
                 
         elif choice == "2":
             mission_name = input("Enter mission name: ")
@@ -1002,7 +3446,7 @@ class MilitarySimulator:
             mission = self.find_mission(mission_name)
             
             if mission:
-                print(mission.mission_report())
+                write_report(mission.mission_report_lines())
             else:
                 print(f"Mission '{mission_name}' not found")
               
@@ -1092,17 +3536,12 @@ class MilitarySimulator:
             team = self.find_team(team_name)
             
             if team:
-                active_members = [m for m in team.members if m.status == "Active"]
-                if not active_members:
+                casualty = self.generate_casualty_event(team.name)
+                if not casualty:
                     print("No active members in team")
                 else:
-                    victim = random.choice(active_members)
-                    damage = random.randint(10, 50)
-                    
+                    victim, damage = casualty
                     print(f"Casualty event generated for {victim.name}")
-                    victim.update_health(-damage)
-                    
-                    team.log_event(f"Casualty event: {victim.name} took {damage} damage")
                     print(f"{victim.name}'s health reduced to {victim.health}")
                     
                     if victim.status == "Injured":
@@ -1115,21 +3554,7 @@ class MilitarySimulator:
             mission = self.find_mission(mission_name)
             
             if mission:
-                events = [
-                    "encountered unexpected resistance",
-                    "discovered valuable intelligence",
-                    "experienced equipment malfunction",
-                    "weather conditions deteriorated",
-                    "found alternate route",
-                    "communications disrupted",
-                    "supply drop received",
-                    "encountered friendly forces",
-                    "detected enemy patrol",
-                    "secured key position"
-                ]
-                
-                event = random.choice(events)
-                mission.log_event(f"Random event: {event}")
+                event = self.generate_random_event(mission.name)
                 print(f"Random event generated for mission {mission_name}: {event}")
             else:
                 print(f"Mission '{mission_name}' not found")
@@ -1151,7 +3576,7 @@ class MilitarySimulator:
         choice = input("\nEnter your choice (1-7): ")
         
         if choice == "1":
-            print(self.global_status_report())
+            write_report(self.global_status_report_lines())
               
         elif choice == "2":
             print("\n===== TEAM SKILL ASSESSMENT =====")
@@ -1159,7 +3584,7 @@ class MilitarySimulator:
                 print("No teams found")
             else:
                 for team in self.teams:
-                    print(team.team_skill_report())
+                    write_report(team.team_skill_report_lines())
               
         elif choice == "3":
             print("\n===== MISSION SUCCESS PROBABILITIES =====")
@@ -1181,9 +3606,7 @@ class MilitarySimulator:
                     print(f"- Teams assigned: {team_count}")
                     
                     # Personnel count
-                    total_personnel = sum(len(team.members) for team in mission.teams)
-                    active_personnel = sum(sum(1 for m in team.members if m.status == "Active") for team in mission.teams)
-                    print(f"- Personnel: {active_personnel} active out of {total_personnel} total")
+                    print(f"- Personnel: {mission.active_count} active out of {mission.member_count} total")
                     
                     print("\n")
               
@@ -1195,15 +3618,7 @@ class MilitarySimulator:
               
         elif choice == "5":
             print("\n===== EQUIPMENT SUMMARY =====")
-            all_equipment = {}
-            
-            # Count all equipment across all soldiers
-            for soldier in self.soldiers:
-                for item, qty in soldier.equipment.items():
-                    if item in all_equipment:
-                        all_equipment[item] += qty
-                    else:
-                        all_equipment[item] = qty
+            all_equipment = self.equipment_totals
             
             if not all_equipment:
                 print("No equipment found")
@@ -1220,16 +3635,13 @@ class MilitarySimulator:
             if not self.soldiers:
                 print("No personnel found")
             else:
-                status_groups = {}
-                for soldier in self.soldiers:
-                    if soldier.status not in status_groups:
-                        status_groups[soldier.status] = []
-                    status_groups[soldier.status].append(soldier)
-                
-                for status, soldiers in status_groups.items():
-                    print(f"\n{status} Personnel ({len(soldiers)}):")
-                    for soldier in soldiers:
-                        print(f"- {soldier.rank} {soldier.name}, Health: {soldier.health}%")
+                for status, count in self.soldier_statuses.counts().items():
+                    print(f"\n{status} Personnel ({count}):")
+                    for start in range(0, count, self.PAGE_SIZE):
+                        if start and input(f"-- {count - start} more, Enter to continue or 'q' to skip -- ") == "q":
+                            break
+                        for soldier in self.soldier_statuses.page(status, start, self.PAGE_SIZE):
+                            print(f"- {soldier.rank} {soldier.name}, Health: {soldier.health}%")
               
         input("\nPress Enter to continue...")
     
@@ -1250,11 +3662,201 @@ class MilitarySimulator:
                 self.reports_menu()
             elif choice == "6":
                 print("Exiting simulator...")
+                self.close()
                 break
             else:
                 print("Invalid choice")
 
 
+MISSION_EVENTS = (
+    "encountered light resistance",
+    "found valuable intelligence",
+    "had to find alternate route",
+    "equipment malfunction occurred",
+    "weather conditions worsened"
+)
+
+
+FIELD_EVENTS = (
+    "encountered unexpected resistance",
+    "discovered valuable intelligence",
+    "experienced equipment malfunction",
+    "weather conditions deteriorated",
+    "found alternate route",
+    "communications disrupted",
+    "supply drop received",
+    "encountered friendly forces",
+    "detected enemy patrol",
+    "secured key position"
+)
+
+
+class OutcomeJournal:
+    """Compact record of every random outcome rolled by a simulator.
+    
+    Entries are plain tuples:
+      ("step", mission name, success probability or None, plan from plan_mission_step)
+      ("casualty", team name, soldier name, damage)
+      ("random_event", mission name, event)
+    MilitarySimulator.replay() applies them to an identical starting world
+    without recomputing any probability or roll.
+    """
+    
+    def __init__(self, entries=None):
+        self.entries = entries or []
+    
+    def append(self, entry):
+        self.entries.append(entry)
+    
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as journal:
+            for entry in self.entries:
+                journal.write(json.dumps(entry) + "\n")
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as journal:
+            return cls([tuple(json.loads(line)) for line in journal if line.strip()])
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __iter__(self):
+        return iter(self.entries)
+
+
+# Snapshot files start with this line, followed by NumPy .npy sections (see save_snapshot)
+SNAPSHOT_MAGIC = b"MILITARY-SIMULATOR-SNAPSHOT 1\n"
+SNAPSHOT_COLUMNS = ("health", "status", "rank", "x", "y", "experience", *SoldierTable.SKILLS,
+                    "target_x", "target_y", "speed")
+
+
+def _write_array(stream, array):
+    np.lib.format.write_array(stream, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def _read_array(stream):
+    return np.lib.format.read_array(stream, allow_pickle=False)
+
+
+def write_snapshot(path, sections):
+    """Write a snapshot file from MilitarySimulator.snapshot_sections()"""
+    with open(path, "wb") as stream:
+        stream.write(SNAPSHOT_MAGIC)
+        for array in sections:
+            _write_array(stream, array)
+
+
+def _json_array(value):
+    return np.frombuffer(json.dumps(value).encode("utf-8"), dtype=np.uint8)
+
+
+def _read_json(stream):
+    return json.loads(_read_array(stream).tobytes())
+
+
+def _string_arrays(strings):
+    """strings as their lengths in characters and one UTF-8 blob (see _read_strings)"""
+    return (np.fromiter(map(len, strings), dtype=np.int32, count=len(strings)),
+            np.frombuffer("".join(strings).encode("utf-8"), dtype=np.uint8))
+
+
+def _read_strings(stream):
+    ends = np.cumsum(_read_array(stream)).tolist()
+    text = _read_array(stream).tobytes().decode("utf-8")
+    return [text[start:stop] for start, stop in zip([0] + ends[:-1], ends)]
+
+
+def _split(counts, values):
+    """Cut a flat array back into per-entity lists of the given lengths"""
+    values = values.tolist()
+    ends = np.cumsum(counts).tolist()
+    return [values[start:stop] for start, stop in zip([0] + ends[:-1], ends)]
+
+
+def _rng_state(state):
+    """random.Random state from its JSON form"""
+    version, internal, gauss = state
+    return version, tuple(internal), gauss
+
+
+def _dump_objectives(objectives):
+    """Mission objectives with their datetimes as timestamps, for JSON"""
+    return [{key: value.timestamp() if isinstance(value, datetime) else value for key, value in objective.items()}
+            for objective in objectives]
+
+
+def _load_objectives(objectives):
+    return [{key: datetime.fromtimestamp(value) if key in ("added", "completed_time") else value
+             for key, value in objective.items()} for objective in objectives]
+
+
+def plan_mission_step(state):
+    """Roll the outcome of one mission step from a snapshot made by _begin_mission_step.
+    
+    Pure function of its input so it can run in a worker process. Returns
+    (objective index, success, random event, [(member slot, damage)], mission failed)
+    or None when every objective is already complete.
+    """
+    step_seed, success_chance, objective_index, slots, active, health = state
+    if objective_index is None:
+        return None
+    
+    rng = random.Random(step_seed)
+    
+    # Random chance to complete objective based on success probability
+    if rng.random() * 100 >= success_chance:
+        # 30% chance of mission failure on objective failure
+        return objective_index, False, None, None, rng.random() < 0.3
+    
+    event = None
+    if rng.random() < 0.3:  # 30% chance of random event
+        event = rng.choice(MISSION_EVENTS)
+    
+    injuries = []
+    if rng.random() < 0.2:  # 20% chance of injury
+        active, health = list(active), list(health)
+        for slot, soldier in enumerate(slots):
+            if active[soldier] and rng.random() < 0.1:
+                damage = rng.randint(5, 25)
+                injuries.append((slot, damage))
+                health[soldier] -= damage
+                if health[soldier] <= 0:
+                    active[soldier] = False
+    return objective_index, True, event, injuries, False
+
+
+def plan_mission_steps(states):
+    return [plan_mission_step(state) for state in states]
+
+
+# Bytes per entity (including its index entry and creation log events) that
+# measure_entity_memory() is expected to stay under
+MEMORY_TARGETS = {"soldier": 1000, "team": 875, "mission": 1300}
+
+
+def measure_entity_memory(count=10000):
+    """Measure average bytes allocated per soldier, team and mission"""
+    simulator = MilitarySimulator()
+    factories = {
+        "soldier": lambda i: simulator.create_soldier(f"Soldier{i}", location=(i, i)),
+        "team": lambda i: simulator.create_team(f"Team{i}"),
+        "mission": lambda i: simulator.create_mission(f"Mission{i}", "Memory probe", (i, i)),
+    }
+    
+    results = {}
+    tracemalloc.start()
+    try:
+        for kind, factory in factories.items():
+            before = tracemalloc.get_traced_memory()[0]
+            for i in range(count):
+                factory(i)
+            results[kind] = (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+    return results
+
+
 # Sample data
 def create_sample_data(simulator):
     # Create soldiers
@@ -1337,15 +3939,5 @@ def create_sample_data(simulator):
 
 # Main execution
 if __name__ == "__main__":
-    simulator = MilitarySimulator()
-    
-    # Ask if user wants sample data
-    print("Military Simulator")
-    use_sample = input("Would you like to load sample data? (y/n): ").lower()
-    
-    if use_sample == 'y':
-        simulator = create_sample_data(simulator)
-        print("Sample data loaded!")
-    
-    # Run the simulator interface
-    simulator.run()
\ No newline at end of file
+    from RonENG_tools import main
+    main()